@@ -1,7 +1,18 @@
 from flask import Flask
+from werkzeug.utils import import_string
 from flask_restx import Api
 from flask_cors import CORS
-from app.extensions import bcrypt, jwt, db
+from app.extensions import (
+    bcrypt, jwt, db, metrics, password_hasher, replica_router
+)
+from app.utils.password_hasher import PasswordHasherBusy
+from app.utils.serialization import output_json
+from app.persistence.engine import (
+    configure_connections,
+    replica_binds,
+    engine_options,
+    validate_database_config,
+)
 
 
 def create_app(config_class="config.DevelopmentConfig"):
@@ -12,8 +23,22 @@ def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__,
                 template_folder=os.path.join(basedir, 'templates'),
                 static_folder=os.path.join(basedir, 'static'))
+    if isinstance(config_class, str):
+        config_class = import_string(config_class)
     app.config.from_object(config_class)
 
+    # Resolve the database URI unless the config class sets one, then
+    # check and translate the engine settings
+    if not app.config.get('SQLALCHEMY_DATABASE_URI'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = config_class.get_database_uri()
+    validate_database_config(app.config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+        app.config, app.config['SQLALCHEMY_DATABASE_URI']
+    )
+    app.config['SQLALCHEMY_BINDS'] = {
+        **app.config.get('SQLALCHEMY_BINDS', {}), **replica_binds(app.config)
+    }
+
     # Enable CORS for all routes to allow frontend access
     CORS(app, resources={
         r"/api/*": {
@@ -50,18 +75,35 @@ def create_app(config_class="config.DevelopmentConfig"):
         description='HBnB Application API',
         doc='/api/v1/'
     )
+    # Encode JSON responses with orjson when it is installed
+    api.representation('application/json')(output_json)
 
     """
     Initialize extensions with the Flask app:
     - bcrypt
+    - password_hasher (bcrypt on a bounded worker pool)
     - jwt
     - db (SQLAlchemy)
+    - metrics (request instrumentation)
     """
     bcrypt.init_app(app)
     app.extensions['bcrypt'] = bcrypt
+    password_hasher.init_app(app)
+    app.extensions['password_hasher'] = password_hasher
     jwt.init_app(app)
     app.extensions['jwt'] = jwt
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_connections(engine, app.config)
+    replica_router.init_app(app, db)
+    app.extensions['replica_router'] = replica_router
+    # Server-Timing header, /metrics and slow-query log
+    metrics.init_app(app, db)
+
+    # Configure the facade's repositories for this app
+    from app.services import facade
+    facade.init_app(app)
 
     # Import API namespaces here to avoid circular imports
     from app.api.v1.users import api as users_ns
@@ -77,10 +119,23 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
 
-    # Initialize database tables
-    with app.app_context():
-        # Import models to register them with SQLAlchemy
-        from app import models  # noqa: F401
-        db.create_all()  # Create tables
+    # Resolve current_user from the token, through the principal cache
+    @jwt.user_lookup_loader
+    def load_current_user(jwt_header, jwt_data):
+        return facade.get_principal(jwt_data)
+
+    # Shed load quickly when password hashing is saturated. 429 rather
+    # than 503: Flask-RESTX logs a traceback for every 5xx response
+    @api.errorhandler(PasswordHasherBusy)
+    def handle_password_hasher_busy(error):
+        return {'error': str(error)}, 429, {'Retry-After': '1'}
+
+    # Bring the database schema up to date
+    if app.config['AUTO_MIGRATE'] and app.config['REPOSITORY_TYPE'] != 'in_memory':
+        with app.app_context():
+            # Import models to register them with SQLAlchemy
+            from app import models  # noqa: F401
+            from app.persistence.migrations import migrate
+            migrate(db.engine, db.metadata)
 
     return app
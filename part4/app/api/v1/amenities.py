@@ -1,6 +1,11 @@
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt
+from flask_jwt_extended import jwt_required, get_current_user
 from app.services import facade
+from app.api.v1.bulk import get_bulk_items, bulk_response
+from app.api.v1.conditional import (
+    cache_validators, collection_validators, not_modified
+)
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -9,6 +14,11 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
+bulk_amenity_model = api.model('AmenityBulk', {
+    'items': fields.List(fields.Raw, required=True,
+                         description='Amenities to create')
+})
+
 
 @api.route('/')
 class AmenityList(Resource):
@@ -20,8 +30,7 @@ class AmenityList(Resource):
     def post(self):
         """Register a new amenity (Admin only)"""
         # Check if the current user is an admin
-        current_user = get_jwt()
-        if not current_user.get('is_admin'):
+        if not get_current_user().is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         amenity_data = api.payload
@@ -29,22 +38,55 @@ class AmenityList(Resource):
         return {'id': new_amenity.id, 'name': new_amenity.name}, 201
 
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Amenities not modified')
     def get(self):
         """Retrieve a list of all amenities"""
-        amenities = facade.get_all_amenities()
-        return [{'id': amenity.id, 'name': amenity.name} for amenity in amenities], 200
+        headers = collection_validators(*facade.get_amenities_version())
+        if not_modified(headers):
+            return None, 304, headers
+
+        amenities = facade.get_amenity_list()
+        return [amenity._asdict() for amenity in amenities], 200, headers
+
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @api.expect(bulk_amenity_model)
+    @api.response(201, 'All amenities successfully created')
+    @api.response(207, 'Some amenities were rejected')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """Register many amenities at once (Admin only)"""
+        if not get_current_user().is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            items = get_bulk_items(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        created, errors = facade.create_amenities_bulk(
+            items, current_app.config['BULK_CHUNK_SIZE']
+        )
+        return bulk_response(created, errors)
 
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Amenity not modified')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity details by ID"""
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return {'id': amenity.id, 'name': amenity.name}, 200
+
+        headers = cache_validators(amenity.updated_at, amenity.id)
+        if not_modified(headers):
+            return None, 304, headers
+        return {'id': amenity.id, 'name': amenity.name}, 200, headers
 
     @api.expect(amenity_model, validate=True)
     @api.response(200, 'Amenity updated successfully')
@@ -55,8 +97,7 @@ class AmenityResource(Resource):
     def put(self, amenity_id):
         """Update an amenity's information (Admin only)"""
         # Check if the current user is an admin
-        current_user = get_jwt()
-        if not current_user.get('is_admin'):
+        if not get_current_user().is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         amenity = facade.get_amenity(amenity_id)
@@ -15,16 +15,18 @@ login_model = api.model('Login', {
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model)
+    @api.response(429, 'Authentication service is busy')
     def post(self):
         """Authenticate user and return a JWT token"""
         # Get the email and password from the request payload
         credentials = api.payload
 
-        # Retrieve the user based on the provided email
-        user = facade.get_user_by_email(credentials['email'])
-
-        # Check if the exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
+        # Retrieve the user and check the password (rehashing it if the
+        # configured cost changed)
+        user = facade.authenticate_user(
+            credentials['email'], credentials['password']
+        )
+        if not user:
             return {'error': 'Invalid credentials'}, 401
 
         # Create a JWT token with the user's id and is_admin flag
@@ -0,0 +1,41 @@
+"""
+Helpers shared by the bulk write endpoints.
+
+Bulk endpoints accept `{"items": [...]}` and answer with the IDs of the
+rows written and the per-row errors, using:
+- 201 (200 for updates) when every row was written,
+- 207 when some rows were rejected,
+- 400 when no row was written.
+"""
+
+from flask import current_app
+
+
+def get_bulk_items(payload):
+    """
+    Extract the rows of a bulk request.
+
+    Returns:
+        list: The rows.
+
+    Raises:
+        ValueError: If the payload has no items list or too many rows.
+    """
+    items = (payload or {}).get('items')
+    if not isinstance(items, list):
+        raise ValueError('Payload must contain an items list')
+    max_rows = current_app.config['BULK_MAX_ROWS']
+    if len(items) > max_rows:
+        raise ValueError(f'At most {max_rows} items per request')
+    return items
+
+
+def bulk_response(ids, errors, key='created'):
+    """Build the bulk response body and status code."""
+    if not errors:
+        status = 201 if key == 'created' else 200
+    elif ids:
+        status = 207
+    else:
+        status = 400
+    return {key: ids, 'errors': errors}, status
@@ -0,0 +1,86 @@
+"""
+Helpers for HTTP conditional requests.
+
+GET endpoints describe the version of the representation they are about
+to serve (the `updated_at` of a single row, or `max(updated_at)` and the
+row count of a collection) and answer 304 Not Modified, without loading
+or serializing anything else, when the client's If-None-Match or
+If-Modified-Since header shows its copy is current:
+
+    headers = collection_validators(*facade.get_amenities_version())
+    if not_modified(headers):
+        return None, 304, headers
+    ...
+    return body, 200, headers
+
+Representations built from several rows only carry an ETag: a deleted
+row leaves `max(updated_at)` unchanged, or even moves it back, so a
+Last-Modified date would validate stale copies.
+"""
+
+import hashlib
+from datetime import timezone
+
+from flask import request
+from werkzeug.http import http_date, parse_date, unquote_etag
+
+
+def cache_validators(last_modified, *version):
+    """
+    Build the ETag, Last-Modified and Cache-Control headers of a response.
+
+    Args:
+        last_modified (datetime): Latest naive UTC `updated_at` the
+            representation depends on, or None.
+        *version: Further values identifying the representation (row
+            counts, embedded rows' timestamps...).
+
+    Returns:
+        dict: Response headers.
+    """
+    digest = hashlib.sha1(
+        '|'.join(str(value) for value in (last_modified,) + version).encode()
+    ).hexdigest()[:32]
+    # Weak: the tag identifies the data, not the exact bytes sent.
+    # no-cache lets clients store the response but makes them revalidate.
+    headers = {'ETag': f'W/"{digest}"', 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(
+            last_modified.replace(tzinfo=timezone.utc)
+        )
+    return headers
+
+
+def collection_validators(*version):
+    """
+    Build the headers of a representation built from several rows.
+
+    Args:
+        *version: Values identifying the representation, including the
+            row counts so that deletions change the ETag.
+
+    Returns:
+        dict: Response headers, without Last-Modified.
+    """
+    return cache_validators(None, *version)
+
+
+def not_modified(headers):
+    """
+    Evaluate the request's preconditions against `headers`.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+
+    Returns:
+        bool: True when a 304 response should be sent.
+    """
+    if request.if_none_match:
+        etag, _ = unquote_etag(headers['ETag'])
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and 'Last-Modified' in headers:
+        # Last-Modified has a one-second resolution
+        return request.if_modified_since >= parse_date(
+            headers['Last-Modified']
+        )
+    return False
+
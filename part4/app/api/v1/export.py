@@ -0,0 +1,73 @@
+"""
+Helpers shared by the export endpoints.
+
+Exports stream a whole collection in one response without building it in
+memory: rows come from a repository cursor and are encoded one batch at a
+time, so memory use does not depend on the table size. Two formats are
+supported:
+- `ndjson` (default): one JSON object per line,
+- `json`: a single JSON array.
+"""
+
+from flask import Response, stream_with_context
+
+from app.utils.serialization import dumps
+
+EXPORT_FORMATS = ('ndjson', 'json')
+
+_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def export_response(rows, export_format='ndjson', batch_size=1000):
+    """
+    Build a streamed response from an iterable of rows.
+
+    The request context is kept alive while the body is generated, so the
+    database session stays open until the last row is sent.
+
+    Args:
+        rows: Iterable of projection rows.
+        export_format (str): One of EXPORT_FORMATS.
+        batch_size (int): Number of rows encoded per chunk.
+
+    Returns:
+        Response: The streaming response.
+    """
+    if export_format == 'json':
+        chunks = _json_chunks(rows, batch_size)
+    else:
+        chunks = _ndjson_chunks(rows, batch_size)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=_MIMETYPES[export_format],
+        headers={'Cache-Control': 'no-store'}
+    )
+
+
+def _ndjson_chunks(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(dumps(row._asdict()))
+        if len(batch) >= batch_size:
+            yield b'\n'.join(batch) + b'\n'
+            batch = []
+    if batch:
+        yield b'\n'.join(batch) + b'\n'
+
+
+def _json_chunks(rows, batch_size):
+    yield b'['
+    batch = []
+    separator = b''
+    for row in rows:
+        batch.append(dumps(row._asdict()))
+        if len(batch) >= batch_size:
+            yield separator + b','.join(batch)
+            separator = b','
+            batch = []
+    if batch:
+        yield separator + b','.join(batch)
+    yield b']'
@@ -1,6 +1,9 @@
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from app.services import facade
+from app.api.v1.bulk import get_bulk_items, bulk_response
+from app.api.v1.conditional import collection_validators, not_modified
 
 api = Namespace('places', description='Place operations')
 
@@ -17,12 +20,20 @@ user_model = api.model('PlaceUser', {
     'email': fields.String(description='Email of the owner')
 })
 
+author_model = api.model('PlaceReviewAuthor', {
+    'id': fields.String(description='User ID'),
+    'first_name': fields.String(description='First name of the author'),
+    'last_name': fields.String(description='Last name of the author')
+})
+
 # Adding the review model
 review_model = api.model('PlaceReview', {
     'id': fields.String(description='Review ID'),
     'text': fields.String(description='Text of the review'),
     'rating': fields.Integer(description='Rating of the place (1-5)'),
-    'user_id': fields.String(description='ID of the user')
+    'user_id': fields.String(description='ID of the user'),
+    'user': fields.Nested(author_model, description='Author of the review'),
+    'created_at': fields.String(description='Creation time (ISO 8601)')
 })
 
 # Define the place model for input validation and documentation
@@ -36,6 +47,141 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=False, description="List of amenities ID's")
 })
 
+bulk_place_model = api.model('PlaceBulk', {
+    'items': fields.List(fields.Raw, required=True,
+                         description='Places to create (or update, with their id)')
+})
+
+# Query parameters for the paginated place listing
+place_list_parser = api.parser()
+place_list_parser.add_argument(
+    'limit', type=int, location='args',
+    help='Maximum number of places to return'
+)
+place_list_parser.add_argument(
+    'cursor', type=str, location='args',
+    help='Cursor returned as next_cursor by the previous page'
+)
+place_list_parser.add_argument(
+    'min_price', type=float, location='args',
+    help='Minimum price per night (inclusive)'
+)
+place_list_parser.add_argument(
+    'max_price', type=float, location='args',
+    help='Maximum price per night (inclusive)'
+)
+place_list_parser.add_argument(
+    'amenities', type=str, action='split', location='args',
+    help="Comma-separated amenity ID's the place must all have"
+)
+place_list_parser.add_argument(
+    'owner_id', type=str, location='args',
+    help='Only return places owned by this user'
+)
+place_list_parser.add_argument(
+    'sort', type=str, location='args', default='created',
+    choices=('created', 'newest', 'price_asc', 'price_desc', 'rating'),
+    help='Sort order'
+)
+
+# Query parameters for the review feed of a place
+review_feed_parser = api.parser()
+review_feed_parser.add_argument(
+    'limit', type=int, location='args',
+    help='Maximum number of reviews to return'
+)
+review_feed_parser.add_argument(
+    'cursor', type=str, location='args',
+    help='Cursor returned as next_cursor by the previous page'
+)
+review_feed_parser.add_argument(
+    'sort', type=str, location='args', default='newest',
+    choices=('newest', 'rating'),
+    help='Sort order'
+)
+review_feed_parser.add_argument(
+    'rating', type=int, location='args', choices=(1, 2, 3, 4, 5),
+    help='Only return reviews with this rating'
+)
+
+# Query parameters for the geo searches
+nearby_parser = api.parser()
+nearby_parser.add_argument(
+    'lat', type=float, required=True, location='args',
+    help='Latitude of the search center'
+)
+nearby_parser.add_argument(
+    'lon', type=float, required=True, location='args',
+    help='Longitude of the search center'
+)
+nearby_parser.add_argument(
+    'radius_km', type=float, required=True, location='args',
+    help='Search radius in kilometers'
+)
+nearby_parser.add_argument(
+    'limit', type=int, location='args',
+    help='Maximum number of places to return'
+)
+
+bbox_parser = api.parser()
+for name, description in (
+    ('min_lat', 'Southern edge latitude'),
+    ('min_lon', 'Western edge longitude'),
+    ('max_lat', 'Northern edge latitude'),
+    ('max_lon', 'Eastern edge longitude'),
+):
+    bbox_parser.add_argument(
+        name, type=float, required=True, location='args', help=description
+    )
+bbox_parser.add_argument(
+    'limit', type=int, location='args',
+    help='Maximum number of places to return'
+)
+
+
+def get_limit(value):
+    """
+    Resolve the `limit` query parameter against the configured bounds.
+
+    Raises:
+        ValueError: If the limit is not a positive integer.
+    """
+    if value is None:
+        return current_app.config['PAGINATION_DEFAULT_LIMIT']
+    if value < 1:
+        raise ValueError('Limit must be a positive integer')
+    return min(value, current_app.config['PAGINATION_MAX_LIMIT'])
+
+
+def place_summary(place):
+    """Serialize the fields shown on a place card (Place or card row)."""
+    return {
+        'id': place.id,
+        'title': place.title,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'review_count': place.review_count,
+        'avg_rating': place.avg_rating
+    }
+
+
+def review_summary(review, authors):
+    """Serialize a review feed row, with its author from `authors`."""
+    author = authors.get(review.user_id)
+    return {
+        'id': review.id,
+        'text': review.text,
+        'rating': review.rating,
+        'user_id': review.user_id,
+        'user': {
+            'id': author.id,
+            'first_name': author.first_name,
+            'last_name': author.last_name
+        } if author is not None else None,
+        'created_at': review.created_at.isoformat()
+    }
+
 
 @api.route('/')
 class PlaceList(Resource):
@@ -67,31 +213,178 @@ class PlaceList(Resource):
             'owner_id': new_place.owner.id
         }, 201
 
+    @api.expect(place_list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Invalid query parameters')
+    def get(self):
+        """Retrieve a filtered, sorted page of places"""
+        args = place_list_parser.parse_args()
+        headers = collection_validators(*facade.get_places_version())
+        if not_modified(headers):
+            return None, 304, headers
+        try:
+            limit = get_limit(args['limit'])
+            places, next_cursor = facade.get_places_page(
+                limit,
+                args['cursor'],
+                sort=args['sort'],
+                min_price=args['min_price'],
+                max_price=args['max_price'],
+                amenity_ids=args['amenities'],
+                owner_id=args['owner_id']
+            )
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return {
+            'places': [place_summary(place) for place in places],
+            'next_cursor': next_cursor
+        }, 200, headers
+
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @api.expect(bulk_place_model)
+    @api.response(201, 'All places successfully created')
+    @api.response(207, 'Some places were rejected')
+    @api.response(400, 'Invalid input data')
+    @jwt_required()
+    def post(self):
+        """Register many places at once"""
+        current_user = get_jwt_identity()
+        is_admin = get_current_user().is_admin
+        try:
+            items = get_bulk_items(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # Admins may import places on behalf of other owners
+        for place_data in items:
+            if isinstance(place_data, dict):
+                if not is_admin or 'owner_id' not in place_data:
+                    place_data['owner_id'] = current_user
+
+        created, errors = facade.create_places_bulk(
+            items, current_app.config['BULK_CHUNK_SIZE']
+        )
+        return bulk_response(created, errors)
+
+    @api.expect(bulk_place_model)
+    @api.response(200, 'All places successfully updated')
+    @api.response(207, 'Some places were rejected')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def put(self):
+        """Update many places at once (Admin only)"""
+        if not get_current_user().is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            items = get_bulk_items(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        updated, errors = facade.update_places_bulk(
+            items, current_app.config['BULK_CHUNK_SIZE']
+        )
+        return bulk_response(updated, errors, key='updated')
+
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.expect(nearby_parser)
+    @api.response(200, 'Nearby places retrieved successfully')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Invalid query parameters')
+    def get(self):
+        """Retrieve the places closest to a point, nearest first"""
+        args = nearby_parser.parse_args()
+        headers = collection_validators(*facade.get_places_version())
+        if not_modified(headers):
+            return None, 304, headers
+        if not -90.0 <= args['lat'] <= 90.0:
+            return {'error': 'lat must be between -90 and 90'}, 400
+        if not -180.0 <= args['lon'] <= 180.0:
+            return {'error': 'lon must be between -180 and 180'}, 400
+        max_radius = current_app.config['GEO_MAX_RADIUS_KM']
+        if not 0 < args['radius_km'] <= max_radius:
+            return {
+                'error': f'radius_km must be between 0 and {max_radius}'
+            }, 400
+        try:
+            limit = get_limit(args['limit'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        matches = facade.get_places_nearby(
+            args['lat'], args['lon'], args['radius_km'], limit
+        )
+        return {
+            'places': [
+                dict(place_summary(place), distance_km=round(distance, 3))
+                for place, distance in matches
+            ]
+        }, 200, headers
+
+
+@api.route('/bbox')
+class PlaceBoundingBox(Resource):
+    @api.expect(bbox_parser)
+    @api.response(200, 'Places in the bounding box retrieved successfully')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Invalid query parameters')
     def get(self):
-        """Retrieve a list of all places"""
-        places = facade.get_all_places()
-        return [
-            {
-                'id': place.id,
-                'title': place.title,
-                'price': place.price,
-                'latitude': place.latitude,
-                'longitude': place.longitude
-            }
-            for place in places
-        ], 200
+        """Retrieve the places inside a bounding box"""
+        args = bbox_parser.parse_args()
+        headers = collection_validators(*facade.get_places_version())
+        if not_modified(headers):
+            return None, 304, headers
+        if not -90.0 <= args['min_lat'] <= args['max_lat'] <= 90.0:
+            return {'error': 'Invalid latitude range'}, 400
+        if not (-180.0 <= args['min_lon'] <= 180.0
+                and -180.0 <= args['max_lon'] <= 180.0):
+            return {'error': 'Invalid longitude range'}, 400
+        try:
+            limit = get_limit(args['limit'])
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        # A west edge greater than the east edge crosses the antimeridian
+        max_lon = args['max_lon']
+        if args['min_lon'] > max_lon:
+            max_lon += 360.0
+
+        places = facade.get_places_in_bbox(
+            args['min_lat'], args['min_lon'], args['max_lat'], max_lon, limit
+        )
+        return {'places': [place_summary(place) for place in places]}, 200, headers
 
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Place not modified')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place details by ID"""
-        place = facade.get_place(place_id)
+        # The detail view embeds the owner, amenities and latest reviews,
+        # so its ETag covers their timestamps and counts too
+        version = facade.get_place_details_version(place_id)
+        if version is None:
+            return {'error': 'Place not found'}, 404
+        headers = collection_validators(place_id, *version)
+        if not_modified(headers):
+            return None, 304, headers
+
+        place = facade.get_place_details(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
+        # Only the latest reviews are embedded; reviews_next_cursor
+        # continues with GET /places/<place_id>/reviews
+        reviews, authors, next_cursor = facade.get_review_feed(
+            place_id, current_app.config['PLACE_DETAIL_REVIEW_LIMIT']
+        )
 
         return {
             'id': place.id,
@@ -100,6 +393,8 @@ class PlaceResource(Resource):
             'price': place.price,
             'latitude': place.latitude,
             'longitude': place.longitude,
+            'review_count': place.review_count,
+            'avg_rating': place.avg_rating,
             'owner': {
                 'id': place.owner.id,
                 'first_name': place.owner.first_name,
@@ -113,16 +408,9 @@ class PlaceResource(Resource):
                 }
                 for amenity in place.amenities_rel
             ],
-            'reviews': [
-                {
-                    'id': review.id,
-                    'text': review.text,
-                    'rating': review.rating,
-                    'user_id': review.user.id
-                }
-                for review in place.reviews
-            ]
-        }, 200
+            'reviews': [review_summary(review, authors) for review in reviews],
+            'reviews_next_cursor': next_cursor
+        }, 200, headers
 
     @api.expect(place_model, validate=False)
     @api.response(200, 'Place updated successfully')
@@ -133,17 +421,53 @@ class PlaceResource(Resource):
     def put(self, place_id):
         """Update a place's information"""
         current_user_id = get_jwt_identity()
-        current_user_jwt = get_jwt()
-        is_admin = current_user_jwt.get('is_admin', False)
+        is_admin = get_current_user().is_admin
 
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
 
         # Check ownership: allow if admin or owner
-        if not is_admin and place.owner.id != current_user_id:
+        if not is_admin and place.owner_id != current_user_id:
             return {'error': 'Unauthorized'}, 403
 
         place_data = api.payload
-        facade.update_place(place_id, place_data)
+        try:
+            facade.update_place(place_id, place_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return {'message': 'Place updated successfully'}, 200
+
+
+@api.route('/<place_id>/reviews')
+class PlaceReviewList(Resource):
+    @api.expect(review_feed_parser)
+    @api.response(200, 'Reviews of the place retrieved successfully')
+    @api.response(304, 'Reviews not modified')
+    @api.response(400, 'Invalid query parameters')
+    @api.response(404, 'Place not found')
+    def get(self, place_id):
+        """Retrieve a sorted page of the reviews of a place"""
+        args = review_feed_parser.parse_args()
+        version = facade.get_place_details_version(place_id)
+        if version is None:
+            return {'error': 'Place not found'}, 404
+        _, _, _, _, reviews_updated, review_count, reviewers_updated = version
+        headers = collection_validators(
+            place_id, reviews_updated, review_count, reviewers_updated
+        )
+        if not_modified(headers):
+            return None, 304, headers
+        try:
+            limit = get_limit(args['limit'])
+            reviews, authors, next_cursor = facade.get_review_feed(
+                place_id, limit, args['cursor'],
+                sort=args['sort'], rating=args['rating']
+            )
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return {
+            'reviews': [review_summary(review, authors) for review in reviews],
+            'next_cursor': next_cursor
+        }, 200, headers
@@ -1,6 +1,12 @@
+from flask import current_app, redirect, request, url_for
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from app.services import facade
+from app.api.v1.bulk import get_bulk_items, bulk_response
+from app.api.v1.conditional import (
+    cache_validators, collection_validators, not_modified
+)
+from app.api.v1.export import EXPORT_FORMATS, export_response
 
 api = Namespace('reviews', description='Review operations')
 
@@ -12,6 +18,19 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place')
 })
 
+# Query parameters of the streamed export
+export_parser = api.parser()
+export_parser.add_argument(
+    'format', type=str, location='args', default='ndjson',
+    choices=EXPORT_FORMATS,
+    help='ndjson (one object per line) or json (a single array)'
+)
+
+bulk_review_model = api.model('ReviewBulk', {
+    'items': fields.List(fields.Raw, required=True,
+                         description='Reviews to create')
+})
+
 
 @api.route('/')
 class ReviewList(Resource):
@@ -30,15 +49,16 @@ class ReviewList(Resource):
         if not place:
             return {'error': 'Place not found'}, 404
 
-        if place.owner.id == current_user:
+        if place.owner_id == current_user:
             return {'error': 'You cannot review your own place'}, 400
 
-        existing_reviews = facade.get_reviews_by_place(place_id)
-        for review in existing_reviews:
-            if review.user.id == current_user:
-                return {'error': 'You have already reviewed this place'}, 400
+        if facade.has_user_reviewed(current_user, place_id):
+            return {'error': 'You have already reviewed this place'}, 400
 
-        new_review = facade.create_review(review_data)
+        try:
+            new_review = facade.create_review(review_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not new_review:
             return {'error': 'User or Place not found'}, 400
 
@@ -46,27 +66,67 @@ class ReviewList(Resource):
             'id': new_review.id,
             'text': new_review.text,
             'rating': new_review.rating,
-            'user_id': new_review.user.id,
-            'place_id': new_review.place.id
+            'user_id': new_review.user_id,
+            'place_id': new_review.place_id
         }, 201
 
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(304, 'Reviews not modified')
     def get(self):
         """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
-        return [
-            {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating
-            }
-            for review in reviews
-        ], 200
+        headers = collection_validators(*facade.get_reviews_version())
+        if not_modified(headers):
+            return None, 304, headers
+
+        reviews = facade.get_review_list()
+        return [review._asdict() for review in reviews], 200, headers
+
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @api.expect(bulk_review_model)
+    @api.response(201, 'All reviews successfully created')
+    @api.response(207, 'Some reviews were rejected')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """Register many reviews at once (Admin only)"""
+        if not get_current_user().is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            items = get_bulk_items(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        created, errors = facade.create_reviews_bulk(
+            items, current_app.config['BULK_CHUNK_SIZE']
+        )
+        return bulk_response(created, errors)
+
+
+@api.route('/export')
+class ReviewExport(Resource):
+    @api.expect(export_parser)
+    @api.response(200, 'Reviews streamed successfully')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Stream every review, for full exports (Admin only)"""
+        if not get_current_user().is_admin:
+            return {'error': 'Admin privileges required'}, 403
+
+        args = export_parser.parse_args()
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+        return export_response(
+            facade.stream_reviews(batch_size), args['format'], batch_size
+        )
 
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Review not modified')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review details by ID"""
@@ -74,13 +134,16 @@ class ReviewResource(Resource):
         if not review:
             return {'error': 'Review not found'}, 404
 
+        headers = cache_validators(review.updated_at, review.id)
+        if not_modified(headers):
+            return None, 304, headers
         return {
             'id': review.id,
             'text': review.text,
             'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        }, 200
+            'user_id': review.user_id,
+            'place_id': review.place_id
+        }, 200, headers
 
     @api.expect(review_model, validate=False)
     @api.response(200, 'Review updated successfully')
@@ -91,15 +154,14 @@ class ReviewResource(Resource):
     def put(self, review_id):
         """Update a review's information"""
         current_user_id = get_jwt_identity()
-        current_user_jwt = get_jwt()
-        is_admin = current_user_jwt.get('is_admin', False)
+        is_admin = get_current_user().is_admin
 
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
 
         # Check ownership: allow if admin or owner
-        if not is_admin and review.user.id != current_user_id:
+        if not is_admin and review.user_id != current_user_id:
             return {'error': 'Unauthorized'}, 403
 
         review_data = api.payload
@@ -113,15 +175,14 @@ class ReviewResource(Resource):
     def delete(self, review_id):
         """Delete a review"""
         current_user_id = get_jwt_identity()
-        current_user_jwt = get_jwt()
-        is_admin = current_user_jwt.get('is_admin', False)
+        is_admin = get_current_user().is_admin
 
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
 
         # Check ownership: allow if admin or owner
-        if not is_admin and review.user.id != current_user_id:
+        if not is_admin and review.user_id != current_user_id:
             return {'error': 'Unauthorized'}, 403
 
         success = facade.delete_review(review_id)
@@ -133,19 +194,12 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
-    @api.response(200, 'List of reviews for the place retrieved successfully')
-    @api.response(404, 'Place not found')
+    @api.deprecated
+    @api.response(308, 'Moved to GET /api/v1/places/<place_id>/reviews')
     def get(self, place_id):
-        """Get all reviews for a specific place"""
-        reviews = facade.get_reviews_by_place(place_id)
-        if reviews is None:
-            return {'error': 'Place not found'}, 404
-
-        return [
-            {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating
-            }
-            for review in reviews
-        ], 200
+        """Deprecated: use the paginated GET /places/<place_id>/reviews"""
+        # This route returned every review of the place at once; clients
+        # are sent to the feed, with their query parameters
+        return redirect(url_for(
+            'places_place_review_list', place_id=place_id, **request.args
+        ), code=308)
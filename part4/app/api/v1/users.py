@@ -1,6 +1,12 @@
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from app.services import facade
+from app.api.v1.bulk import get_bulk_items, bulk_response
+from app.api.v1.conditional import (
+    cache_validators, collection_validators, not_modified
+)
+from app.api.v1.export import EXPORT_FORMATS, export_response
 
 api = Namespace('users', description='User operations')
 
@@ -16,6 +22,19 @@ user_model = api.model('User', {
     'password': fields.String(required=True, description='User password')
 })
 
+# Query parameters of the streamed export
+export_parser = api.parser()
+export_parser.add_argument(
+    'format', type=str, location='args', default='ndjson',
+    choices=EXPORT_FORMATS,
+    help='ndjson (one object per line) or json (a single array)'
+)
+
+bulk_user_model = api.model('UserBulk', {
+    'items': fields.List(fields.Raw, required=True,
+                         description='Users to create')
+})
+
 
 @api.route('/')
 class UserList(Resource):
@@ -28,18 +47,19 @@ class UserList(Resource):
     def post(self):
         """Register a new user (Admin only)"""
         # Check if the current user is an admin
-        current_user = get_jwt()
-        if not current_user.get('is_admin'):
+        if not get_current_user().is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         user_data = api.payload
 
         # Check email uniqueness
-        existing_user = facade.get_user_by_email(user_data['email'])
-        if existing_user:
+        if facade.email_exists(user_data['email']):
             return {'error': 'Email already registered'}, 400
 
-        new_user = facade.create_user(user_data)
+        try:
+            new_user = facade.create_user(user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return {
             'id': new_user.id,
             'first_name': new_user.first_name,
@@ -48,34 +68,78 @@ class UserList(Resource):
         }, 201
 
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(304, 'Users not modified')
     def get(self):
         """Retrieve a list of all users"""
-        users = facade.get_all_users()
-        return [
-            {
-                'id': user.id,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'email': user.email
-            } for user in users
-        ], 200
+        headers = collection_validators(*facade.get_users_version())
+        if not_modified(headers):
+            return None, 304, headers
+
+        users = facade.get_user_list()
+        return [user._asdict() for user in users], 200, headers
+
+
+@api.route('/bulk')
+class UserBulk(Resource):
+    @api.expect(bulk_user_model)
+    @api.response(201, 'All users successfully created')
+    @api.response(207, 'Some users were rejected')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """Register many users at once (Admin only)"""
+        if not get_current_user().is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            items = get_bulk_items(api.payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        created, errors = facade.create_users_bulk(
+            items, current_app.config['BULK_CHUNK_SIZE']
+        )
+        return bulk_response(created, errors)
+
+
+@api.route('/export')
+class UserExport(Resource):
+    @api.expect(export_parser)
+    @api.response(200, 'Users streamed successfully')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Stream every user, for full exports (Admin only)"""
+        if not get_current_user().is_admin:
+            return {'error': 'Admin privileges required'}, 403
+
+        args = export_parser.parse_args()
+        batch_size = current_app.config['EXPORT_BATCH_SIZE']
+        return export_response(
+            facade.stream_users(batch_size), args['format'], batch_size
+        )
 
 
 @api.route('/<user_id>')
 class UserResource(Resource):
     @api.response(200, 'User details retrieved successfully')
+    @api.response(304, 'User not modified')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Get user details by ID"""
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
+
+        headers = cache_validators(user.updated_at, user.id)
+        if not_modified(headers):
+            return None, 304, headers
         return {
             'id': user.id,
             'first_name': user.first_name,
             'last_name': user.last_name,
             'email': user.email
-        }, 200
+        }, 200, headers
 
     @api.expect(user_model, validate=False)
     @api.response(200, 'User updated successfully')
@@ -86,8 +150,7 @@ class UserResource(Resource):
     def put(self, user_id):
         """Update user details by ID"""
         current_user_id = get_jwt_identity()
-        current_user_jwt = get_jwt()
-        is_admin = current_user_jwt.get('is_admin', False)
+        is_admin = get_current_user().is_admin
 
         # Check authorization: either the user themselves or an admin
         if current_user_id != user_id and not is_admin:
@@ -108,13 +171,13 @@ class UserResource(Resource):
         else:
             # Admin can modify email, but must check uniqueness
             if 'email' in user_data:
-                existing_user = facade.get_user_by_email(
-                    user_data['email']
-                )
-                if existing_user and existing_user.id != user_id:
+                if facade.email_exists(user_data['email'], user_id):
                     return {'error': 'Email already in use'}, 400
 
-        updated_user = facade.update_user(user_id, user_data)
+        try:
+            updated_user = facade.update_user(user_id, user_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return {
             'id': updated_user.id,
             'first_name': updated_user.first_name,
@@ -9,7 +9,14 @@ from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 
+from app.persistence.routing import ReplicaRouter, RoutingSession
+from app.utils.metrics import Metrics
+from app.utils.password_hasher import PasswordHasher
+
 # Initialize extensions
 bcrypt = Bcrypt()
 jwt = JWTManager()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+replica_router = ReplicaRouter()
+password_hasher = PasswordHasher()
+metrics = Metrics()
@@ -18,7 +18,7 @@ class BaseModel(db.Model):
 
     # SQLAlchemy column mappings
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     def __init__(self):
@@ -32,17 +32,18 @@ class BaseModel(db.Model):
                 modified.
         """
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self.created_at = datetime.utcnow()
+        self.updated_at = datetime.utcnow()
 
     def save(self):
         """
         Update the `updated_at` timestamp to the current datetime.
 
         This method should be called whenever the object is modified to ensure
-        that modification times are tracked accurately.
+        that modification times are tracked accurately. Timestamps are naive
+        UTC, like the column defaults, since they back HTTP validators.
         """
-        self.updated_at = datetime.now()
+        self.updated_at = datetime.utcnow()
 
     def update(self, data):
         """
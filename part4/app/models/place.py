@@ -1,11 +1,14 @@
 from .base_model import BaseModel
 from .user import User
 from app.extensions import db
+from app.utils.geo import encode_geohash
 
 # Association table for many-to-many relationship between Place and Amenity
 place_amenity = db.Table('place_amenity',
     db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True),
+    # The primary key covers lookups by place; this one serves amenity filters
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id')
 )
 
 
@@ -29,19 +32,36 @@ class Place(BaseModel):
         reviews (list): list of review objects/identifiers
             related to this place.
         amenities (list): list of amenities related to this place.
+        review_count (int): number of reviews (read-only aggregate).
+        rating_sum (int): sum of review ratings (read-only aggregate).
+        avg_rating (float | None): average rating, None without reviews
+            (read-only aggregate).
     """
 
     __tablename__ = 'places'
 
+    # Attributes a client may change through `update`. Everything else,
+    # e.g. the review aggregates maintained by the persistence layer, the
+    # owner or the underlying `_` columns, is ignored
+    UPDATABLE_FIELDS = ('title', 'description', 'price', 'latitude',
+                        'longitude')
+
     # SQLAlchemy column mappings
     _title = db.Column('title', db.String(100), nullable=False)
     _description = db.Column('description', db.Text, nullable=True)
     _price = db.Column('price', db.Float, nullable=False)
     _latitude = db.Column('latitude', db.Float, nullable=False)
     _longitude = db.Column('longitude', db.Float, nullable=False)
+    # Derived from latitude/longitude; indexed to prune geo searches
+    _geohash = db.Column('geohash', db.String(12), nullable=True, index=True)
+
+    # Review aggregates, maintained by the facade on review writes
+    _review_count = db.Column('review_count', db.Integer, nullable=False, default=0)
+    _rating_sum = db.Column('rating_sum', db.Integer, nullable=False, default=0)
+    _avg_rating = db.Column('avg_rating', db.Float, nullable=False, default=0.0)
 
     # Foreign key for User relationship (one-to-many: User -> Place)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
 
     # Relationships
     owner = db.relationship('User', backref='owned_places', foreign_keys=[owner_id])
@@ -49,6 +69,14 @@ class Place(BaseModel):
     # amenities relationship for many-to-many
     amenities_rel = db.relationship('Amenity', secondary='place_amenity', backref='places_list', lazy=True)
 
+    # Composite indexes matching the keyset sort orders of the listing
+    # (sort column, then id as tie-breaker)
+    __table_args__ = (
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        db.Index('ix_places_price_id', 'price', 'id'),
+        db.Index('ix_places_avg_rating_id', 'avg_rating', 'id'),
+    )
+
     def __init__(
         self,
         title,
@@ -84,6 +112,10 @@ class Place(BaseModel):
             raise TypeError("Owner must be a User instance")
         self.owner = owner
 
+        self._review_count = 0
+        self._rating_sum = 0
+        self._avg_rating = 0.0
+
         # Note: reviews and amenities_rel are managed by SQLAlchemy relationships
         # Keeping amenities for backward compatibility with in-memory list
         self.amenities = []
@@ -158,6 +190,7 @@ class Place(BaseModel):
             raise TypeError("Latitude must be a float")
         super().is_in_range("latitude", value, -90.0, 90.0)
         self._latitude = float(value)
+        self._update_geohash()
 
     @property
     def longitude(self):
@@ -176,7 +209,37 @@ class Place(BaseModel):
             raise TypeError("Longitude must be a float")
         super().is_in_range("longitude", value, -180.0, 180.0)
         self._longitude = float(value)
+        self._update_geohash()
+
+    def _update_geohash(self):
+        """Recompute the geohash once both coordinates are set."""
+        if self._latitude is not None and self._longitude is not None:
+            self._geohash = encode_geohash(self._latitude, self._longitude)
+
 
+    @property
+    def review_count(self):
+        """int: Number of reviews of the place."""
+        return self._review_count
+
+    @property
+    def rating_sum(self):
+        """int: Sum of the ratings of the place's reviews."""
+        return self._rating_sum
+
+    @property
+    def avg_rating(self):
+        """float | None: Average rating, or None if there is no review."""
+        if not self._review_count:
+            return None
+        return self._avg_rating
+
+    def update(self, data):
+        """Update the client-editable attributes (see UPDATABLE_FIELDS)."""
+        return super().update({
+            key: value for key, value in data.items()
+            if key in self.UPDATABLE_FIELDS
+        })
 
     # --- relationship helpers ---
     def add_review(self, review):
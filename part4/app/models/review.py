@@ -25,9 +25,13 @@ class Review(BaseModel):
     user = db.relationship('User', backref='user_reviews', foreign_keys=[user_id])
     place = db.relationship('Place', backref='reviews', foreign_keys=[place_id])
 
-    # Unique constraint: one review per user per place
+    # Unique constraint: one review per user per place. Its index also
+    # serves lookups by user_id; the other indexes serve the sort orders
+    # of review feeds (reviews of a place, newest or best rated first)
     __table_args__ = (
         db.UniqueConstraint('user_id', 'place_id', name='unique_user_place_review'),
+        db.Index('ix_reviews_place_id_created_at', 'place_id', 'created_at', 'id'),
+        db.Index('ix_reviews_place_id_rating', 'place_id', 'rating', 'created_at', 'id'),
     )
 
     def __init__(self, text, rating, place, user):
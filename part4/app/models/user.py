@@ -4,6 +4,15 @@ from flask import current_app
 import re
 
 
+class PasswordHash(str):
+    """
+    A bcrypt hash computed ahead of an update (see User.prehash_password).
+
+    `User.update` stores it as is instead of hashing it again; request
+    payloads decode to plain strings, so clients cannot send one.
+    """
+
+
 class User(BaseModel):
     """
     Represents a user in the system with SQLAlchemy ORM mapping.
@@ -12,14 +21,12 @@ class User(BaseModel):
         BaseModel: Provides `id`, `created_at`, and `updated_at` attributes,
         along with utility methods like `save()` and validation helpers.
 
-    Class Attributes:
-        emails (set): Tracks unique user emails across all instances to
-            prevent duplicates.
-
     Database Columns:
         first_name (String(50)): User's first name, not nullable.
         last_name (String(50)): User's last name, not nullable.
         email (String(120)): Unique and validated email, not nullable.
+        email_normalized (String(120)): Lowercased email, unique index used
+            for lookups and case-insensitive uniqueness.
         password (String(128)): Hashed password, not nullable.
         is_admin (Boolean): Admin privileges flag, default False.
 
@@ -33,13 +40,12 @@ class User(BaseModel):
     _first_name = db.Column('first_name', db.String(50), nullable=False)
     _last_name = db.Column('last_name', db.String(50), nullable=False)
     _email = db.Column('email', db.String(120), nullable=False, unique=True)
+    _email_normalized = db.Column('email_normalized', db.String(120),
+                                  nullable=False, unique=True, index=True)
     password = db.Column(db.String(128), nullable=False)
     _User__is_admin = db.Column('is_admin', db.Boolean, default=False,
                                  nullable=False)
 
-    # Class attribute for in-memory email tracking
-    emails = set()
-
     def __init__(self, first_name, last_name, email, password, is_admin=False):
         """
         Initialize a new User instance.
@@ -52,7 +58,7 @@ class User(BaseModel):
 
         Raises:
             TypeError: If argument types are incorrect.
-            ValueError: If the email format is invalid or already exists.
+            ValueError: If the email format is invalid.
         """
         super().__init__()
         self.first_name = first_name
@@ -65,13 +71,24 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        bcrypt = current_app.extensions['bcrypt']
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        hasher = current_app.extensions['password_hasher']
+        self.password = hasher.hash(password)
+
+    @staticmethod
+    def prehash_password(password):
+        """Hash a password for a later `update`, outside any write lock."""
+        hasher = current_app.extensions['password_hasher']
+        return PasswordHash(hasher.hash(password))
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        bcrypt = current_app.extensions['bcrypt']
-        return bcrypt.check_password_hash(self.password, password)
+        hasher = current_app.extensions['password_hasher']
+        return hasher.verify(password, self.password)
+
+    def password_needs_rehash(self):
+        """Checks if the password hash was made with an outdated cost."""
+        hasher = current_app.extensions['password_hasher']
+        return hasher.needs_rehash(self.password)
 
     @property
     def first_name(self):
@@ -117,28 +134,39 @@ class User(BaseModel):
         Ensures:
             - Value is a string.
             - Email format is valid.
-            - Email is unique across all users.
+
+        Uniqueness is enforced by the database on `email_normalized`.
 
         Args:
             value (str): The email address to assign.
 
         Raises:
             TypeError: If the email is not a string.
-            ValueError: If the email format is invalid or already exists.
+            ValueError: If the email format is invalid.
         """
         if not isinstance(value, str):
             raise TypeError("Email must be a string")
         if not re.match(r"[^@]+@[^@]+\.[^@]+", value):
             raise ValueError("Invalid email format")
-        if hasattr(self, '_email'):
-            if self._email != value and value in User.emails:
-                raise ValueError("Email already exists")
-            User.emails.discard(self._email)
-        else:
-            if value in User.emails:
-                raise ValueError("Email already exists")
         self._email = value
-        User.emails.add(value)
+        self._email_normalized = User.normalize_email(value)
+
+    @property
+    def email_normalized(self):
+        return self._email_normalized
+
+    @staticmethod
+    def normalize_email(email):
+        """
+        Return the canonical form of an email used for lookups.
+
+        Args:
+            email (str): Email address as entered.
+
+        Returns:
+            str: The email, stripped and lowercased.
+        """
+        return email.strip().lower()
 
     @property
     def is_admin(self):
@@ -199,7 +227,10 @@ class User(BaseModel):
         for key, value in data.items():
             if key == 'password':
                 # Hash the password instead of setting it directly
-                self.hash_password(value)
+                if isinstance(value, PasswordHash):
+                    self.password = str(value)
+                else:
+                    self.hash_password(value)
             elif hasattr(self, key):
                 setattr(self, key, value)
         self.save()  # Update the updated_at timestamp
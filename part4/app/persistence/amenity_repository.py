@@ -17,6 +17,10 @@ class AmenityRepository(SQLAlchemyRepository):
     for Amenity entities using SQLAlchemy ORM.
     """
 
+    PROJECTIONS = {
+        'list': {'id': Amenity.id, 'name': Amenity._name},
+    }
+
     def __init__(self):
         """Initialize AmenityRepository with Amenity model."""
         super().__init__(Amenity)
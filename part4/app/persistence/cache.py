@@ -0,0 +1,355 @@
+"""
+Repository Cache Module
+
+This module provides a read-through cache that can wrap any Repository:
+
+- `LRUCache`: bounded, thread-safe in-process cache with TTL expiry and
+  hit/miss/eviction counters.
+- `SharedCache`: interface of an optional second-tier cache shared between
+  processes (e.g. Redis or memcached); `LocalSharedCache` is an in-process
+  stand-in implementing it for development and tests.
+- `CachedRepository`: wraps a repository, serves `get` from the cache
+  tiers and invalidates entries on writes.
+
+SQLAlchemy instances are not cached directly, since they belong to the
+session of the request that loaded them. The cache stores a snapshot of
+their column values instead, and on a hit the snapshot is merged into the
+current session without emitting SQL (relationships still load lazily).
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.persistence.repository import Repository
+from app.persistence import unit_of_work
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-process cache with least-recently-used eviction and TTL.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups of absent or expired keys.
+        evictions (int): Entries dropped to respect `maxsize`.
+        expirations (int): Entries dropped because their TTL elapsed.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of entries.
+            ttl (float): Entry lifetime in seconds (None: no expiry).
+            clock (callable): Time source, overridable for tests.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for `key`, or `default`."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=_MISSING):
+        """
+        Store `value` under `key`, evicting the oldest entries if full.
+
+        Args:
+            ttl (float, optional): Lifetime of this entry, overriding the
+                cache's default (None: no expiry).
+        """
+        if ttl is _MISSING:
+            ttl = self.ttl
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Remove `key` if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return the counters and current size as a dict."""
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class SharedCache(ABC):
+    """Interface of a second-tier cache shared between processes."""
+
+    @abstractmethod
+    def get(self, key):
+        """Return the value stored under `key`, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl):
+        """Store a picklable `value` under `key` for `ttl` seconds."""
+        pass
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove `key` if present."""
+        pass
+
+
+class LocalSharedCache(SharedCache):
+    """
+    In-process stand-in for a shared cache.
+
+    Behaves like a network cache for a single process, so the two-tier
+    code path can be exercised without running an external service.
+    """
+
+    def __init__(self, maxsize=100000):
+        self._cache = LRUCache(maxsize=maxsize, ttl=None)
+        self._expiry = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            expires_at = self._expiry.get(key)
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._cache.delete(key)
+                del self._expiry[key]
+                return None
+        return self._cache.get(key)
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._expiry[key] = None if ttl is None else time.monotonic() + ttl
+        self._cache.set(key, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._expiry.pop(key, None)
+        self._cache.delete(key)
+
+
+class CachedRepository(Repository):
+    """
+    Read-through caching decorator for a Repository.
+
+    `get` is served from the local LRU, then from the optional shared
+    cache, then from the wrapped repository. `add`, `update` and `delete`
+    invalidate the affected entry; other methods are delegated unchanged,
+    except those the wrapped repository lists in
+    `CACHE_INVALIDATING_METHODS` (method name -> index of the object ID
+    argument, or None to clear the whole cache).
+    """
+
+    def __init__(self, repository, maxsize=1024, ttl=60.0, shared=None):
+        """
+        Args:
+            repository (Repository): Repository to wrap.
+            maxsize (int): Maximum number of locally cached objects.
+            ttl (float): Entry lifetime in seconds.
+            shared (SharedCache, optional): Second-tier cache.
+        """
+        self.repository = repository
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.shared = shared
+        self.ttl = ttl
+        self.model = getattr(repository, 'model', None)
+        self._mapper = getattr(self.model, '__mapper__', None)
+        self._namespace = getattr(self.model, '__name__', 'object')
+
+    def __getattr__(self, name):
+        if name == 'repository':
+            raise AttributeError(name)
+        attr = getattr(self.repository, name)
+        invalidating = getattr(
+            self.repository, 'CACHE_INVALIDATING_METHODS', {}
+        )
+        if name not in invalidating or not callable(attr):
+            return attr
+
+        position = invalidating[name]
+
+        def invalidating_call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if position is None or position >= len(args):
+                self.clear()
+            else:
+                self.invalidate(args[position])
+            return result
+        return invalidating_call
+
+    # --- reads ---
+
+    def get(self, obj_id, profile=None):
+        """
+        Retrieve an object by ID, from the cache when possible.
+
+        Entries hold column values only, so a request with a loading
+        profile (eager relationships, partial columns) bypasses the cache
+        and is served by the wrapped repository.
+        """
+        if profile is not None:
+            return self.repository.get(obj_id, profile=profile)
+
+        entry = self.local.get(obj_id, _MISSING)
+        if entry is _MISSING and self.shared is not None:
+            entry = self.shared.get(self._shared_key(obj_id))
+            if entry is None:
+                entry = _MISSING
+            else:
+                self.local.set(obj_id, entry)
+        if entry is not _MISSING:
+            return self._load(entry)
+
+        obj = self.repository.get(obj_id)
+        if obj is not None and not self._is_pending_write(obj):
+            entry = self._dump(obj)
+            self.local.set(obj_id, entry)
+            if self.shared is not None:
+                self.shared.set(self._shared_key(obj_id), entry, self.ttl)
+        return obj
+
+    def get_all(self, *args, **kwargs):
+        return self.repository.get_all(*args, **kwargs)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self.repository.get_by_attribute(attr_name, attr_value)
+
+    def find_by_attribute(self, attr_name, attr_value):
+        return self.repository.find_by_attribute(attr_name, attr_value)
+
+    # --- writes ---
+
+    def add(self, obj):
+        result = self.repository.add(obj)
+        self.invalidate(obj.id)
+        return result
+
+    def update(self, obj_id, data):
+        result = self.repository.update(obj_id, data)
+        self.invalidate(obj_id)
+        return result
+
+    def delete(self, obj_id):
+        result = self.repository.delete(obj_id)
+        self.invalidate(obj_id)
+        return result
+
+    # --- cache management ---
+
+    def invalidate(self, obj_id):
+        """
+        Drop the cached entry of an object.
+
+        Inside a unit of work the entry is dropped again after commit, so a
+        concurrent reader cannot re-cache the pre-commit state.
+        """
+        self._evict(obj_id)
+        if self._mapper is not None and unit_of_work.in_unit_of_work():
+            session = self._session()
+            event.listen(
+                session, 'after_commit',
+                lambda _session: self._evict(obj_id), once=True
+            )
+
+    def clear(self):
+        """Drop every locally cached entry."""
+        self.local.clear()
+
+    def stats(self):
+        """Return the local cache counters."""
+        return self.local.stats()
+
+    def _evict(self, obj_id):
+        self.local.delete(obj_id)
+        if self.shared is not None:
+            self.shared.delete(self._shared_key(obj_id))
+
+    def _shared_key(self, obj_id):
+        return f'{self._namespace}:{obj_id}'
+
+    # --- (de)serialization ---
+
+    @staticmethod
+    def _session():
+        """Late import of db to avoid circular imports."""
+        from app import db
+        return db.session()
+
+    def _is_pending_write(self, obj):
+        """Objects with unflushed or uncommitted changes are not cached."""
+        if self._mapper is None:
+            return False
+        if unit_of_work.in_unit_of_work():
+            return True
+        state = inspect(obj)
+        return state.modified or not state.persistent
+
+    def _dump(self, obj):
+        """Convert an object into a cache entry."""
+        if self._mapper is None:
+            return obj
+        return {
+            attr.key: getattr(obj, attr.key)
+            for attr in self._mapper.column_attrs
+        }
+
+    def _load(self, entry):
+        """Turn a cache entry back into an object of the current session."""
+        if self._mapper is None:
+            return entry
+
+        session = self._session()
+        identity = session.identity_key(self.model, entry['id'])
+        existing = session.identity_map.get(identity)
+        if existing is not None:
+            return existing
+
+        obj = self._mapper.class_manager.new_instance()
+        for key, value in entry.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return session.merge(obj, load=False)
@@ -0,0 +1,163 @@
+"""
+Database Engine Configuration
+
+Builds the SQLAlchemy engine options from the application config and tunes
+every connection when it is opened:
+
+- server databases (PostgreSQL, MySQL) get a sized connection pool with
+  pre-ping and recycling, plus an optional per-session statement timeout,
+- SQLite gets WAL journaling, `synchronous=NORMAL`, memory-mapped I/O and
+  a busy timeout, so readers no longer block behind a writer.
+
+`validate_database_config` runs when the app starts, so a misconfigured
+deployment fails immediately rather than under load.
+"""
+
+from sqlalchemy import event
+
+from app.persistence.routing import REPLICA_BIND_PREFIX
+
+SQLITE_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def is_sqlite(uri):
+    """Return True if `uri` points to a SQLite database."""
+    return uri.startswith('sqlite')
+
+
+def validate_database_config(config):
+    """
+    Check the database settings of an app config.
+
+    Args:
+        config (dict): The Flask app config.
+
+    Raises:
+        ValueError: Listing every invalid setting.
+    """
+    errors = []
+
+    def check(key, valid, requirement):
+        value = config.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) \
+                or not valid(value):
+            errors.append(f"{key} must be {requirement} (got {value!r})")
+
+    if not config.get('SQLALCHEMY_DATABASE_URI'):
+        errors.append("SQLALCHEMY_DATABASE_URI is not set")
+    check('DB_POOL_SIZE', lambda v: v >= 1, 'at least 1')
+    check('DB_MAX_OVERFLOW', lambda v: v >= 0, 'positive or zero')
+    check('DB_POOL_TIMEOUT', lambda v: v > 0, 'positive')
+    check('DB_POOL_RECYCLE', lambda v: v == -1 or v > 0, 'positive or -1')
+    check('DB_STATEMENT_TIMEOUT_MS', lambda v: v >= 0, 'positive or zero')
+    check('SQLITE_MMAP_SIZE', lambda v: v >= 0, 'positive or zero')
+    check('SQLITE_BUSY_TIMEOUT_MS', lambda v: v >= 0, 'positive or zero')
+    if str(config.get('SQLITE_SYNCHRONOUS')).upper() \
+            not in SQLITE_SYNCHRONOUS_MODES:
+        errors.append(
+            f"SQLITE_SYNCHRONOUS must be one of {SQLITE_SYNCHRONOUS_MODES}"
+        )
+    replicas = config.get('SQLALCHEMY_REPLICA_URIS')
+    if not isinstance(replicas, (list, tuple)) \
+            or not all(isinstance(uri, str) and uri for uri in replicas):
+        errors.append("SQLALCHEMY_REPLICA_URIS must be a list of URIs")
+
+    if errors:
+        raise ValueError(
+            "Invalid database configuration: " + "; ".join(errors)
+        )
+
+
+def engine_options(config, uri):
+    """
+    Build the `create_engine` keyword arguments for a database.
+
+    Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS take precedence.
+
+    Args:
+        config (dict): The Flask app config.
+        uri (str): Database URI the engine connects to.
+
+    Returns:
+        dict: Engine options.
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    # SQLite connections are local files: Flask-SQLAlchemy's pool defaults
+    # suit them, and sizing arguments are not accepted by its memory pool
+    if not is_sqlite(uri):
+        options.setdefault('pool_size', config['DB_POOL_SIZE'])
+        options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+        options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+        options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+        options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+    return options
+
+
+def replica_binds(config):
+    """
+    Build the Flask-SQLAlchemy binds of the read replicas.
+
+    Returns:
+        dict: Bind key -> engine settings, one per SQLALCHEMY_REPLICA_URIS.
+    """
+    return {
+        f'{REPLICA_BIND_PREFIX}{index}': {
+            'url': uri, **engine_options(config, uri)
+        }
+        for index, uri in enumerate(config['SQLALCHEMY_REPLICA_URIS'])
+    }
+
+
+def connection_setup_statements(dialect, config):
+    """
+    List the statements run on each new connection of a dialect.
+
+    Args:
+        dialect (str): SQLAlchemy dialect name.
+        config (dict): The Flask app config.
+
+    Returns:
+        list: SQL statements.
+    """
+    timeout = config.get('DB_STATEMENT_TIMEOUT_MS', 0)
+    if dialect == 'sqlite':
+        statements = []
+        if config.get('SQLITE_WAL'):
+            statements.append("PRAGMA journal_mode=WAL")
+        statements.append(
+            f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS'].upper()}"
+        )
+        statements.append(f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}")
+        statements.append(
+            f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}"
+        )
+        return statements
+    if not timeout:
+        return []
+    if dialect == 'postgresql':
+        return [f"SET statement_timeout = {int(timeout)}"]
+    if dialect in ('mysql', 'mariadb'):
+        return [f"SET SESSION max_execution_time = {int(timeout)}"]
+    return []
+
+
+def configure_connections(engine, config):
+    """
+    Run the setup statements on every new DBAPI connection of `engine`.
+
+    Args:
+        engine: SQLAlchemy engine.
+        config (dict): The Flask app config.
+    """
+    statements = connection_setup_statements(engine.dialect.name, config)
+    if not statements:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def setup_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -0,0 +1,787 @@
+"""
+In-Memory Repository Module
+
+Repositories of the in-memory backend (REPOSITORY_TYPE = 'in_memory').
+
+Model instances are kept as transient objects, never added to a
+SQLAlchemy session: relationships are plain references maintained by
+SQLAlchemy's backrefs, and foreign key attributes are filled in on `add`.
+Each repository exposes the methods the facade uses on its SQLAlchemy
+counterpart, evaluated in Python over the indexes of InMemoryRepository.
+Registered in a MemoryStore, writes are logged and survive restarts.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from itertools import islice
+from datetime import datetime
+
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import MANYTOMANY, MANYTOONE
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.pagination import decode_cursor, encode_cursor
+from app.persistence.repository import (
+    CONFLICT_ERROR,
+    INVALID_TYPE_ERROR,
+    DuplicateKeyError,
+    InMemoryRepository,
+)
+from app.utils.geo import bounding_box, haversine_km, normalize_longitude
+
+
+class InMemoryModelRepository(InMemoryRepository):
+    """
+    In-memory repository of a SQLAlchemy model.
+
+    Projections map field names to attribute names of the model, and rows
+    are namedtuples, like the rows returned by SQLAlchemy projections.
+    Filters are predicates taking an object.
+    """
+
+    # Column projections for list views: name -> {field: attribute name}
+    PROJECTIONS = {}
+
+    def __init__(self, model):
+        """
+        Args:
+            model: SQLAlchemy model class (e.g., User, Place, Review)
+        """
+        super().__init__()
+        self.model = model
+        self.name = model.__tablename__
+        self._store = None
+        mapper = inspect(model)
+        self._mapper = mapper
+        self._columns = [attr.key for attr in mapper.column_attrs]
+        # Column name -> attribute key (e.g. 'title' -> '_title')
+        self._column_keys = {
+            attr.columns[0].name: attr.key for attr in mapper.column_attrs
+        }
+        # Attribute key -> Python type, to validate cursor values
+        self._types = {
+            attr.key: attr.columns[0].type.python_type
+            for attr in mapper.column_attrs
+        }
+        self._datetimes = {
+            attr.key for attr in mapper.column_attrs
+            if isinstance(attr.columns[0].type, DateTime)
+        }
+        # Many-to-one references: (relationship, foreign key attribute,
+        # referenced model); many-to-many collections: (relationship,
+        # model of the items)
+        self._references = [
+            (rel.key,
+             mapper.get_property_by_column(rel.local_remote_pairs[0][0]).key,
+             rel.mapper.class_)
+            for rel in mapper.relationships if rel.direction is MANYTOONE
+        ]
+        self._collections = [
+            (rel.key, rel.mapper.class_)
+            for rel in mapper.relationships if rel.direction is MANYTOMANY
+        ]
+        self._row_types = {}
+        self._unlinked = {}
+        self._modified_at = None
+        self._writes = 0
+
+    def attach(self, store, name):
+        """Share the lock of a MemoryStore and log writes to it."""
+        self._store = store
+        self._lock = store.lock
+        self.name = name
+
+    def _transaction(self):
+        if self._store is not None:
+            return self._store.transaction()
+        return self._lock
+
+    # --- writes ---
+
+    def add(self, obj):
+        """
+        Add an object, filling in its foreign keys from its references.
+
+        Raises:
+            DuplicateKeyError: If a uniquely indexed value is already taken
+        """
+        with self._transaction():
+            self._sync_foreign_keys(obj)
+            try:
+                super().add(obj)
+            except DuplicateKeyError:
+                self._unlink(obj)
+                raise
+            self._written(obj)
+
+    def add_many(self, objs, chunk_size=1000):
+        """
+        Add many objects, logging one transaction per chunk.
+
+        Returns:
+            list: (position in objs, error message) for rejected objects
+        """
+        failures = []
+        for start in range(0, len(objs), chunk_size):
+            with self._transaction():
+                for offset, obj in enumerate(objs[start:start + chunk_size]):
+                    try:
+                        self.add(obj)
+                    except DuplicateKeyError:
+                        failures.append((start + offset, CONFLICT_ERROR))
+        return failures
+
+    def update(self, obj_id, data):
+        """
+        Update an object through its model's `update` method.
+
+        A rejected update leaves the object unchanged.
+
+        Returns:
+            The updated object, or None if not found
+        """
+        with self._transaction():
+            obj = self._storage.get(obj_id)
+            if obj is None:
+                return None
+            saved = self._column_values(obj)
+            try:
+                obj.update(data)
+                self.reindex(obj)
+            except Exception:
+                self._set_columns(obj, saved)
+                raise
+            self._link(obj)
+            self._written(obj)
+            return obj
+
+    def update_many(self, updates, chunk_size=1000):
+        """
+        Update many objects, logging one transaction per chunk.
+
+        Returns:
+            list: (position in updates, error message) for rejected rows
+        """
+        failures = []
+        for start in range(0, len(updates), chunk_size):
+            with self._transaction():
+                chunk = updates[start:start + chunk_size]
+                for offset, (obj_id, data) in enumerate(chunk):
+                    try:
+                        if self.update(obj_id, data) is None:
+                            failures.append((start + offset, 'Not found'))
+                    except DuplicateKeyError:
+                        failures.append((start + offset, CONFLICT_ERROR))
+                    except TypeError:
+                        failures.append((start + offset, INVALID_TYPE_ERROR))
+                    except ValueError as e:
+                        failures.append((start + offset, str(e)))
+        return failures
+
+    def delete(self, obj_id):
+        """Delete an object and detach it from the objects it references."""
+        with self._transaction():
+            obj = self._storage.get(obj_id)
+            if obj is None:
+                return False
+            super().delete(obj_id)
+            self._unlink(obj)
+            self._touch()
+            if self._store is not None:
+                self._store.record_delete(self.name, obj_id)
+            return True
+
+    def insert_rows(self, rows, chunk_size=1000):
+        """
+        Insert raw rows, logging one transaction per chunk.
+
+        Rows use the format of SQLAlchemyRepository.insert_rows: dicts
+        keyed by column name, many-to-many relationships as lists of IDs.
+        No setter validation applies.
+
+        Returns:
+            int: Number of rows inserted
+
+        Raises:
+            DuplicateKeyError: If a uniquely indexed value is already taken
+        """
+        collections = {key for key, _ in self._collections}
+        inserted = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return inserted
+            with self._transaction():
+                for row in chunk:
+                    values = {
+                        self._column_keys.get(key, key): value
+                        for key, value in row.items()
+                        if key in self._column_keys or key in collections
+                    }
+                    self._written(self.restore(values))
+            inserted += len(chunk)
+
+    def _written(self, obj):
+        self._touch()
+        if self._store is not None:
+            self._store.record_put(self.name, self.dump(obj))
+
+    def _touch(self):
+        self._modified_at = datetime.utcnow()
+        self._writes += 1
+
+    # --- reads ---
+
+    def get(self, obj_id, profile=None):
+        """Retrieve an object by ID (loading profiles do not apply)."""
+        return self._storage.get(obj_id)
+
+    def get_all(self, profile=None):
+        """Retrieve all objects."""
+        return super().get_all()
+
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by ID.
+
+        Returns:
+            tuple: (list of objects in the order of the first occurrence
+            of each ID, list of IDs that were not found)
+        """
+        ordered_ids = list(dict.fromkeys(obj_ids))
+        with self._lock:
+            objs = [self._storage[obj_id] for obj_id in ordered_ids
+                    if obj_id in self._storage]
+            missing = [obj_id for obj_id in ordered_ids
+                       if obj_id not in self._storage]
+        return objs, missing
+
+    def get_version(self):
+        """
+        Summarize the state of the whole collection.
+
+        Returns:
+            tuple: (time of the latest write, number of objects, number of
+            writes since startup)
+        """
+        with self._lock:
+            return self._modified_at, len(self._storage), self._writes
+
+    def project(self, projection, filters=None):
+        """Retrieve the rows of a projection, optionally filtered."""
+        with self._lock:
+            objs = self._filtered(self._storage.values(), filters)
+        return [self._row(projection, obj) for obj in objs]
+
+    def project_many(self, projection, obj_ids):
+        """Retrieve the projected rows of several objects by ID."""
+        objs, _ = self.get_many(
+            obj_id for obj_id in obj_ids if obj_id is not None
+        )
+        return {obj.id: self._row(projection, obj) for obj in objs}
+
+    def stream(self, projection, filters=None, batch_size=1000):
+        """Iterate over every row of a projection, in ID order."""
+        with self._lock:
+            objs = sorted(
+                self._filtered(self._storage.values(), filters),
+                key=lambda obj: obj.id
+            )
+        for obj in objs:
+            yield self._row(projection, obj)
+
+    def get_page(self, limit, cursor=None, filters=None, order_by=None,
+                 descending=False, projection=None):
+        """
+        Retrieve one page of objects using keyset pagination.
+
+        When the first sort key has a sorted index, the page is read from
+        the index starting after the cursor; otherwise matching objects
+        are sorted first.
+
+        Args:
+            limit: Maximum number of objects to return
+            cursor: Cursor returned with the previous page, or None
+            filters: Optional list of predicates
+            order_by: Attribute names forming a unique sort key (must end
+                with 'id'; default created_at, id)
+            descending: Sort in descending order instead of ascending
+            projection: Optional projection name; rows are returned
+                instead of objects
+
+        Returns:
+            tuple: (list of objects or rows, next cursor or None)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        order_by = order_by or ['created_at', 'id']
+        after = None
+        if cursor is not None:
+            after = tuple(self._decode_cursor(cursor, order_by, descending))
+        try:
+            with self._lock:
+                if len(order_by) == 2 and order_by[0] in self._sorted:
+                    objs = self._scan_sorted(
+                        order_by[0], limit + 1, after, filters, descending
+                    )
+                else:
+                    objs = self._sort_page(
+                        self._filtered(self._storage.values(), filters),
+                        limit + 1, after, order_by, descending
+                    )
+        except TypeError:
+            raise ValueError("Invalid cursor")
+        return self._page_result(
+            objs, limit, order_by, descending, projection
+        )
+
+    def _scan_sorted(self, attr, count, after, filters, descending):
+        """Read up to `count` matching objects from a sorted index."""
+        entries = self._sorted[attr]
+        if descending:
+            end = len(entries) if after is None else bisect_left(entries, after)
+            positions = range(end - 1, -1, -1)
+        else:
+            start = 0 if after is None else bisect_right(entries, after)
+            positions = range(start, len(entries))
+        objs = []
+        for position in positions:
+            obj = self._storage[entries[position][1]]
+            if not filters or all(match(obj) for match in filters):
+                objs.append(obj)
+                if len(objs) == count:
+                    break
+        return objs
+
+    @staticmethod
+    def _sort_page(objs, count, after, order_by, descending):
+        """Sort objects on a key and keep `count` of them after `after`."""
+        def key(obj):
+            return tuple(getattr(obj, attr) for attr in order_by)
+
+        if after is not None:
+            objs = [obj for obj in objs
+                    if (key(obj) < after if descending else key(obj) > after)]
+        return sorted(objs, key=key, reverse=descending)[:count]
+
+    def _decode_cursor(self, cursor, order_by, descending):
+        return decode_cursor(
+            cursor, order_by, descending,
+            [self._types[attr] for attr in order_by]
+        )
+
+    def _page_result(self, objs, limit, order_by, descending, projection):
+        next_cursor = None
+        if len(objs) > limit:
+            objs = objs[:limit]
+            next_cursor = encode_cursor(
+                [getattr(objs[-1], attr) for attr in order_by], order_by,
+                descending
+            )
+        if projection is not None:
+            objs = [self._row(projection, obj) for obj in objs]
+        return objs, next_cursor
+
+    @staticmethod
+    def _filtered(objs, filters):
+        if not filters:
+            return list(objs)
+        return [obj for obj in objs if all(match(obj) for match in filters)]
+
+    def _row(self, projection, obj):
+        if projection not in self.PROJECTIONS:
+            raise ValueError(f"Unknown projection: {projection}")
+        fields = self.PROJECTIONS[projection]
+        row_type = self._row_types.get(projection)
+        if row_type is None:
+            row_type = namedtuple('Row', list(fields))
+            self._row_types[projection] = row_type
+        return row_type(*[getattr(obj, attr) for attr in fields.values()])
+
+    # --- persistence (see MemoryStore) ---
+
+    def dump(self, obj):
+        """Return the JSON-serializable state of an object."""
+        data = {key: getattr(obj, key) for key in self._columns}
+        for key, _ in self._collections:
+            data[key] = [item.id for item in getattr(obj, key)]
+        return data
+
+    def restore(self, data, link=True):
+        """
+        Insert or overwrite an object from its dumped state.
+
+        Args:
+            data (dict): State returned by `dump`.
+            link (bool): Resolve references now; when False they are
+                resolved by `link_all` once every repository is loaded.
+
+        Returns:
+            The restored object
+        """
+        with self._lock:
+            values = dict(data)
+            for key in self._datetimes:
+                if isinstance(values.get(key), str):
+                    values[key] = datetime.fromisoformat(values[key])
+            obj = self._storage.get(values['id'])
+            if obj is None:
+                obj = self._mapper.class_manager.new_instance()
+            self._set_columns(obj, values)
+            InMemoryRepository.add(self, obj)
+            collections = {
+                key: values[key] for key, _ in self._collections
+                if key in values
+            }
+            if link:
+                self._link(obj, collections)
+            else:
+                self._unlinked[obj.id] = collections
+            if self._modified_at is None or obj.updated_at > self._modified_at:
+                self._modified_at = obj.updated_at
+            return obj
+
+    def link_all(self):
+        """Resolve the references of objects restored with link=False."""
+        with self._lock:
+            for obj_id, collections in self._unlinked.items():
+                self._link(self._storage[obj_id], collections)
+            self._unlinked = {}
+
+    def _column_values(self, obj):
+        return {key: getattr(obj, key) for key in self._columns}
+
+    def _set_columns(self, obj, values):
+        for key in self._columns:
+            set_committed_value(obj, key, values.get(key))
+
+    def _sync_foreign_keys(self, obj):
+        for key, foreign_key, _ in self._references:
+            target = getattr(obj, key)
+            if target is not None:
+                setattr(obj, foreign_key, target.id)
+
+    def _link(self, obj, collections=None):
+        """Point references (and their backrefs) at the stored objects."""
+        for key, foreign_key, model in self._references:
+            target_id = getattr(obj, foreign_key)
+            current = getattr(obj, key)
+            if current is None or current.id != target_id:
+                target = None
+                if target_id is not None and self._store is not None:
+                    target = self._store.repository_for(model).get(target_id)
+                setattr(obj, key, target)
+        for key, model in self._collections:
+            if collections and key in collections:
+                repository = self._store.repository_for(model)
+                items, _ = repository.get_many(collections[key])
+                setattr(obj, key, items)
+
+    def _unlink(self, obj):
+        """Detach an object from the collections of the objects it references."""
+        for key, _, _ in self._references:
+            if getattr(obj, key) is not None:
+                setattr(obj, key, None)
+        for key, _ in self._collections:
+            setattr(obj, key, [])
+
+
+class InMemoryUserRepository(InMemoryModelRepository):
+    """In-memory counterpart of UserRepository."""
+
+    UNIQUE_INDEXES = ('_email_normalized',)
+
+    PROJECTIONS = {
+        'author': {
+            'id': 'id',
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+        },
+        'list': {
+            'id': 'id',
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+            'email': 'email',
+        },
+        'export': {
+            'id': 'id',
+            'first_name': 'first_name',
+            'last_name': 'last_name',
+            'email': 'email',
+            'is_admin': 'is_admin',
+            'created_at': 'created_at',
+            'updated_at': 'updated_at',
+        },
+    }
+
+    def __init__(self):
+        super().__init__(User)
+
+    def get_user_by_email(self, email):
+        """Retrieve a user by email address (case-insensitive)."""
+        if not isinstance(email, str):
+            return None
+        return self.get_by_attribute(
+            '_email_normalized', User.normalize_email(email)
+        )
+
+    def email_exists(self, email, exclude_id=None):
+        """Check whether another user has this email."""
+        user = self.get_user_by_email(email)
+        return user is not None and user.id != exclude_id
+
+
+class InMemoryAmenityRepository(InMemoryModelRepository):
+    """In-memory counterpart of AmenityRepository."""
+
+    UNIQUE_INDEXES = ('_name',)
+
+    PROJECTIONS = {
+        'list': {'id': 'id', 'name': 'name'},
+    }
+
+    def __init__(self):
+        super().__init__(Amenity)
+
+
+class InMemoryPlaceRepository(InMemoryModelRepository):
+    """In-memory counterpart of PlaceRepository."""
+
+    INDEXES = ('owner_id',)
+    SORTED_INDEXES = ('created_at', '_price', '_avg_rating', '_latitude')
+
+    PROJECTIONS = {
+        'card': {
+            'id': 'id',
+            'title': 'title',
+            'price': 'price',
+            'latitude': 'latitude',
+            'longitude': 'longitude',
+            'review_count': 'review_count',
+            'avg_rating': 'avg_rating',
+        },
+    }
+
+    # Supported sort orders: name -> (sort key attributes, descending)
+    SORT_ORDERS = {
+        'created': (['created_at', 'id'], False),
+        'newest': (['created_at', 'id'], True),
+        'price_asc': (['_price', 'id'], False),
+        'price_desc': (['_price', 'id'], True),
+        'rating': (['_avg_rating', 'id'], True),
+    }
+
+    def __init__(self):
+        super().__init__(Place)
+
+    def build_filters(self, min_price=None, max_price=None, amenity_ids=None,
+                      owner_id=None):
+        """Translate listing criteria into predicates."""
+        filters = []
+        if min_price is not None:
+            filters.append(lambda place: place.price >= min_price)
+        if max_price is not None:
+            filters.append(lambda place: place.price <= max_price)
+        if owner_id is not None:
+            filters.append(lambda place: place.owner_id == owner_id)
+        if amenity_ids:
+            required = set(amenity_ids)
+            filters.append(lambda place: required <= {
+                amenity.id for amenity in place.amenities_rel
+            })
+        return filters
+
+    def find_page(self, limit, cursor=None, sort='created', profile='card',
+                  projection=None, **criteria):
+        """Retrieve one page of places matching the given criteria."""
+        if sort not in self.SORT_ORDERS:
+            raise ValueError(f"Invalid sort order: {sort}")
+        order_by, descending = self.SORT_ORDERS[sort]
+        return self.get_page(
+            limit, cursor, filters=self.build_filters(**criteria),
+            order_by=order_by, descending=descending, projection=projection
+        )
+
+    def get_detail_version(self, place_id):
+        """Summarize a place and the objects its detail view embeds."""
+        with self._lock:
+            place = self._storage.get(place_id)
+            if place is None:
+                return None
+            amenities = list(place.amenities_rel)
+            reviews = list(place.reviews)
+            return (
+                place.updated_at,
+                place.owner.updated_at if place.owner is not None else None,
+                max((amenity.updated_at for amenity in amenities), default=None),
+                len(amenities),
+                max((review.updated_at for review in reviews), default=None),
+                len(reviews),
+                max((review.user.updated_at for review in reviews
+                     if review.user is not None), default=None),
+            )
+
+    def set_amenities(self, place_id, amenities):
+        """Replace the amenities of a place."""
+        with self._transaction():
+            place = self._storage.get(place_id)
+            if place is not None:
+                place.amenities_rel = list(amenities)
+                self._written(place)
+
+    def adjust_review_aggregates(self, place_id, count_delta, rating_delta):
+        """Apply a review write to the place's rating aggregates."""
+        with self._transaction():
+            place = self._storage.get(place_id)
+            if place is not None:
+                self._set_aggregates(
+                    place,
+                    place.review_count + count_delta,
+                    place._rating_sum + rating_delta
+                )
+
+    def recompute_review_aggregates(self, place_ids=None):
+        """Rebuild rating aggregates from the places' reviews."""
+        with self._transaction():
+            if place_ids is None:
+                places = list(self._storage.values())
+            else:
+                places, _ = self.get_many(place_ids)
+            for place in places:
+                self._set_aggregates(
+                    place, len(place.reviews),
+                    sum(review.rating for review in place.reviews)
+                )
+            return len(places)
+
+    def _set_aggregates(self, place, review_count, rating_sum):
+        place._review_count = review_count
+        place._rating_sum = rating_sum
+        place._avg_rating = rating_sum / review_count if review_count > 0 else 0.0
+        place.updated_at = datetime.utcnow()
+        self.reindex(place)
+        self._written(place)
+
+    def find_in_bbox(self, min_lat, min_lon, max_lat, max_lon, limit):
+        """
+        Retrieve places inside a bounding box, in ID order.
+
+        Longitudes follow PlaceRepository.find_in_bbox: they may leave the
+        [-180, 180] range when the box crosses the antimeridian.
+        """
+        in_longitudes = _longitude_predicate(min_lon, max_lon)
+        places = sorted(
+            (place for place in self.find_range('_latitude', min_lat, max_lat)
+             if in_longitudes(place.longitude)),
+            key=lambda place: place.id
+        )
+        return places if limit is None else places[:limit]
+
+    def find_nearby(self, latitude, longitude, radius_km, limit):
+        """Retrieve the places closest to a point within a radius."""
+        candidates = self.find_in_bbox(
+            *bounding_box(latitude, longitude, radius_km), limit=None
+        )
+        matches = []
+        for place in candidates:
+            distance = haversine_km(
+                latitude, longitude, place.latitude, place.longitude
+            )
+            if distance <= radius_km:
+                matches.append((place, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches[:limit]
+
+
+class InMemoryReviewRepository(InMemoryModelRepository):
+    """In-memory counterpart of ReviewRepository."""
+
+    UNIQUE_INDEXES = (('user_id', 'place_id'),)
+    INDEXES = ('place_id',)
+
+    PROJECTIONS = {
+        'list': {'id': 'id', 'text': 'text', 'rating': 'rating'},
+        'feed': {
+            'id': 'id',
+            'text': 'text',
+            'rating': 'rating',
+            'user_id': 'user_id',
+            'created_at': 'created_at',
+        },
+        'export': {
+            'id': 'id',
+            'text': 'text',
+            'rating': 'rating',
+            'user_id': 'user_id',
+            'place_id': 'place_id',
+            'created_at': 'created_at',
+            'updated_at': 'updated_at',
+        },
+    }
+
+    # Sort orders of a place's review feed: name -> (sort key, descending)
+    FEED_SORT_ORDERS = {
+        'newest': (['created_at', 'id'], True),
+        'rating': (['_rating', 'created_at', 'id'], True),
+    }
+
+    def __init__(self):
+        super().__init__(Review)
+
+    def update(self, review_id, data):
+        """Update the text and rating of a review"""
+        return super().update(review_id, {
+            key: value for key, value in data.items()
+            if key in ('text', 'rating')
+        })
+
+    def exists_for(self, user_id, place_id):
+        """Check whether a user has reviewed a place"""
+        return self.get_by_attribute(
+            ('user_id', 'place_id'), (user_id, place_id)
+        ) is not None
+
+    def get_by_place(self, place_id):
+        """Get all reviews for a specific place"""
+        return self.find_by_attribute('place_id', place_id)
+
+    def find_page_by_place(self, place_id, limit, cursor=None, sort='newest',
+                           rating=None, projection='feed'):
+        """Retrieve one page of the review feed of a place."""
+        if sort not in self.FEED_SORT_ORDERS:
+            raise ValueError(f"Invalid sort order: {sort}")
+        order_by, descending = self.FEED_SORT_ORDERS[sort]
+        after = None
+        if cursor is not None:
+            after = tuple(self._decode_cursor(cursor, order_by, descending))
+        reviews = self.get_by_place(place_id)
+        if rating is not None:
+            reviews = [review for review in reviews if review.rating == rating]
+        try:
+            page = self._sort_page(
+                reviews, limit + 1, after, order_by, descending
+            )
+        except TypeError:
+            raise ValueError("Invalid cursor")
+        return self._page_result(
+            page, limit, order_by, descending, projection
+        )
+
+
+def _longitude_predicate(min_lon, max_lon):
+    """Longitude test of a bounding box, handling the antimeridian."""
+    if max_lon - min_lon >= 360.0:
+        return lambda longitude: True
+    if min_lon < -180.0:
+        low = normalize_longitude(min_lon)
+        return lambda longitude: longitude >= low or longitude <= max_lon
+    if max_lon >= 180.0:
+        high = normalize_longitude(max_lon)
+        return lambda longitude: longitude >= min_lon or longitude <= high
+    return lambda longitude: min_lon <= longitude <= max_lon
@@ -0,0 +1,216 @@
+"""
+In-Memory Store Module
+
+This module makes the in-memory repositories (REPOSITORY_TYPE =
+'in_memory') durable and safe to share between threads:
+
+- One re-entrant lock guards every repository of the store. Writes, and
+  multi-repository transactions such as a review and its place's
+  aggregates, are atomic for readers.
+- Each committed transaction is appended to an operation log as a single
+  JSON line (the full state of every written object, or a deletion), and
+  flushed before the write returns.
+- Once SNAPSHOT_EVERY transactions have been logged, the whole state is
+  written to a compact snapshot file and the log is truncated.
+- At startup the snapshot is loaded, then the log replayed on top of it. A
+  line torn by a crash is dropped, so a transaction is replayed entirely
+  or not at all.
+
+Nothing is rolled back in memory when a transaction fails halfway; the
+log records what was applied, so a restart reproduces the same state. The
+files must be used by a single process (e.g. one multi-threaded worker).
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+from app.utils.serialization import dumps, loads
+
+SNAPSHOT_FILE = 'snapshot.jsonl'
+LOG_FILE = 'oplog.jsonl'
+
+
+class MemoryStore:
+    """
+    Shared lock, operation log and snapshots of in-memory repositories.
+
+    Attributes:
+        lock (threading.RLock): Lock of every registered repository.
+        repositories (dict): Registered repositories by name, in
+            registration order (referenced entities first).
+    """
+
+    def __init__(self, path=None, snapshot_every=10000, fsync=False):
+        """
+        Args:
+            path (str, optional): Directory of the snapshot and log files;
+                None keeps the data in memory only.
+            snapshot_every (int): Logged transactions between snapshots.
+            fsync (bool): Sync the log to disk on every commit, instead of
+                only flushing it to the operating system.
+        """
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.lock = threading.RLock()
+        self.repositories = {}
+        self._by_model = {}
+        self._pending = None
+        self._log = None
+        self._logged = 0
+        self._replaying = False
+
+    def register(self, name, repository):
+        """Attach a repository to the store under `name`."""
+        repository.attach(self, name)
+        self.repositories[name] = repository
+        model = getattr(repository, 'model', None)
+        if model is not None:
+            self._by_model[model] = repository
+
+    def repository_for(self, model):
+        """Return the registered repository of a model class."""
+        return self._by_model[model]
+
+    # --- transactions ---
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into one atomic log record.
+
+        Transactions nest; only the outermost one writes to the log.
+        """
+        with self.lock:
+            outermost = self._pending is None
+            if outermost:
+                self._pending = []
+            try:
+                yield self
+            finally:
+                if outermost:
+                    records, self._pending = self._pending, None
+                    self._append(records)
+
+    def record_put(self, name, data):
+        """Log the full state of a written object."""
+        self._record({'op': 'put', 'repo': name, 'data': data})
+
+    def record_delete(self, name, obj_id):
+        """Log the deletion of an object."""
+        self._record({'op': 'delete', 'repo': name, 'id': obj_id})
+
+    def _record(self, record):
+        if self._replaying:
+            return
+        with self.transaction():
+            self._pending.append(record)
+
+    def _append(self, records):
+        if not records or self._log is None:
+            return
+        self._log.write(dumps(records) + b'\n')
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._logged += 1
+        if self._logged >= self.snapshot_every:
+            self.snapshot()
+
+    # --- durability ---
+
+    def load(self):
+        """
+        Rebuild the repositories from the snapshot and the log.
+
+        Returns:
+            int: Number of log transactions replayed.
+        """
+        if self.path is None:
+            return 0
+        os.makedirs(self.path, exist_ok=True)
+        with self.lock:
+            self._replaying = True
+            try:
+                self._load_snapshot()
+                replayed = self._replay_log()
+            finally:
+                self._replaying = False
+            self._log = open(self._file(LOG_FILE), 'ab')
+            self._logged = replayed
+        return replayed
+
+    def snapshot(self):
+        """Write the whole state to the snapshot file and empty the log."""
+        if self.path is None:
+            return
+        with self.lock:
+            temporary = self._file(SNAPSHOT_FILE + '.tmp')
+            with open(temporary, 'wb') as snapshot:
+                for name, repository in self.repositories.items():
+                    for obj in repository.get_all():
+                        snapshot.write(dumps(
+                            {'repo': name, 'data': repository.dump(obj)}
+                        ) + b'\n')
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temporary, self._file(SNAPSHOT_FILE))
+
+            # Replaying a log already covered by the snapshot is harmless,
+            # so a crash before the truncation loses nothing
+            if self._log is not None:
+                self._log.close()
+            self._log = open(self._file(LOG_FILE), 'wb')
+            self._logged = 0
+
+    def close(self):
+        """Close the log file."""
+        with self.lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    def _load_snapshot(self):
+        path = self._file(SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as snapshot:
+            for line in snapshot:
+                entry = loads(line)
+                self.repositories[entry['repo']].restore(
+                    entry['data'], link=False
+                )
+        # References are resolved once every object exists
+        for repository in self.repositories.values():
+            repository.link_all()
+
+    def _replay_log(self):
+        path = self._file(LOG_FILE)
+        if not os.path.exists(path):
+            return 0
+        replayed = 0
+        valid_size = 0
+        with open(path, 'rb') as log:
+            for line in log:
+                try:
+                    records = loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    records = None
+                if records is None:
+                    break
+                for record in records:
+                    repository = self.repositories[record['repo']]
+                    if record['op'] == 'put':
+                        repository.restore(record['data'])
+                    else:
+                        repository.delete(record['id'])
+                replayed += 1
+                valid_size += len(line)
+        # Drop a transaction torn by a crash
+        if valid_size < os.path.getsize(path):
+            os.truncate(path, valid_size)
+        return replayed
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
@@ -0,0 +1,267 @@
+"""
+Schema Migrations Module
+
+The schema is versioned: `MIGRATIONS` lists ordered, numbered steps and
+the `schema_version` table records the ones applied to a database, so
+starting the application (or running `migrate_database.py`) brings any
+database, new or old, up to the current schema:
+
+- Version 1 creates the tables of the current models, which makes every
+  later step a no-op on a fresh database.
+- Later versions bring databases created by earlier releases up to date.
+  They inspect the live schema first, so they are safe to re-run.
+
+Index builds run outside a transaction and, on PostgreSQL, with
+`CREATE INDEX CONCURRENTLY`, so they do not block writes to the table
+being indexed (MySQL/InnoDB builds secondary indexes online by default).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, inspect, select,
+    text
+)
+
+from app.utils.geo import encode_geohash
+
+GEOHASH_BACKFILL_BATCH_SIZE = 1000
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+    'schema_version', _version_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+class Migration:
+    """
+    A numbered schema change.
+
+    Attributes:
+        version (int): Position in the migration order.
+        description (str): Summary recorded in `schema_version`.
+        upgrade (callable): `upgrade(connection, metadata)` applying it.
+        transactional (bool): Whether it runs inside a transaction; index
+            builds run outside one so they can be built online.
+    """
+
+    def __init__(self, version, description, upgrade, transactional=True):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+        self.transactional = transactional
+
+
+MIGRATIONS = []
+
+
+def migration(version, description, transactional=True):
+    """Register the decorated function as the upgrade of a migration."""
+    def register(upgrade):
+        MIGRATIONS.append(
+            Migration(version, description, upgrade, transactional)
+        )
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return upgrade
+    return register
+
+
+# --- migrations ---
+
+@migration(1, 'Create the initial schema')
+def create_schema(connection, metadata):
+    metadata.create_all(connection)
+
+
+# Columns added after the first release: (table, column, DDL default).
+# NOT NULL columns get a default so existing rows stay valid
+_ADDED_COLUMNS = (
+    ('users', 'email_normalized', None),
+    ('places', 'geohash', None),
+    ('places', 'review_count', '0'),
+    ('places', 'rating_sum', '0'),
+    ('places', 'avg_rating', '0.0'),
+)
+
+
+@migration(2, 'Add normalized email, geohash and review aggregate columns')
+def add_denormalized_columns(connection, metadata):
+    added = set()
+    for table_name, column_name, default in _ADDED_COLUMNS:
+        if _has_column(connection, table_name, column_name):
+            continue
+        column = metadata.tables[table_name].c[column_name]
+        ddl = (f'ALTER TABLE {table_name} ADD COLUMN {column_name} '
+               f'{column.type.compile(connection.dialect)}')
+        if default is not None:
+            ddl += f' NOT NULL DEFAULT {default}'
+        connection.execute(text(ddl))
+        added.add((table_name, column_name))
+
+    if ('users', 'email_normalized') in added:
+        connection.execute(text(
+            'UPDATE users SET email_normalized = lower(trim(email))'
+        ))
+    if ('places', 'geohash') in added:
+        _backfill_geohashes(connection)
+    if ('places', 'review_count') in added:
+        connection.execute(text(
+            'UPDATE places SET '
+            'review_count = (SELECT count(*) FROM reviews '
+            '                WHERE reviews.place_id = places.id), '
+            'rating_sum = (SELECT coalesce(sum(rating), 0) FROM reviews '
+            '              WHERE reviews.place_id = places.id)'
+        ))
+        connection.execute(text(
+            'UPDATE places SET avg_rating = '
+            'CASE WHEN review_count > 0 '
+            'THEN CAST(rating_sum AS FLOAT) / review_count ELSE 0.0 END'
+        ))
+
+
+# Single-column indexes superseded by the composite indexes of version 3
+_SUPERSEDED_INDEXES = (
+    ('places', 'ix_places_price'),
+    ('places', 'ix_places_avg_rating'),
+)
+
+
+@migration(3, 'Add composite and foreign key indexes', transactional=False)
+def add_indexes(connection, metadata):
+    _create_missing_indexes(connection, metadata)
+    for table_name, index_name in _SUPERSEDED_INDEXES:
+        existing = {
+            index['name']
+            for index in inspect(connection).get_indexes(table_name)
+        }
+        if index_name in existing:
+            connection.execute(text(_drop_index_ddl(
+                connection.dialect.name, table_name, index_name
+            )))
+
+
+@migration(4, 'Add review feed rating index', transactional=False)
+def add_review_rating_index(connection, metadata):
+    _create_missing_indexes(connection, metadata)
+
+
+# --- runner ---
+
+def applied_versions(engine):
+    """Return the set of migration versions applied to a database."""
+    _version_metadata.create_all(engine)
+    with engine.connect() as connection:
+        return set(connection.execute(
+            select(schema_version.c.version)
+        ).scalars())
+
+
+def pending_migrations(engine):
+    """Return the migrations not yet applied to a database, in order."""
+    applied = applied_versions(engine)
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+def migrate(engine, metadata, target=None):
+    """
+    Apply pending migrations in order.
+
+    Args:
+        engine: SQLAlchemy engine of the primary database.
+        metadata: Metadata of the application's models.
+        target (int, optional): Last version to apply (default: all).
+
+    Returns:
+        list: Migrations that were applied.
+    """
+    applied = []
+    for pending in pending_migrations(engine):
+        if target is not None and pending.version > target:
+            break
+        if pending.transactional:
+            with engine.begin() as connection:
+                pending.upgrade(connection, metadata)
+                _record(connection, pending)
+        else:
+            with engine.connect() as connection:
+                connection = connection.execution_options(
+                    isolation_level='AUTOCOMMIT'
+                )
+                pending.upgrade(connection, metadata)
+            with engine.begin() as connection:
+                _record(connection, pending)
+        applied.append(pending)
+    return applied
+
+
+def _record(connection, applied):
+    connection.execute(schema_version.insert().values(
+        version=applied.version,
+        description=applied.description,
+        applied_at=datetime.utcnow(),
+    ))
+
+
+# --- helpers ---
+
+def _has_column(connection, table_name, column_name):
+    return any(
+        column['name'] == column_name
+        for column in inspect(connection).get_columns(table_name)
+    )
+
+
+def _create_missing_indexes(connection, metadata):
+    """Build every index of the models that the database lacks."""
+    for table in metadata.sorted_tables:
+        existing = {
+            index['name']
+            for index in inspect(connection).get_indexes(table.name)
+        }
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name not in existing:
+                _create_index_online(connection, index)
+
+
+def _create_index_online(connection, index):
+    """Build an index without blocking writes where the database allows."""
+    if connection.dialect.name != 'postgresql':
+        index.create(connection)
+        return
+    options = index.dialect_options['postgresql']
+    options['concurrently'] = True
+    try:
+        index.create(connection)
+    finally:
+        options['concurrently'] = False
+
+
+def _drop_index_ddl(dialect_name, table_name, index_name):
+    if dialect_name == 'postgresql':
+        return f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}'
+    if dialect_name in ('mysql', 'mariadb'):
+        return f'DROP INDEX {index_name} ON {table_name}'
+    return f'DROP INDEX IF EXISTS {index_name}'
+
+
+def _backfill_geohashes(connection):
+    """Compute the geohash of every place, in batches keyed by ID."""
+    last_id = ''
+    while True:
+        rows = connection.execute(text(
+            'SELECT id, latitude, longitude FROM places '
+            'WHERE id > :last_id ORDER BY id LIMIT :limit'
+        ), {'last_id': last_id, 'limit': GEOHASH_BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            return
+        connection.execute(
+            text('UPDATE places SET geohash = :geohash WHERE id = :id'),
+            [{'id': row.id,
+              'geohash': encode_geohash(row.latitude, row.longitude)}
+             for row in rows]
+        )
+        last_id = rows[-1].id
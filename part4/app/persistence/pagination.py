@@ -0,0 +1,99 @@
+"""
+Pagination Module
+
+This module provides the opaque cursor format used by keyset (seek)
+pagination in the repositories.
+
+A cursor encodes the sort key of the last row of a page, e.g. the
+`(created_at, id)` pair, so the next page can be fetched with an indexed
+range condition instead of an OFFSET that grows with the table. It also
+records the names of the sort key attributes and the direction; decoding checks them and
+the type of every value, so a tampered cursor is rejected with a
+ValueError instead of reaching the query.
+"""
+
+import base64
+import json
+import math
+from datetime import datetime
+
+
+def encode_cursor(values, sort_key, descending=False):
+    """
+    Build an opaque cursor from the sort key of the last row of a page.
+
+    Args:
+        values (list): Sort key values (str, int, float or datetime).
+        sort_key (list): Names of the sort key attributes, recorded with
+            the direction so a cursor cannot be replayed against another
+            sort order.
+        descending (bool): Whether the page is sorted in descending order.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    payload = json.dumps({
+        'key': list(sort_key),
+        'desc': bool(descending),
+        'values': [
+            {'dt': value.isoformat()} if isinstance(value, datetime)
+            else value
+            for value in values
+        ],
+    })
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, sort_key, descending, types):
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string received from a client.
+        sort_key (list): Names of the sort key attributes of the query.
+        descending (bool): Sort direction of the query.
+        types (list): Python type of each sort key column (str, int,
+            float or datetime).
+
+    Returns:
+        list: Sort key values of the last row already seen.
+
+    Raises:
+        ValueError: If the cursor is malformed, was issued for another
+            sort order, or holds a value of the wrong type.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        data = json.loads(payload.decode('utf-8'))
+        if not isinstance(data, dict) or data.get('key') != list(sort_key) \
+                or data.get('desc') is not bool(descending):
+            raise ValueError
+        values = data['values']
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError
+        return [_decode_value(value, expected)
+                for value, expected in zip(values, types)]
+    except (KeyError, TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _decode_value(value, expected):
+    """Convert a decoded JSON value to `expected`, or raise ValueError."""
+    if expected is datetime:
+        if not isinstance(value, dict) or not isinstance(value.get('dt'), str):
+            raise ValueError
+        result = datetime.fromisoformat(value['dt'])
+        # Stored timestamps are naive UTC
+        if result.tzinfo is not None:
+            raise ValueError
+        return result
+    # bool is an int subclass but never a sort key value
+    if isinstance(value, bool):
+        raise ValueError
+    if expected is float and isinstance(value, (int, float)):
+        if not math.isfinite(value):
+            raise ValueError
+        return float(value)
+    if isinstance(value, expected):
+        return value
+    raise ValueError
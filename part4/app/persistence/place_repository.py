@@ -5,8 +5,22 @@ This module provides a specialized repository for Place model operations,
 extending the base SQLAlchemyRepository with place-specific functionality.
 """
 
+from sqlalchemy import Float, and_, case, cast, func, or_, select, update
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
 from app.persistence.repository import SQLAlchemyRepository
-from app.models.place import Place
+from app.persistence import unit_of_work
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+from app.utils.geo import (
+    GEOHASH_UPPER_BOUND,
+    bounding_box,
+    covering_cells,
+    haversine_km,
+    normalize_longitude,
+)
 
 
 class PlaceRepository(SQLAlchemyRepository):
@@ -14,9 +28,417 @@ class PlaceRepository(SQLAlchemyRepository):
     Repository for Place model with database persistence.
 
     Extends SQLAlchemyRepository to provide persistent storage
-    for Place entities using SQLAlchemy ORM.
+    for Place entities using SQLAlchemy ORM, along with filtered and
+    sorted listings evaluated by the database.
     """
 
+    # Loading profiles:
+    # - card: only the columns shown on a listing card (and sort keys)
+    # - detail: owner and amenities in two queries at most (reviews are
+    #   paged through ReviewRepository.find_page_by_place)
+    LOAD_PROFILES = {
+        'card': [
+            load_only(Place._title, Place._price, Place._latitude,
+                      Place._longitude, Place.created_at,
+                      Place._review_count, Place._avg_rating)
+        ],
+        'detail': [
+            joinedload(Place.owner),
+            selectinload(Place.amenities_rel),
+        ],
+    }
+
+    # Projections:
+    # - card: the fields of a listing card, as rows (avg_rating is NULL
+    #   until the place has reviews, like Place.avg_rating)
+    PROJECTIONS = {
+        'card': {
+            'id': Place.id,
+            'title': Place._title,
+            'price': Place._price,
+            'latitude': Place._latitude,
+            'longitude': Place._longitude,
+            'review_count': Place._review_count,
+            'avg_rating': case(
+                (Place._review_count > 0, Place._avg_rating), else_=None
+            ),
+        },
+    }
+
+    CACHE_INVALIDATING_METHODS = {
+        'update_many': None,
+        'set_amenities': 0,
+        'adjust_review_aggregates': 0,
+        'recompute_review_aggregates': None,
+    }
+
+    # Supported sort orders: name -> (sort key columns, descending)
+    SORT_ORDERS = {
+        'created': ([Place.created_at, Place.id], False),
+        'newest': ([Place.created_at, Place.id], True),
+        'price_asc': ([Place._price, Place.id], False),
+        'price_desc': ([Place._price, Place.id], True),
+        'rating': ([Place._avg_rating, Place.id], True),
+    }
+
+    # Nearby search: radius of the first circle, candidates read per
+    # circle, and times each widening step may narrow when over that cap
+    NEARBY_START_KM = 1.0
+    NEARBY_CANDIDATE_LIMIT = 2000
+    NEARBY_MAX_NARROWING = 8
+
     def __init__(self):
         """Initialize PlaceRepository with Place model."""
         super().__init__(Place)
+
+    def build_filters(self, min_price=None, max_price=None, amenity_ids=None,
+                      owner_id=None):
+        """
+        Translate listing criteria into SQL filter expressions.
+
+        Args:
+            min_price (float, optional): Lowest accepted price (inclusive).
+            max_price (float, optional): Highest accepted price (inclusive).
+            amenity_ids (list, optional): Amenity IDs the place must all
+                have.
+            owner_id (str, optional): Only places owned by this user.
+
+        Returns:
+            list: SQLAlchemy filter criteria.
+        """
+        filters = []
+        if min_price is not None:
+            filters.append(Place._price >= min_price)
+        if max_price is not None:
+            filters.append(Place._price <= max_price)
+        if owner_id is not None:
+            filters.append(Place.owner_id == owner_id)
+        if amenity_ids:
+            amenity_ids = set(amenity_ids)
+            # Places linked to every requested amenity, resolved on the
+            # place_amenity association table
+            matching = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenity_ids)
+            ).group_by(place_amenity.c.place_id).having(
+                func.count() == len(amenity_ids)
+            )
+            filters.append(Place.id.in_(matching))
+        return filters
+
+    def get_detail_version(self, place_id):
+        """
+        Summarize the state of a place and of the rows its detail view embeds.
+
+        Evaluated as a single aggregate query, so a client's cached copy of
+        the detail view can be validated without loading it.
+
+        Args:
+            place_id (str): ID of the place
+
+        Returns:
+            tuple: (place updated_at, owner updated_at, latest amenity
+            updated_at, amenity count, latest review updated_at, review
+            count, latest reviewer updated_at), or None if the place does
+            not exist
+        """
+        linked = place_amenity.c.place_id == Place.id
+        owner_updated_at = select(User.updated_at).where(
+            User.id == Place.owner_id
+        ).scalar_subquery()
+        amenities_updated_at = select(func.max(Amenity.updated_at)).join(
+            place_amenity, place_amenity.c.amenity_id == Amenity.id
+        ).where(linked).scalar_subquery()
+        amenity_count = select(func.count()).select_from(
+            place_amenity
+        ).where(linked).scalar_subquery()
+        reviews_updated_at = select(func.max(Review.updated_at)).where(
+            Review.place_id == Place.id
+        ).scalar_subquery()
+        review_count = select(func.count(Review.id)).where(
+            Review.place_id == Place.id
+        ).scalar_subquery()
+        # Reviews are shown with their author's name
+        reviewers_updated_at = select(func.max(User.updated_at)).join(
+            Review, Review.user_id == User.id
+        ).where(Review.place_id == Place.id).scalar_subquery()
+
+        row = self._db.session.query(
+            Place.updated_at, owner_updated_at, amenities_updated_at,
+            amenity_count, reviews_updated_at, review_count,
+            reviewers_updated_at
+        ).filter(Place.id == place_id).first()
+        return tuple(row) if row is not None else None
+
+    def find_page(self, limit, cursor=None, sort='created', profile='card',
+                  projection=None, **criteria):
+        """
+        Retrieve one page of places matching the given criteria.
+
+        Args:
+            limit (int): Maximum number of places to return.
+            cursor (str, optional): Cursor of the previous page.
+            sort (str): One of SORT_ORDERS.
+            profile (str): Loading profile name.
+            projection (str, optional): Projection name, to get rows
+                instead of Place instances.
+            **criteria: Keyword arguments accepted by `build_filters`.
+
+        Returns:
+            tuple: (list of Place or rows, next cursor or None)
+
+        Raises:
+            ValueError: If the sort order or the cursor is invalid.
+        """
+        if sort not in self.SORT_ORDERS:
+            raise ValueError(f"Invalid sort order: {sort}")
+        order_by, descending = self.SORT_ORDERS[sort]
+        return self.get_page(
+            limit,
+            cursor,
+            filters=self.build_filters(**criteria),
+            order_by=order_by,
+            descending=descending,
+            profile=profile,
+            projection=projection
+        )
+
+    def set_amenities(self, place_id, amenities):
+        """
+        Replace the amenities of a place.
+
+        Args:
+            place_id (str): ID of the place.
+            amenities (list): Amenity instances to link.
+        """
+        place = self._get_for_update(place_id)
+        if place is not None:
+            place.amenities_rel = list(amenities)
+            unit_of_work.commit()
+
+    def adjust_review_aggregates(self, place_id, count_delta, rating_delta):
+        """
+        Apply a review write to the place's rating aggregates.
+
+        The increments run as SQL expressions so concurrent reviews cannot
+        overwrite each other, and the average is derived from the stored
+        totals in a second statement. Changes are flushed, not committed:
+        the caller's commit makes them atomic with the review write.
+
+        Args:
+            place_id (str): ID of the reviewed place.
+            count_delta (int): Change of the review count (-1, 0 or 1).
+            rating_delta (int): Change of the rating sum.
+        """
+        session = self._db.session
+        options = {'synchronize_session': False}
+        session.execute(
+            update(Place).where(Place.id == place_id).values({
+                Place._review_count: Place._review_count + count_delta,
+                Place._rating_sum: Place._rating_sum + rating_delta,
+            }),
+            execution_options=options
+        )
+        session.execute(
+            update(Place).where(Place.id == place_id).values({
+                Place._avg_rating: self._average_expression()
+            }),
+            execution_options=options
+        )
+
+        # Reload the aggregates of an in-session instance on next access
+        place = session.identity_map.get(session.identity_key(Place, place_id))
+        if place is not None:
+            session.expire(place, ['_review_count', '_rating_sum',
+                                   '_avg_rating'])
+
+    def recompute_review_aggregates(self, place_ids=None):
+        """
+        Rebuild rating aggregates from the reviews table to repair drift.
+
+        Args:
+            place_ids (iterable, optional): Only repair these places; all
+                places when omitted.
+
+        Returns:
+            int: Number of places updated.
+        """
+        session = self._db.session
+        totals = update(Place).values({
+            Place._review_count: select(func.count(Review.id)).where(
+                Review.place_id == Place.id
+            ).scalar_subquery(),
+            Place._rating_sum: select(
+                func.coalesce(func.sum(Review._rating), 0)
+            ).where(Review.place_id == Place.id).scalar_subquery(),
+        })
+        average = update(Place).values({
+            Place._avg_rating: self._average_expression()
+        })
+        options = {'synchronize_session': False}
+
+        if place_ids is None:
+            batches = [None]
+        else:
+            # Bounded IN lists keep under the backend's parameter limit
+            place_ids = list(place_ids)
+            batches = [
+                place_ids[start:start + self.IN_BATCH_SIZE]
+                for start in range(0, len(place_ids), self.IN_BATCH_SIZE)
+            ]
+
+        updated = 0
+        for batch in batches:
+            batch_totals, batch_average = totals, average
+            if batch is not None:
+                batch_totals = totals.where(Place.id.in_(batch))
+                batch_average = average.where(Place.id.in_(batch))
+            updated += session.execute(
+                batch_totals, execution_options=options
+            ).rowcount
+            session.execute(batch_average, execution_options=options)
+        unit_of_work.commit()
+        return updated
+
+    @staticmethod
+    def _average_expression():
+        """SQL expression of the average rating from the stored totals."""
+        return case(
+            (Place._review_count > 0,
+             cast(Place._rating_sum, Float) / Place._review_count),
+            else_=0.0
+        )
+
+    def find_in_bbox(self, min_lat, min_lon, max_lat, max_lon, limit):
+        """
+        Retrieve places inside a bounding box.
+
+        Candidates are pruned with geohash prefix range scans on the
+        indexed geohash column, then filtered exactly on the coordinates.
+
+        Args:
+            min_lat (float): Southern edge in degrees.
+            min_lon (float): Western edge in degrees; may be lower than
+                -180 when the box crosses the antimeridian.
+            max_lat (float): Northern edge in degrees.
+            max_lon (float): Eastern edge in degrees; may exceed 180 when
+                the box crosses the antimeridian.
+            limit (int): Maximum number of places to return, or None.
+
+        Returns:
+            list: Places inside the box.
+        """
+        query = self._db.session.query(Place).options(
+            *self._load_options('card')
+        ).filter(
+            *self._bbox_filters(min_lat, min_lon, max_lat, max_lon)
+        ).order_by(Place.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def find_nearby(self, latitude, longitude, radius_km, limit):
+        """
+        Retrieve the places closest to a point within a radius.
+
+        The search starts with a small circle and widens it until it
+        holds `limit` places or reaches `radius_km`. Each step only reads
+        (id, latitude, longitude) of the candidates in the circle's
+        bounding box, through the geohash index, and at most
+        NEARBY_CANDIDATE_LIMIT of them; a step over the cap narrows the
+        circle instead, at most NEARBY_MAX_NARROWING times per step, then
+        reads the narrowed circle in full. Full rows are then loaded for
+        the `limit` nearest places only.
+
+        Args:
+            latitude (float): Center latitude in degrees.
+            longitude (float): Center longitude in degrees.
+            radius_km (float): Search radius in kilometers.
+            limit (int): Maximum number of places to return.
+
+        Returns:
+            list: (place, distance_km) tuples, nearest first.
+        """
+        inner, ring = 0.0, min(radius_km, self.NEARBY_START_KM)
+        narrowed = 0
+        while True:
+            # Once a step has narrowed NEARBY_MAX_NARROWING times, its
+            # (tiny) circle is read without the cap
+            complete = narrowed >= self.NEARBY_MAX_NARROWING
+            candidates = self._nearby_candidates(
+                latitude, longitude, ring, complete
+            )
+            if not complete and len(candidates) > self.NEARBY_CANDIDATE_LIMIT:
+                # Too dense: bisect between the last complete ring and
+                # this one
+                ring = (inner + ring) / 2
+                narrowed += 1
+                continue
+            matches = []
+            for place_id, place_lat, place_lon in candidates:
+                distance = haversine_km(
+                    latitude, longitude, place_lat, place_lon
+                )
+                if distance <= ring:
+                    matches.append((distance, place_id))
+            if len(matches) >= limit or ring >= radius_km:
+                break
+            inner, ring = ring, min(radius_km, ring * 4)
+            narrowed = 0
+
+        # Every candidate of the circle of radius `ring` was read, so its
+        # matches contain the nearest places
+        nearest = sorted(matches)[:limit]
+        places = {
+            place.id: place
+            for place in self._db.session.query(Place).options(
+                *self._load_options('card')
+            ).filter(Place.id.in_([place_id for _, place_id in nearest]))
+        } if nearest else {}
+        return [(places[place_id], distance)
+                for distance, place_id in nearest if place_id in places]
+
+    def _nearby_candidates(self, latitude, longitude, radius_km,
+                           complete=False):
+        """
+        Read the coordinates of the places in a circle's bounding box.
+
+        Returns:
+            list: (id, latitude, longitude) rows; unless `complete`, at
+            most NEARBY_CANDIDATE_LIMIT + 1 so an overflow can be detected.
+        """
+        query = self._db.session.query(
+            Place.id, Place._latitude, Place._longitude
+        ).filter(
+            *self._bbox_filters(*bounding_box(latitude, longitude, radius_km))
+        )
+        if not complete:
+            query = query.limit(self.NEARBY_CANDIDATE_LIMIT + 1)
+        return query.all()
+
+    def _bbox_filters(self, min_lat, min_lon, max_lat, max_lon):
+        """Build the geohash and coordinate filters for a bounding box."""
+        filters = [Place._latitude.between(min_lat, max_lat)]
+
+        # A box spanning every longitude needs no longitude filter
+        if max_lon - min_lon < 360.0:
+            if min_lon < -180.0:
+                filters.append(or_(
+                    Place._longitude >= normalize_longitude(min_lon),
+                    Place._longitude <= max_lon
+                ))
+            elif max_lon >= 180.0:
+                filters.append(or_(
+                    Place._longitude >= min_lon,
+                    Place._longitude <= normalize_longitude(max_lon)
+                ))
+            else:
+                filters.append(Place._longitude.between(min_lon, max_lon))
+
+        cells = covering_cells(min_lat, min_lon, max_lat, max_lon)
+        if cells:
+            filters.append(or_(*[
+                and_(Place._geohash >= cell,
+                     Place._geohash < cell + GEOHASH_UPPER_BOUND)
+                for cell in cells
+            ]))
+        return filters
@@ -1,4 +1,16 @@
+import threading
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from itertools import islice
+
+from sqlalchemy import and_, func, inspect, or_
+from sqlalchemy.orm import MANYTOMANY
+from sqlalchemy.exc import IntegrityError
+
+from app.persistence.pagination import encode_cursor, decode_cursor
+from app.persistence import unit_of_work
+from app.persistence import routing
 
 
 class Repository(ABC):
@@ -34,16 +46,84 @@ class Repository(ABC):
         """Retrieve an object by a specific attribute value."""
         pass
 
+    @abstractmethod
+    def find_by_attribute(self, attr_name, attr_value):
+        """Retrieve every object with a specific attribute value."""
+        pass
+
+
+class DuplicateKeyError(ValueError):
+    """Raised when a write would duplicate a uniquely indexed value."""
+
+
+# Per-row errors of the bulk writes. Database and Python exception texts
+# are not returned to clients
+CONFLICT_ERROR = 'Conflicts with an existing row'
+INVALID_TYPE_ERROR = 'Invalid field type'
+
 
 class InMemoryRepository(Repository):
-    """In-memory repository implementation using a dictionary."""
+    """
+    In-memory repository implementation using a dictionary.
+
+    Attribute lookups scan every object unless the attribute is indexed.
+    Indexes are declared in the class attributes below (or passed to the
+    constructor) and are maintained by `add`, `update` and `delete`:
 
-    def __init__(self):
+    - `UNIQUE_INDEXES`: value -> object; `add`/`update` reject duplicates.
+    - `INDEXES`: value -> objects, for non-unique attributes.
+    - `SORTED_INDEXES`: (value, id) pairs kept in order, for range
+      queries on numeric fields with `find_range`.
+
+    A tuple of attribute names declares a composite index, looked up with
+    a tuple of values. Objects changed without going through `update` must
+    be passed to `reindex`, or their index entries go stale.
+
+    Every method runs under a re-entrant lock, so the repository can be
+    shared by the threads of a WSGI server.
+    """
+
+    UNIQUE_INDEXES = ()
+    INDEXES = ()
+    SORTED_INDEXES = ()
+
+    def __init__(self, unique_indexes=None, indexes=None, sorted_indexes=None):
+        """
+        Args:
+            unique_indexes: Attribute names overriding UNIQUE_INDEXES
+            indexes: Attribute names overriding INDEXES
+            sorted_indexes: Attribute names overriding SORTED_INDEXES
+        """
         self._storage = {}
+        self._unique = {
+            attr: {} for attr in
+            (self.UNIQUE_INDEXES if unique_indexes is None else unique_indexes)
+        }
+        self._hashed = {
+            attr: defaultdict(set) for attr in
+            (self.INDEXES if indexes is None else indexes)
+        }
+        self._sorted = {
+            attr: [] for attr in
+            (self.SORTED_INDEXES if sorted_indexes is None else sorted_indexes)
+        }
+        # obj_id -> {attr: value} as indexed, to find the entries to drop
+        self._indexed_values = {}
+        self._lock = threading.RLock()
 
     def add(self, obj):
-        """Add object to in-memory storage."""
-        self._storage[obj.id] = obj
+        """
+        Add object to in-memory storage.
+
+        Raises:
+            DuplicateKeyError: If a uniquely indexed value is already taken
+        """
+        with self._lock:
+            values = self._index_values(obj)
+            self._check_unique(obj.id, values)
+            self._unindex(obj.id)
+            self._storage[obj.id] = obj
+            self._index(obj.id, values)
 
     def get(self, obj_id):
         """Retrieve object from in-memory storage by ID."""
@@ -51,26 +131,174 @@ class InMemoryRepository(Repository):
 
     def get_all(self):
         """Retrieve all objects from in-memory storage."""
-        return list(self._storage.values())
+        with self._lock:
+            return list(self._storage.values())
 
     def update(self, obj_id, data):
-        """Update object in in-memory storage."""
-        obj = self.get(obj_id)
-        if obj:
-            obj.update(data)
+        """
+        Update object in in-memory storage.
+
+        Raises:
+            DuplicateKeyError: If the update would duplicate a uniquely
+                indexed value
+        """
+        with self._lock:
+            obj = self.get(obj_id)
+            if obj:
+                new_values = dict(self._indexed_values.get(obj_id, {}))
+                new_values.update(
+                    (attr, data[attr]) for attr in self._indexed_attrs()
+                    if isinstance(attr, str) and attr in data
+                )
+                self._check_unique(obj_id, new_values)
+                obj.update(data)
+                self.reindex(obj)
 
     def delete(self, obj_id):
         """Delete object from in-memory storage."""
-        if obj_id in self._storage:
-            del self._storage[obj_id]
+        with self._lock:
+            if obj_id in self._storage:
+                self._unindex(obj_id)
+                del self._storage[obj_id]
+
+    def reindex(self, obj):
+        """
+        Refresh the index entries of a stored object after it changed.
+
+        Raises:
+            DuplicateKeyError: If a uniquely indexed value is already taken
+        """
+        with self._lock:
+            values = self._index_values(obj)
+            self._check_unique(obj.id, values)
+            self._unindex(obj.id)
+            self._index(obj.id, values)
 
     def get_by_attribute(self, attr_name, attr_value):
         """Find first object matching attribute value."""
-        return next(
-            (obj for obj in self._storage.values()
-             if getattr(obj, attr_name, None) == attr_value),
-            None,
-        )
+        with self._lock:
+            if attr_name in self._unique:
+                obj_id = self._unique[attr_name].get(_index_key(attr_value))
+                return self._storage.get(obj_id) if obj_id is not None else None
+            return next(iter(self.find_by_attribute(attr_name, attr_value)), None)
+
+    def find_by_attribute(self, attr_name, attr_value):
+        """Find every object matching attribute value."""
+        with self._lock:
+            if attr_name in self._unique:
+                obj = self.get_by_attribute(attr_name, attr_value)
+                return [obj] if obj is not None else []
+            if attr_name in self._hashed:
+                return [
+                    self._storage[obj_id] for obj_id in
+                    self._hashed[attr_name].get(_index_key(attr_value), ())
+                ]
+            return [
+                obj for obj in self._storage.values()
+                if _attribute_value(obj, attr_name) == attr_value
+            ]
+
+    def find_range(self, attr_name, low=None, high=None):
+        """
+        Find objects whose attribute lies within bounds, in value order.
+
+        Args:
+            attr_name: Name of the attribute to compare
+            low: Inclusive lower bound, or None for no bound
+            high: Inclusive upper bound, or None for no bound
+
+        Returns:
+            list: Matching objects, ordered by (value, id); objects with a
+            None value are left out
+        """
+        with self._lock:
+            if attr_name in self._sorted:
+                entries = self._sorted[attr_name]
+            else:
+                entries = sorted(
+                    (getattr(obj, attr_name, None), obj_id)
+                    for obj_id, obj in self._storage.items()
+                    if getattr(obj, attr_name, None) is not None
+                )
+            start = 0 if low is None else bisect_left(entries, (low,))
+            # (high, MAX) sorts after every (high, id) pair; ids are strings
+            end = (len(entries) if high is None
+                   else bisect_right(entries, (high, _AFTER_ANY_ID)))
+            return [self._storage[obj_id] for _, obj_id in entries[start:end]]
+
+    # --- index maintenance ---
+
+    def _indexed_attrs(self):
+        return set(self._unique) | set(self._hashed) | set(self._sorted)
+
+    def _index_values(self, obj):
+        return {
+            attr: _attribute_value(obj, attr) for attr in self._indexed_attrs()
+        }
+
+    def _check_unique(self, obj_id, values):
+        for attr, index in self._unique.items():
+            value = values.get(attr)
+            if value is None:
+                continue
+            owner = index.get(_index_key(value))
+            if owner is not None and owner != obj_id:
+                raise DuplicateKeyError(
+                    f"Duplicate value for {_index_name(attr)}: {value!r}"
+                )
+
+    def _index(self, obj_id, values):
+        for attr, index in self._unique.items():
+            if values[attr] is not None:
+                index[_index_key(values[attr])] = obj_id
+        for attr, index in self._hashed.items():
+            index[_index_key(values[attr])].add(obj_id)
+        for attr, entries in self._sorted.items():
+            if values[attr] is not None:
+                insort(entries, (values[attr], obj_id))
+        self._indexed_values[obj_id] = values
+
+    def _unindex(self, obj_id):
+        values = self._indexed_values.pop(obj_id, None)
+        if values is None:
+            return
+        for attr, index in self._unique.items():
+            if values[attr] is not None:
+                index.pop(_index_key(values[attr]), None)
+        for attr, index in self._hashed.items():
+            key = _index_key(values[attr])
+            index[key].discard(obj_id)
+            if not index[key]:
+                del index[key]
+        for attr, entries in self._sorted.items():
+            if values[attr] is not None:
+                position = bisect_left(entries, (values[attr], obj_id))
+                if (position < len(entries)
+                        and entries[position] == (values[attr], obj_id)):
+                    del entries[position]
+
+
+# Sorts after every object ID in a sorted index entry
+_AFTER_ANY_ID = chr(0x10FFFF)
+
+
+def _attribute_value(obj, attr):
+    """Value of an index attribute; a tuple for composite indexes."""
+    if isinstance(attr, tuple):
+        values = tuple(getattr(obj, name, None) for name in attr)
+        return None if None in values else values
+    return getattr(obj, attr, None)
+
+
+def _index_name(attr):
+    return ', '.join(attr) if isinstance(attr, tuple) else attr
+
+
+def _index_key(value):
+    """Hashable index key of an attribute value (lists become tuples)."""
+    if isinstance(value, (list, set)):
+        return tuple(value)
+    return value
 
 
 class SQLAlchemyRepository(Repository):
@@ -79,8 +307,27 @@ class SQLAlchemyRepository(Repository):
 
     This repository provides persistent storage using SQLAlchemy,
     supporting various database backends (SQLite, MySQL, PostgreSQL).
+
+    Subclasses may declare named loading profiles in `LOAD_PROFILES`, each
+    a list of SQLAlchemy loader options (e.g. `selectinload`,
+    `joinedload`, `load_only`) tuned for one use case, so that reads fetch
+    related rows in a bounded number of queries instead of lazy-loading
+    them one at a time.
     """
 
+    # Loading profiles: name -> list of SQLAlchemy loader options
+    LOAD_PROFILES = {}
+
+    # Maximum number of values bound in a single IN (...) clause
+    IN_BATCH_SIZE = 500
+
+    # Column projections for list views: name -> {field: column expression}
+    PROJECTIONS = {}
+
+    # Methods writing rows behind a CachedRepository's back: name -> index
+    # of the object ID argument, or None when any object may change
+    CACHE_INVALIDATING_METHODS = {'update_many': None}
+
     def __init__(self, model):
         """
         Initialize repository with a SQLAlchemy model class.
@@ -107,28 +354,484 @@ class SQLAlchemyRepository(Repository):
             SQLAlchemyError: If database operation fails
         """
         self._db.session.add(obj)
-        self._db.session.commit()
+        unit_of_work.commit()
 
-    def get(self, obj_id):
+    def _load_options(self, profile):
+        """
+        Resolve a loading profile name into loader options.
+
+        Args:
+            profile: Name declared in LOAD_PROFILES, or None for the
+                model's default (lazy) loading
+
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        if profile is None:
+            return []
+        if profile not in self.LOAD_PROFILES:
+            raise ValueError(f"Unknown loading profile: {profile}")
+        return self.LOAD_PROFILES[profile]
+
+    def add_many(self, objs, chunk_size=1000):
+        """
+        Add many objects, committing once per chunk.
+
+        Each chunk is flushed as batched multi-row INSERTs. When a chunk
+        violates a database constraint it is rolled back and retried row
+        by row, so only the offending objects are rejected.
+
+        Args:
+            objs: List of model instances to persist
+            chunk_size: Number of objects per transaction
+
+        Returns:
+            list: (position in objs, error message) for rejected objects
+
+        Raises:
+            RuntimeError: If called inside a unit of work, since chunks
+                manage their own transactions
+        """
+        self._check_not_in_unit_of_work()
+        session = self._db.session
+        failures = []
+        for start in range(0, len(objs), chunk_size):
+            chunk = objs[start:start + chunk_size]
+            session.add_all(chunk)
+            try:
+                session.commit()
+                continue
+            except IntegrityError:
+                session.rollback()
+
+            for offset, obj in enumerate(chunk):
+                session.add(obj)
+                try:
+                    session.commit()
+                except IntegrityError:
+                    session.rollback()
+                    failures.append((start + offset, CONFLICT_ERROR))
+        return failures
+
+    def update_many(self, updates, chunk_size=1000):
+        """
+        Update many objects, committing once per chunk.
+
+        Objects of a chunk are loaded with batched IN queries and updated
+        through their model's `update` method, so setter validation still
+        applies. Rows failing validation are discarded individually.
+
+        Args:
+            updates: List of (obj_id, data) pairs
+            chunk_size: Number of objects per transaction
+
+        Returns:
+            list: (position in updates, error message) for rejected rows
+
+        Raises:
+            RuntimeError: If called inside a unit of work, since chunks
+                manage their own transactions
+        """
+        self._check_not_in_unit_of_work()
+        session = self._db.session
+        failures = []
+        for start in range(0, len(updates), chunk_size):
+            chunk = updates[start:start + chunk_size]
+            ids = [obj_id for obj_id, _ in chunk]
+            objs = {}
+            with routing.read_from_primary(session):
+                for batch in range(0, len(ids), self.IN_BATCH_SIZE):
+                    objs.update(
+                        (obj.id, obj) for obj in
+                        session.query(self.model).filter(self.model.id.in_(
+                            ids[batch:batch + self.IN_BATCH_SIZE]
+                        ))
+                    )
+
+            chunk_failures = []
+            for offset, (obj_id, data) in enumerate(chunk):
+                error = self._apply_update(objs.get(obj_id), data)
+                if error:
+                    chunk_failures.append((start + offset, error))
+            try:
+                session.commit()
+                failures.extend(chunk_failures)
+                continue
+            except IntegrityError:
+                session.rollback()
+
+            failures.extend(chunk_failures)
+            failed = {position for position, _ in chunk_failures}
+            for offset, (obj_id, data) in enumerate(chunk):
+                if start + offset in failed:
+                    continue
+                self._apply_update(self.get(obj_id), data)
+                try:
+                    session.commit()
+                except IntegrityError:
+                    session.rollback()
+                    failures.append((start + offset, CONFLICT_ERROR))
+        failures.sort()
+        return failures
+
+    def insert_rows(self, rows, chunk_size=1000):
+        """
+        Insert raw rows with multi-row INSERTs, committing once per chunk.
+
+        No model instance is built, so setter validation and column
+        defaults do not apply: rows must be complete and valid. This is
+        meant for generated or imported datasets, where building objects
+        would dominate the cost.
+
+        Args:
+            rows: Iterable of dicts keyed by column name; many-to-many
+                relationships are given by relationship name, as lists of
+                related IDs
+            chunk_size: Number of rows per transaction
+
+        Returns:
+            int: Number of rows inserted
+
+        Raises:
+            RuntimeError: If called inside a unit of work
+            IntegrityError: If a chunk violates a constraint (the chunk is
+                rolled back; earlier chunks stay committed)
+        """
+        self._check_not_in_unit_of_work()
+        session = self._db.session
+        table = self.model.__table__
+        collections = [
+            (rel.key, rel.secondary, rel.synchronize_pairs[0][1].key,
+             rel.secondary_synchronize_pairs[0][1].key)
+            for rel in inspect(self.model).relationships
+            if rel.direction is MANYTOMANY
+        ]
+        keys = {rel_key for rel_key, _, _, _ in collections}
+        inserted = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return inserted
+            values = [
+                {key: value for key, value in row.items() if key not in keys}
+                if keys else row
+                for row in chunk
+            ]
+            try:
+                session.execute(table.insert(), values)
+                for rel_key, secondary, local, remote in collections:
+                    links = [
+                        {local: row['id'], remote: target_id}
+                        for row in chunk for target_id in row.get(rel_key, ())
+                    ]
+                    if links:
+                        session.execute(secondary.insert(), links)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            inserted += len(chunk)
+
+    @staticmethod
+    def _check_not_in_unit_of_work():
+        """Bulk writes commit per chunk and cannot join a unit of work."""
+        if unit_of_work.in_unit_of_work():
+            raise RuntimeError(
+                "Bulk writes cannot run inside a unit of work"
+            )
+
+    def _apply_update(self, obj, data):
+        """
+        Apply `data` to `obj` for update_many.
+
+        Returns:
+            str: Error message, or None on success. Changes of a rejected
+            update are discarded.
+        """
+        if obj is None:
+            return 'Not found'
+        try:
+            obj.update(data)
+        except TypeError:
+            self._db.session.expire(obj)
+            return INVALID_TYPE_ERROR
+        except ValueError as e:
+            # Validation messages of the model setters
+            self._db.session.expire(obj)
+            return str(e)
+        return None
+
+    def get(self, obj_id, profile=None):
         """
         Retrieve an object by its ID.
 
         Args:
             obj_id: Primary key of the object
+            profile: Optional loading profile name
 
         Returns:
             Model instance or None if not found
         """
-        return self._db.session.get(self.model, obj_id)
+        return self._db.session.get(
+            self.model, obj_id, options=self._load_options(profile)
+        )
 
-    def get_all(self):
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by ID with as few queries as possible.
+
+        Objects already in the session's identity map are reused; the
+        remaining IDs are fetched with batched IN queries.
+
+        Args:
+            obj_ids: Iterable of primary keys (duplicates are allowed)
+
+        Returns:
+            tuple: (list of model instances in the order of the first
+            occurrence of each ID, list of IDs that were not found)
+        """
+        session = self._db.session
+        ordered_ids = list(dict.fromkeys(obj_ids))
+
+        found = {}
+        to_fetch = []
+        for obj_id in ordered_ids:
+            if obj_id is None:
+                continue
+            obj = session.identity_map.get(
+                session.identity_key(self.model, obj_id)
+            )
+            if obj is not None:
+                found[obj_id] = obj
+            else:
+                to_fetch.append(obj_id)
+
+        for start in range(0, len(to_fetch), self.IN_BATCH_SIZE):
+            batch = to_fetch[start:start + self.IN_BATCH_SIZE]
+            found.update(
+                (obj.id, obj) for obj in
+                session.query(self.model).filter(self.model.id.in_(batch))
+            )
+
+        objs = [found[obj_id] for obj_id in ordered_ids if obj_id in found]
+        missing = [obj_id for obj_id in ordered_ids if obj_id not in found]
+        return objs, missing
+
+    def get_all(self, profile=None):
         """
         Retrieve all objects of this model type.
 
+        Args:
+            profile: Optional loading profile name
+
         Returns:
             List of all model instances
         """
-        return self._db.session.query(self.model).all()
+        return self._db.session.query(self.model).options(
+            *self._load_options(profile)
+        ).all()
+
+    def get_version(self):
+        """
+        Summarize the state of the whole collection without loading rows.
+
+        Any insert, update or delete changes the result, so it can be used
+        as an HTTP validator of collection resources.
+
+        Returns:
+            tuple: (latest updated_at or None, number of rows)
+        """
+        return tuple(self._db.session.query(
+            func.max(self.model.updated_at), func.count(self.model.id)
+        ).one())
+
+    def project(self, projection, filters=None, order_by=None):
+        """
+        Retrieve only the columns of a projection.
+
+        No model instance is built and nothing enters the session, which
+        makes list views much cheaper than loading full objects.
+
+        Args:
+            projection: Name of one of PROJECTIONS
+            filters: Optional list of SQLAlchemy filter criteria
+            order_by: Optional list of SQLAlchemy order expressions
+
+        Returns:
+            list: Row tuples, with attribute access by field name
+
+        Raises:
+            ValueError: If the projection is unknown
+        """
+        query = self._db.session.query(*self._projection_columns(projection))
+        if filters:
+            query = query.filter(*filters)
+        if order_by:
+            query = query.order_by(*order_by)
+        return query.all()
+
+    def project_many(self, projection, obj_ids):
+        """
+        Retrieve the projected rows of several objects by ID.
+
+        IDs are fetched with batched IN queries, one per IN_BATCH_SIZE
+        IDs, e.g. to resolve the authors of a page of rows at once.
+
+        Args:
+            projection: Name of one of PROJECTIONS (must include `id`)
+            obj_ids: Iterable of primary keys (duplicates are allowed)
+
+        Returns:
+            dict: Row tuples by ID; unknown IDs are left out
+
+        Raises:
+            ValueError: If the projection is unknown
+        """
+        columns = self._projection_columns(projection)
+        ids = [obj_id for obj_id in dict.fromkeys(obj_ids) if obj_id is not None]
+        rows = {}
+        for start in range(0, len(ids), self.IN_BATCH_SIZE):
+            batch = ids[start:start + self.IN_BATCH_SIZE]
+            rows.update(
+                (row.id, row) for row in
+                self._db.session.query(*columns).filter(self.model.id.in_(batch))
+            )
+        return rows
+
+    def stream(self, projection, filters=None, batch_size=1000):
+        """
+        Iterate over every row of a projection with constant memory.
+
+        Rows are fetched `batch_size` at a time through a server-side
+        cursor where the driver supports one, so full-table exports do not
+        materialize the result set.
+
+        Args:
+            projection: Name of one of PROJECTIONS
+            filters: Optional list of SQLAlchemy filter criteria
+            batch_size: Number of rows fetched per round-trip
+
+        Yields:
+            Row tuples, with attribute access by field name, in primary
+            key order
+
+        Raises:
+            ValueError: If the projection is unknown
+        """
+        query = self._db.session.query(*self._projection_columns(projection))
+        if filters:
+            query = query.filter(*filters)
+        query = query.order_by(self.model.id).yield_per(batch_size)
+        yield from query
+
+    def _projection_columns(self, projection, order_by=()):
+        """
+        Build the labeled columns of a projection.
+
+        Sort key columns missing from the projection are appended under
+        their attribute key, so keyset cursors can be read from the rows.
+        """
+        if projection not in self.PROJECTIONS:
+            raise ValueError(f"Unknown projection: {projection}")
+        fields = self.PROJECTIONS[projection]
+        columns = [expression.label(name) for name, expression in fields.items()]
+        columns.extend(
+            column.label(column.key) for column in order_by
+            if column.key not in fields
+        )
+        return columns
+
+    def get_page(self, limit, cursor=None, filters=None, order_by=None,
+                 descending=False, profile=None, projection=None):
+        """
+        Retrieve one page of objects using keyset pagination.
+
+        Rows are ordered by `order_by` (default `(created_at, id)`); the
+        cursor marks the last row of the previous page so each page is a
+        bounded index range scan regardless of the table size.
+
+        Args:
+            limit: Maximum number of objects to return
+            cursor: Cursor returned with the previous page, or None for
+                the first page
+            filters: Optional list of SQLAlchemy filter criteria
+            order_by: Optional list of mapped columns forming a unique sort
+                key (must end with the primary key)
+            descending: Sort in descending order instead of ascending
+            profile: Optional loading profile name
+            projection: Optional projection name; rows are returned
+                instead of model instances
+
+        Returns:
+            tuple: (list of model instances or rows, next cursor or None
+            when there are no more rows)
+
+        Raises:
+            ValueError: If the cursor or the projection is invalid
+        """
+        if projection is not None:
+            query = self._db.session.query(*self._projection_columns(
+                projection, order_by or [self.model.created_at, self.model.id]
+            ))
+        else:
+            query = self._db.session.query(self.model).options(
+                *self._load_options(profile)
+            )
+        if filters:
+            query = query.filter(*filters)
+        return self._paginate(query, limit, cursor, order_by, descending)
+
+    def _paginate(self, query, limit, cursor=None, order_by=None,
+                  descending=False):
+        """
+        Apply keyset pagination on a unique sort key to a query.
+
+        One extra row is fetched to know whether a next page exists
+        without issuing a COUNT.
+        """
+        if order_by is None:
+            order_by = [self.model.created_at, self.model.id]
+
+        sort_key = [column.key for column in order_by]
+        if cursor is not None:
+            values = decode_cursor(
+                cursor, sort_key, descending,
+                [column.type.python_type for column in order_by]
+            )
+            query = query.filter(self._seek_condition(
+                order_by, values, descending
+            ))
+
+        query = query.order_by(*[
+            column.desc() if descending else column.asc()
+            for column in order_by
+        ])
+        rows = query.limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                [getattr(rows[-1], key) for key in sort_key], sort_key,
+                descending
+            )
+        return rows, next_cursor
+
+    @staticmethod
+    def _seek_condition(order_by, values, descending):
+        """
+        Build the "strictly after this sort key" condition.
+
+        Expands `(a, b) > (x, y)` into `a > x OR (a = x AND b > y)`, which
+        every backend can serve from a composite index.
+        """
+        clauses = []
+        for i, column in enumerate(order_by):
+            bound = column < values[i] if descending else column > values[i]
+            equals = [order_by[j] == values[j] for j in range(i)]
+            clauses.append(and_(*equals, bound))
+        return or_(*clauses)
 
     def update(self, obj_id, data):
         """
@@ -141,12 +844,12 @@ class SQLAlchemyRepository(Repository):
         Raises:
             SQLAlchemyError: If database operation fails
         """
-        obj = self.get(obj_id)
+        obj = self._get_for_update(obj_id)
         if obj:
             # Call the model's update method
             # (handles special cases like password hashing)
             obj.update(data)
-            self._db.session.commit()
+            unit_of_work.commit()
 
     def delete(self, obj_id):
         """
@@ -158,10 +861,15 @@ class SQLAlchemyRepository(Repository):
         Raises:
             SQLAlchemyError: If database operation fails
         """
-        obj = self.get(obj_id)
+        obj = self._get_for_update(obj_id)
         if obj:
             self._db.session.delete(obj)
-            self._db.session.commit()
+            unit_of_work.commit()
+
+    def _get_for_update(self, obj_id):
+        """Load an object about to be modified from the primary database."""
+        with routing.read_from_primary(self._db.session):
+            return self.get(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -184,3 +892,23 @@ class SQLAlchemyRepository(Repository):
         return self._db.session.query(self.model).filter(
             column == attr_value
         ).first()
+
+    def find_by_attribute(self, attr_name, attr_value):
+        """
+        Find every object matching a specific attribute value.
+
+        Args:
+            attr_name: Name of the attribute to search
+            attr_value: Value to match
+
+        Returns:
+            List of model instances
+        """
+        if hasattr(self.model.__table__.columns, attr_name):
+            column = self.model.__table__.columns[attr_name]
+        else:
+            column = getattr(self.model, attr_name)
+
+        return self._db.session.query(self.model).filter(
+            column == attr_value
+        ).all()
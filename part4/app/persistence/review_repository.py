@@ -3,22 +3,53 @@ Review Repository Module
 Handles database persistence for Review entities using SQLAlchemy
 """
 
+from sqlalchemy import exists
+
 from app.models.review import Review
 from app.extensions import db
+from app.persistence.repository import SQLAlchemyRepository
+from app.persistence import unit_of_work
 
 
-class ReviewRepository:
+class ReviewRepository(SQLAlchemyRepository):
     """
     Repository for managing Review entities with SQLAlchemy database persistence.
     """
 
+    PROJECTIONS = {
+        'list': {'id': Review.id, 'text': Review._text, 'rating': Review._rating},
+        'feed': {
+            'id': Review.id,
+            'text': Review._text,
+            'rating': Review._rating,
+            'user_id': Review.user_id,
+            'created_at': Review.created_at,
+        },
+        'export': {
+            'id': Review.id,
+            'text': Review._text,
+            'rating': Review._rating,
+            'user_id': Review.user_id,
+            'place_id': Review.place_id,
+            'created_at': Review.created_at,
+            'updated_at': Review.updated_at,
+        },
+    }
+
+    # Sort orders of a place's review feed: name -> (sort key, descending).
+    # Both are served by an index on (place_id, <sort key>)
+    FEED_SORT_ORDERS = {
+        'newest': ([Review.created_at, Review.id], True),
+        'rating': ([Review._rating, Review.created_at, Review.id], True),
+    }
+
     def __init__(self):
-        self.model = Review
+        super().__init__(Review)
 
     def add(self, review):
         """Add a new review to the database"""
         db.session.add(review)
-        db.session.commit()
+        unit_of_work.commit()
         return review
 
     def get(self, review_id):
@@ -31,24 +62,60 @@ class ReviewRepository:
 
     def update(self, review_id, data):
         """Update a review"""
-        review = self.get(review_id)
+        review = self._get_for_update(review_id)
         if review:
             if 'text' in data:
                 review.text = data['text']
             if 'rating' in data:
                 review.rating = data['rating']
-            db.session.commit()
+            unit_of_work.commit()
         return review
 
     def delete(self, review_id):
         """Delete a review"""
-        review = self.get(review_id)
+        review = self._get_for_update(review_id)
         if review:
             db.session.delete(review)
-            db.session.commit()
+            unit_of_work.commit()
             return True
         return False
 
     def get_by_place(self, place_id):
         """Get all reviews for a specific place"""
         return db.session.query(self.model).filter_by(place_id=place_id).all()
+
+    def exists_for(self, user_id, place_id):
+        """Check whether a user has reviewed a place (one index probe)"""
+        return db.session.query(exists().where(
+            Review.user_id == user_id, Review.place_id == place_id
+        )).scalar()
+
+    def find_page_by_place(self, place_id, limit, cursor=None, sort='newest',
+                           rating=None, projection='feed'):
+        """
+        Retrieve one page of the review feed of a place.
+
+        Args:
+            place_id (str): ID of the reviewed place.
+            limit (int): Maximum number of reviews to return.
+            cursor (str, optional): Cursor of the previous page.
+            sort (str): One of FEED_SORT_ORDERS.
+            rating (int, optional): Only return reviews with this rating.
+            projection (str): Projection name.
+
+        Returns:
+            tuple: (list of rows, next cursor or None)
+
+        Raises:
+            ValueError: If the sort order or the cursor is invalid.
+        """
+        if sort not in self.FEED_SORT_ORDERS:
+            raise ValueError(f"Invalid sort order: {sort}")
+        order_by, descending = self.FEED_SORT_ORDERS[sort]
+        filters = [Review.place_id == place_id]
+        if rating is not None:
+            filters.append(Review._rating == rating)
+        return self.get_page(
+            limit, cursor, filters=filters, order_by=order_by,
+            descending=descending, projection=projection
+        )
@@ -0,0 +1,149 @@
+"""
+Read/Write Splitting Module
+
+`RoutingSession` sends plain SELECTs to read replicas and everything else
+(flushes, INSERT/UPDATE/DELETE, raw SQL) to the primary database. Reads
+stay on the primary when they have to see the latest writes:
+
+- inside a unit of work, or while the session has pending changes,
+- for the rest of a request once it has written anything,
+- inside `read_from_primary()` blocks (read-modify-write in repositories),
+- for a few seconds after a client's own write (read-your-writes), traced
+  with a cookie for browsers and by token identity for API clients.
+
+Replicas are configured with SQLALCHEMY_REPLICA_URIS; without replicas
+every statement goes to the primary, as before.
+"""
+
+import random
+import time
+from contextlib import contextmanager
+
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+from app.persistence.cache import LRUCache
+
+REPLICA_BIND_PREFIX = 'replica_'
+
+_PRIMARY_KEY = 'read_primary'
+_WROTE_KEY = 'wrote'
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session routing reads to replica engines."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._can_use_replica(clause):
+            router = current_app.extensions.get('replica_router')
+            replica = router.choose(self._db) if router else None
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind,
+                                **kwargs)
+
+    def _can_use_replica(self, clause):
+        if not isinstance(clause, Select) or self._flushing:
+            return False
+        if self.info.get(_PRIMARY_KEY) \
+                or self.info.get('unit_of_work_depth', 0) > 0:
+            return False
+        if self.new or self.dirty or self.deleted:
+            return False
+        router = current_app.extensions.get('replica_router')
+        return router is None or not router.is_sticky()
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_written(session, flush_context):
+    """Keep the rest of the request on the primary after a write."""
+    session.info[_PRIMARY_KEY] = True
+    session.info[_WROTE_KEY] = True
+
+
+@contextmanager
+def read_from_primary(session):
+    """Route the reads of the enclosed block to the primary."""
+    previous = session.info.get(_PRIMARY_KEY, False)
+    session.info[_PRIMARY_KEY] = True
+    try:
+        yield session
+    finally:
+        if not session.info.get(_WROTE_KEY):
+            session.info[_PRIMARY_KEY] = previous
+
+
+class ReplicaRouter:
+    """
+    Replica selection and read-your-writes stickiness.
+
+    Attributes:
+        sticky_seconds (float): How long a client reads from the primary
+            after its own write.
+        cookie_name (str): Cookie marking browsers that wrote recently.
+    """
+
+    def __init__(self):
+        self.sticky_seconds = 5.0
+        self.cookie_name = 'hbnb_read_primary'
+        self._writers = LRUCache(maxsize=100000, ttl=self.sticky_seconds)
+
+    def init_app(self, app, db):
+        """Read the settings and install the request hooks."""
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5.0)
+        self.cookie_name = app.config.get(
+            'REPLICA_STICKY_COOKIE', 'hbnb_read_primary'
+        )
+        self._writers = LRUCache(maxsize=100000, ttl=self.sticky_seconds)
+
+        if not app.config.get('SQLALCHEMY_REPLICA_URIS'):
+            return
+
+        @app.after_request
+        def remember_writer(response):
+            if db.session().info.get(_WROTE_KEY):
+                self._remember(response)
+            return response
+
+    def choose(self, db):
+        """Return a replica engine, or None when none is configured."""
+        replicas = [
+            engine for key, engine in db.engines.items()
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)
+        ]
+        return random.choice(replicas) if replicas else None
+
+    def is_sticky(self):
+        """Return True if the current client wrote within the window."""
+        if not has_request_context():
+            return False
+        until = request.cookies.get(self.cookie_name)
+        try:
+            if until and float(until) > time.time():
+                return True
+        except ValueError:
+            pass
+        identity = _current_identity()
+        return identity is not None and self._writers.get(identity) is not None
+
+    def _remember(self, response):
+        until = time.time() + self.sticky_seconds
+        response.set_cookie(
+            self.cookie_name, f'{until:.3f}',
+            max_age=int(self.sticky_seconds) + 1,
+            httponly=True, samesite='Lax'
+        )
+        identity = _current_identity()
+        if identity is not None:
+            self._writers.set(identity, True)
+
+
+def _current_identity():
+    """Return the verified token identity of the request, if any."""
+    from flask_jwt_extended import get_jwt_identity
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        return None
@@ -0,0 +1,68 @@
+"""
+Unit of Work Module
+
+Repositories commit their writes by default. Inside a unit of work they
+only flush, and the outermost unit of work issues a single commit (or a
+rollback if an exception escapes), so a facade operation or a request
+touching several repositories costs one transaction:
+
+    with unit_of_work():
+        user_repo.add(user)
+        place_repo.add(place)   # both committed together
+
+Units of work nest; only the outermost one commits. The nesting depth is
+kept in `session.info`, so it follows Flask-SQLAlchemy's per-context
+scoped session.
+"""
+
+from contextlib import contextmanager
+
+_DEPTH_KEY = 'unit_of_work_depth'
+
+
+def _session():
+    """Late import of db to avoid circular imports."""
+    from app import db
+    return db.session
+
+
+def in_unit_of_work():
+    """Return True when a unit of work is active on the current session."""
+    return _session().info.get(_DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Group repository writes into a single transaction.
+
+    Yields:
+        The current SQLAlchemy session.
+    """
+    session = _session()
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+
+
+def commit():
+    """
+    Commit the current session, or defer to the enclosing unit of work.
+
+    Inside a unit of work the session is flushed instead, so constraint
+    violations still surface at the repository call that caused them.
+    """
+    session = _session()
+    if session.info.get(_DEPTH_KEY, 0) == 0:
+        session.commit()
+    else:
+        session.flush()
@@ -5,6 +5,8 @@ This module provides a specialized repository for User model operations,
 extending the base SQLAlchemyRepository with user-specific functionality.
 """
 
+from sqlalchemy import select
+
 from app.persistence.repository import SQLAlchemyRepository
 from app.models.user import User
 
@@ -17,6 +19,29 @@ class UserRepository(SQLAlchemyRepository):
     such as email-based lookups for authentication purposes.
     """
 
+    PROJECTIONS = {
+        'author': {
+            'id': User.id,
+            'first_name': User._first_name,
+            'last_name': User._last_name,
+        },
+        'list': {
+            'id': User.id,
+            'first_name': User._first_name,
+            'last_name': User._last_name,
+            'email': User._email,
+        },
+        'export': {
+            'id': User.id,
+            'first_name': User._first_name,
+            'last_name': User._last_name,
+            'email': User._email,
+            'is_admin': User._User__is_admin,
+            'created_at': User.created_at,
+            'updated_at': User.updated_at,
+        },
+    }
+
     def __init__(self):
         """Initialize UserRepository with User model."""
         super().__init__(User)
@@ -27,6 +52,8 @@ class UserRepository(SQLAlchemyRepository):
 
         This method is commonly used for authentication and login flows
         where the email serves as the unique identifier for user lookup.
+        The match is case-insensitive and is a single point lookup on the
+        unique `email_normalized` index.
 
         Args:
             email (str): The email address to search for.
@@ -40,4 +67,33 @@ class UserRepository(SQLAlchemyRepository):
             >>> if user:
             ...     print(f"Found user: {user.first_name}")
         """
-        return self.get_by_attribute('email', email)
+        if not isinstance(email, str):
+            return None
+        return self._db.session.execute(
+            select(User).where(
+                User._email_normalized == User.normalize_email(email)
+            )
+        ).scalar_one_or_none()
+
+    def email_exists(self, email, exclude_id=None):
+        """
+        Check whether an email is already registered.
+
+        Args:
+            email (str): The email address to check.
+            exclude_id (str, optional): ID of a user to ignore, e.g. the
+                user whose email is being changed.
+
+        Returns:
+            bool: True if another user has this email.
+        """
+        if not isinstance(email, str):
+            return False
+        query = select(User.id).where(
+            User._email_normalized == User.normalize_email(email)
+        )
+        if exclude_id is not None:
+            query = query.where(User.id != exclude_id)
+        return self._db.session.execute(
+            select(query.exists())
+        ).scalar()
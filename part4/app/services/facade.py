@@ -1,8 +1,20 @@
-from app.persistence.repository import InMemoryRepository
+from sqlalchemy.exc import IntegrityError
+
+from app.persistence.repository import DuplicateKeyError, INVALID_TYPE_ERROR
 from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.amenity_repository import AmenityRepository
 from app.persistence.review_repository import ReviewRepository
+from app.persistence.unit_of_work import unit_of_work
+from app.persistence.cache import CachedRepository, LocalSharedCache
+from app.persistence.memory_store import MemoryStore
+from app.persistence.memory_repository import (
+    InMemoryAmenityRepository,
+    InMemoryPlaceRepository,
+    InMemoryReviewRepository,
+    InMemoryUserRepository,
+)
+from app.services.principal_cache import PrincipalCache
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
@@ -16,6 +28,17 @@ class HBnBFacade:
     pour les entités principales (User, Place, Review, Amenity).
     """
 
+    # Fields of a bulk-created row: (required, optional). Rows with other
+    # keys are rejected before any model is built
+    BULK_CREATE_FIELDS = {
+        'user': (('first_name', 'last_name', 'email', 'password'),
+                 ('is_admin',)),
+        'amenity': (('name',), ()),
+        'place': (('title', 'price', 'latitude', 'longitude', 'owner_id'),
+                  ('description', 'amenities')),
+        'review': (('text', 'rating', 'user_id', 'place_id'), ()),
+    }
+
     def __init__(self):
 
         """
@@ -27,10 +50,92 @@ class HBnBFacade:
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
+        self.principal_cache = PrincipalCache()
+        self.store = None
+
+    def init_app(self, app):
+        """
+        Configure the repositories from the application settings.
+
+        REPOSITORY_TYPE 'in_memory' keeps every entity in process memory,
+        persisted to MEMORY_STORE_PATH when it is set. Otherwise the
+        SQLAlchemy repositories are used, and the place and amenity
+        repositories are wrapped in a read-through cache when
+        CACHE_ENABLED is set.
+        """
+        self.principal_cache = PrincipalCache(
+            maxsize=app.config.get('AUTH_CACHE_MAX_ENTRIES', 10000),
+            ttl=app.config.get('AUTH_CACHE_TTL_SECONDS', 60)
+        )
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+        if app.config.get('REPOSITORY_TYPE') == 'in_memory':
+            self._init_memory_store(app)
+            return
+
+        self.user_repo = UserRepository()
+        self.place_repo = PlaceRepository()
+        self.review_repo = ReviewRepository()
+        self.amenity_repo = AmenityRepository()
+
+        if app.config.get('CACHE_ENABLED'):
+            shared = None
+            if app.config.get('CACHE_SHARED_BACKEND') == 'local':
+                shared = LocalSharedCache()
+            self.place_repo = CachedRepository(
+                self.place_repo,
+                maxsize=app.config['CACHE_MAX_ENTRIES'],
+                ttl=app.config['CACHE_TTL_SECONDS'],
+                shared=shared
+            )
+            self.amenity_repo = CachedRepository(
+                self.amenity_repo,
+                maxsize=app.config['CACHE_MAX_ENTRIES'],
+                ttl=app.config['CACHE_TTL_SECONDS'],
+                shared=shared
+            )
+
+    def _init_memory_store(self, app):
+        self.store = MemoryStore(
+            path=app.config.get('MEMORY_STORE_PATH'),
+            snapshot_every=app.config.get('MEMORY_SNAPSHOT_EVERY', 10000),
+            fsync=app.config.get('MEMORY_FSYNC', False)
+        )
+        self.user_repo = InMemoryUserRepository()
+        self.amenity_repo = InMemoryAmenityRepository()
+        self.place_repo = InMemoryPlaceRepository()
+        self.review_repo = InMemoryReviewRepository()
+        # Referenced entities first, so references resolve on replay
+        self.store.register('users', self.user_repo)
+        self.store.register('amenities', self.amenity_repo)
+        self.store.register('places', self.place_repo)
+        self.store.register('reviews', self.review_repo)
+        self.store.load()
+
+    def transaction(self):
+        """
+        Group several facade or repository writes into one commit.
+
+        Usage:
+            with facade.transaction():
+                ...
+        """
+        if self.store is not None:
+            return self.store.transaction()
+        return unit_of_work()
 
     def create_user(self, user_data):
         user = User(**user_data)
-        self.user_repo.add(user)
+        # The API checks email_exists first, but a concurrent registration
+        # of the same email can pass it; the unique index on the
+        # normalized email then rejects this insert
+        try:
+            with self.transaction():
+                self.user_repo.add(user)
+        except (IntegrityError, DuplicateKeyError):
+            raise ValueError('Email already registered')
         return user
 
     def get_user(self, user_id):
@@ -39,11 +144,51 @@ class HBnBFacade:
     def get_user_by_email(self, email):
         return self.user_repo.get_user_by_email(email)
 
+    def authenticate_user(self, email, password):
+        user = self.user_repo.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        # Upgrade hashes made with another work factor while the plain
+        # password is at hand
+        if user.password_needs_rehash():
+            self.user_repo.update(
+                user.id, {'password': User.prehash_password(password)}
+            )
+        return user
+
+    def get_principal(self, jwt_data):
+        return self.principal_cache.resolve(jwt_data, self.user_repo.get)
+
+    def email_exists(self, email, exclude_id=None):
+        return self.user_repo.email_exists(email, exclude_id)
+
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    def get_user_list(self):
+        return self.user_repo.project('list')
+
+    def stream_users(self, batch_size=1000):
+        return self.user_repo.stream('export', batch_size=batch_size)
+
+    def get_users_version(self):
+        return self.user_repo.get_version()
+
     def update_user(self, user_id, user_data):
-        self.user_repo.update(user_id, user_data)
+        # Hashed before the write: bcrypt must not run while the in-memory
+        # store's lock is held, which would stall every other request
+        if 'password' in user_data:
+            user_data = dict(
+                user_data,
+                password=User.prehash_password(user_data['password'])
+            )
+        try:
+            with self.transaction():
+                self.user_repo.update(user_id, user_data)
+        except (IntegrityError, DuplicateKeyError):
+            raise ValueError('Email already in use')
+        if 'is_admin' in user_data:
+            self.principal_cache.invalidate_user(user_id)
         return self.user_repo.get(user_id)
 
     def create_amenity(self, amenity_data):
@@ -57,6 +202,12 @@ class HBnBFacade:
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    def get_amenity_list(self):
+        return self.amenity_repo.project('list')
+
+    def get_amenities_version(self):
+        return self.amenity_repo.get_version()
+
     def update_amenity(self, amenity_id, amenity_data):
         self.amenity_repo.update(amenity_id, amenity_data)
         return self.amenity_repo.get(amenity_id)
@@ -67,8 +218,16 @@ class HBnBFacade:
         if not owner:
             return None
 
-        amenity_ids = place_data.get('amenities', [])
+        # Looked up before the Place exists: the query autoflushes, which
+        # would otherwise flush a Place linked to its owner but not added
+        amenities, _ = self.amenity_repo.get_many(
+            self._amenity_ids(place_data.get('amenities', []))
+        )
+        place = self._build_place(place_data, owner, amenities)
+        self.place_repo.add(place)
+        return place
 
+    def _build_place(self, place_data, owner, amenities):
         place = Place(
             title=place_data['title'],
             description=place_data.get('description'),
@@ -77,24 +236,56 @@ class HBnBFacade:
             longitude=place_data['longitude'],
             owner=owner
         )
-
-        for amenity_id in amenity_ids:
-            amenity = self.amenity_repo.get(amenity_id)
-            if amenity:
-                place.add_amenity(amenity)
-
-        self.place_repo.add(place)
+        for amenity in amenities:
+            place.add_amenity(amenity)
         return place
 
+    @staticmethod
+    def _amenity_ids(value):
+        # Unknown amenity IDs are ignored, other values are rejected
+        if not isinstance(value, list) or not all(
+                isinstance(amenity_id, str) for amenity_id in value):
+            raise ValueError('Amenities must be a list of amenity IDs')
+        return value
+
     def get_place(self, place_id):
         return self.place_repo.get(place_id)
 
+    def get_place_details(self, place_id):
+        return self.place_repo.get(place_id, profile='detail')
+
     def get_all_places(self):
         return self.place_repo.get_all()
 
+    def get_places_version(self):
+        return self.place_repo.get_version()
+
+    def get_place_details_version(self, place_id):
+        return self.place_repo.get_detail_version(place_id)
+
+    def get_places_page(self, limit, cursor=None, sort='created', **criteria):
+        return self.place_repo.find_page(
+            limit, cursor, sort, projection='card', **criteria
+        )
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit):
+        return self.place_repo.find_nearby(latitude, longitude, radius_km, limit)
+
+    def get_places_in_bbox(self, min_lat, min_lon, max_lat, max_lon, limit):
+        return self.place_repo.find_in_bbox(min_lat, min_lon, max_lat, max_lon, limit)
+
     def update_place(self, place_id, place_data):
-        self.place_repo.update(place_id, place_data)
-        return self.place_repo.get(place_id)
+        place_data = dict(place_data)
+        amenity_ids = place_data.pop('amenities', None)
+        if amenity_ids is not None:
+            self._amenity_ids(amenity_ids)
+        with self.transaction():
+            self.place_repo.update(place_id, place_data)
+            place = self.place_repo.get(place_id)
+            if place and amenity_ids is not None:
+                amenities, _ = self.amenity_repo.get_many(amenity_ids)
+                self.place_repo.set_amenities(place_id, amenities)
+        return place
 
     def create_review(self, review_data):
         user_id = review_data.get('user_id')
@@ -113,29 +304,249 @@ class HBnBFacade:
             user=user
         )
 
-        self.review_repo.add(review)
-        place.add_review(review)
+        # The review is linked to place.reviews by the relationship backref;
+        # review and aggregates are committed together. A concurrent
+        # submission by the same user can pass has_user_reviewed; the
+        # unique (user_id, place_id) constraint then rejects this insert
+        try:
+            with self.transaction():
+                self.review_repo.add(review)
+                self.place_repo.adjust_review_aggregates(
+                    place.id, 1, review.rating
+                )
+        except (IntegrityError, DuplicateKeyError):
+            raise ValueError('You have already reviewed this place')
         return review
 
+    def has_user_reviewed(self, user_id, place_id):
+        return self.review_repo.exists_for(user_id, place_id)
+
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
 
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
-    def get_reviews_by_place(self, place_id):
-        place = self.place_repo.get(place_id)
-        if not place:
-            return None
-        return place.reviews
+    def get_review_list(self):
+        return self.review_repo.project('list')
+
+    def stream_reviews(self, batch_size=1000):
+        return self.review_repo.stream('export', batch_size=batch_size)
+
+    def get_review_feed(self, place_id, limit, cursor=None, sort='newest',
+                        rating=None):
+        reviews, next_cursor = self.review_repo.find_page_by_place(
+            place_id, limit, cursor, sort, rating
+        )
+        # Author names of the whole page, in a single query
+        authors = self.user_repo.project_many(
+            'author', [review.user_id for review in reviews]
+        )
+        return reviews, authors, next_cursor
+
+    def get_reviews_version(self):
+        return self.review_repo.get_version()
 
     def update_review(self, review_id, review_data):
-        self.review_repo.update(review_id, review_data)
-        return self.review_repo.get(review_id)
+        with self.transaction():
+            review = self.review_repo.get(review_id)
+            if review and 'rating' in review_data:
+                old_rating = review.rating
+                self.review_repo.update(review_id, review_data)
+                self.place_repo.adjust_review_aggregates(
+                    review.place_id, 0, review.rating - old_rating
+                )
+            else:
+                self.review_repo.update(review_id, review_data)
+        return review
 
     def delete_review(self, review_id):
         review = self.review_repo.get(review_id)
         if not review:
             return False
-        self.review_repo.delete(review_id)
+        with self.transaction():
+            self.place_repo.adjust_review_aggregates(
+                review.place_id, -1, -review.rating
+            )
+            self.review_repo.delete(review_id)
         return True
+
+    def recompute_review_aggregates(self, place_ids=None):
+        return self.place_repo.recompute_review_aggregates(place_ids)
+
+    # --- bulk operations ---
+    # Rows are validated by the model setters; each method returns the IDs
+    # written and a list of {'index', 'error'} for rejected rows. IDs are
+    # captured before commit so that expired instances are not reloaded.
+
+    def create_users_bulk(self, rows, chunk_size=1000):
+        return self._create_bulk(
+            self.user_repo, rows, lambda data: User(**data), chunk_size,
+            'user'
+        )
+
+    def create_amenities_bulk(self, rows, chunk_size=1000):
+        return self._create_bulk(
+            self.amenity_repo, rows, lambda data: Amenity(**data), chunk_size,
+            'amenity'
+        )
+
+    def create_places_bulk(self, rows, chunk_size=1000):
+        # Owners and amenities of every row are resolved up front with
+        # batched IN queries; per-row lookups then hit the identity map
+        owners = self._prefetch(self.user_repo, rows, 'owner_id')
+        amenities = self._prefetch(self.amenity_repo, rows, 'amenities', many=True)
+
+        def build(place_data):
+            owner = owners.get(place_data.get('owner_id'))
+            if not owner:
+                raise ValueError('Owner not found')
+            # Taken from the prefetch: a lookup query per row would also
+            # autoflush the places built so far, before they are added
+            amenity_ids = dict.fromkeys(
+                self._amenity_ids(place_data.get('amenities', []))
+            )
+            return self._build_place(place_data, owner, [
+                amenities[amenity_id] for amenity_id in amenity_ids
+                if amenity_id in amenities
+            ])
+
+        return self._create_bulk(
+            self.place_repo, rows, build, chunk_size, 'place'
+        )
+
+    def update_places_bulk(self, rows, chunk_size=1000):
+        updates = []
+        errors = []
+        positions = []
+        for index, place_data in enumerate(rows):
+            if not isinstance(place_data, dict) or 'id' not in place_data:
+                errors.append({'index': index, 'error': 'Missing field: id'})
+                continue
+            unknown = self._unknown_field(
+                place_data, ('id',) + Place.UPDATABLE_FIELDS
+            )
+            if unknown:
+                errors.append({'index': index,
+                               'error': f'Unknown field: {unknown}'})
+                continue
+            data = {k: v for k, v in place_data.items() if k != 'id'}
+            updates.append((place_data['id'], data))
+            positions.append(index)
+
+        failures = self.place_repo.update_many(updates, chunk_size)
+        errors.extend(
+            {'index': positions[position], 'error': error}
+            for position, error in failures
+        )
+        failed = {position for position, _ in failures}
+        updated = [
+            obj_id for position, (obj_id, _) in enumerate(updates)
+            if position not in failed
+        ]
+        errors.sort(key=lambda error: error['index'])
+        return updated, errors
+
+    def create_reviews_bulk(self, rows, chunk_size=1000):
+        users = self._prefetch(self.user_repo, rows, 'user_id')
+        places = self._prefetch(self.place_repo, rows, 'place_id')
+        reviewed_places = {}
+
+        def build(review_data):
+            user_id = review_data.get('user_id')
+            place_id = review_data.get('place_id')
+            if not users.get(user_id) or not places.get(place_id):
+                raise ValueError('User or Place not found')
+            if places[place_id].owner_id == user_id:
+                raise ValueError('You cannot review your own place')
+            review = Review(
+                text=review_data['text'],
+                rating=review_data['rating'],
+                place=places[place_id],
+                user=users[user_id]
+            )
+            reviewed_places[review.id] = place_id
+            return review
+
+        created, errors = self._create_bulk(
+            self.review_repo, rows, build, chunk_size, 'review'
+        )
+        # Aggregates of the touched places are rebuilt once for the batch
+        place_ids = {reviewed_places[review_id] for review_id in created}
+        if place_ids:
+            self.place_repo.recompute_review_aggregates(place_ids)
+        return created, errors
+
+    # --- raw imports ---
+    # Rows are dicts keyed by column name and are not validated (see
+    # SQLAlchemyRepository.insert_rows); each method returns the number
+    # of rows inserted
+
+    def import_users(self, rows, chunk_size=1000):
+        return self.user_repo.insert_rows(rows, chunk_size)
+
+    def import_amenities(self, rows, chunk_size=1000):
+        return self.amenity_repo.insert_rows(rows, chunk_size)
+
+    def import_places(self, rows, chunk_size=1000):
+        return self.place_repo.insert_rows(rows, chunk_size)
+
+    def import_reviews(self, rows, chunk_size=1000):
+        return self.review_repo.insert_rows(rows, chunk_size)
+
+    @staticmethod
+    def _unknown_field(data, allowed):
+        unknown = sorted(str(key) for key in data if key not in allowed)
+        return unknown[0] if unknown else None
+
+    def _prefetch(self, repo, rows, field, many=False):
+        ids = []
+        for data in rows:
+            if isinstance(data, dict):
+                value = data.get(field)
+                values = value if many and isinstance(value, list) else [value]
+                ids.extend(v for v in values if isinstance(v, str))
+        objs, _ = repo.get_many(ids)
+        return {obj.id: obj for obj in objs}
+
+    def _create_bulk(self, repo, rows, build, chunk_size, entity):
+        required, optional = self.BULK_CREATE_FIELDS[entity]
+        objs = []
+        positions = []
+        errors = []
+        for index, data in enumerate(rows):
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError('Row must be an object')
+                unknown = self._unknown_field(data, required + optional)
+                if unknown:
+                    raise ValueError(f'Unknown field: {unknown}')
+                missing = [name for name in required if name not in data]
+                if missing:
+                    raise KeyError(missing[0])
+                objs.append(build(data))
+            except KeyError as e:
+                errors.append({'index': index, 'error': f'Missing field: {e.args[0]}'})
+                continue
+            except TypeError:
+                errors.append({'index': index, 'error': INVALID_TYPE_ERROR})
+                continue
+            except ValueError as e:
+                # Validation messages of the models and of the build step
+                errors.append({'index': index, 'error': str(e)})
+                continue
+            positions.append(index)
+
+        ids = [obj.id for obj in objs]
+        failures = repo.add_many(objs, chunk_size)
+        errors.extend(
+            {'index': positions[position], 'error': error}
+            for position, error in failures
+        )
+        failed = {position for position, _ in failures}
+        created = [
+            obj_id for position, obj_id in enumerate(ids)
+            if position not in failed
+        ]
+        errors.sort(key=lambda error: error['index'])
+        return created, errors
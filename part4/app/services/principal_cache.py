@@ -0,0 +1,143 @@
+"""
+Principal Cache Module
+
+Authenticated endpoints need to know who the caller is and whether they
+are an admin. Reading that from the users table on every request costs a
+round-trip per write, while trusting the token's `is_admin` claim keeps a
+revoked admin powerful until the token expires.
+
+`PrincipalCache` keeps, per access token (`jti`), a small authorization
+snapshot of its user, valid for at most `ttl` seconds and never beyond the
+token's own expiry. Changing a user's admin status invalidates every
+snapshot of that user in this process; other processes pick it up when
+their entries expire.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.persistence.cache import LRUCache
+
+
+class Principal:
+    """
+    Authorization snapshot of an authenticated user.
+
+    Attributes:
+        id (str): User ID.
+        is_admin (bool): Admin status when the snapshot was taken.
+    """
+    __slots__ = ('id', 'is_admin')
+
+    def __init__(self, user_id, is_admin):
+        self.id = user_id
+        self.is_admin = is_admin
+
+    @classmethod
+    def from_user(cls, user):
+        """Take a snapshot of a User."""
+        return cls(user.id, user.is_admin)
+
+    def __repr__(self):
+        return f"Principal(id={self.id!r}, is_admin={self.is_admin!r})"
+
+
+class PrincipalCache:
+    """
+    Per-process cache of principals keyed by token `jti`.
+
+    Invalidations are recorded per user with an increasing generation and
+    kept for `ttl` seconds only: a snapshot is trusted for at most `ttl`
+    seconds from the moment its lookup started, so once a record expires
+    every snapshot it could reject has expired too. At most `maxsize`
+    records are kept; beyond that every snapshot is dropped at once.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of cached tokens, and of
+                recorded invalidations.
+            ttl (float): Seconds a snapshot is trusted.
+            clock (callable): Time source, overridable for tests.
+        """
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl, clock=clock)
+        self._clock = clock
+        # user_id -> (generation, expires_at), oldest first
+        self._invalidations = OrderedDict()
+        self._generation = 0
+        # Snapshots taken before this generation are all stale
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def resolve(self, jwt_data, load_user):
+        """
+        Return the principal of a decoded token.
+
+        Args:
+            jwt_data (dict): Decoded token claims (`sub`, `jti`, `exp`).
+            load_user (callable): Loads a User by ID on a cache miss.
+
+        Returns:
+            Principal: The snapshot, or None if the user no longer exists.
+        """
+        started = self._clock()
+        user_id = jwt_data['sub']
+        jti = jwt_data.get('jti')
+        entry = self._cache.get(jti) if jti else None
+        if entry is not None:
+            principal, generation = entry
+            if not self._invalidated_since(user_id, generation):
+                return principal
+
+        with self._lock:
+            generation = self._generation
+        user = load_user(user_id)
+        if user is None:
+            return None
+        principal = Principal.from_user(user)
+        if jti:
+            ttl = self.ttl
+            if jwt_data.get('exp') is not None:
+                ttl = min(ttl, max(jwt_data['exp'] - time.time(), 0))
+            # Counted from the start of the lookup, so the snapshot never
+            # outlives an invalidation record issued while loading
+            ttl -= self._clock() - started
+            if ttl > 0:
+                self._cache.set(jti, (principal, generation), ttl=ttl)
+        return principal
+
+    def invalidate_user(self, user_id):
+        """Drop every cached snapshot of a user."""
+        with self._lock:
+            now = self._clock()
+            self._prune(now)
+            self._generation += 1
+            self._invalidations.pop(user_id, None)
+            self._invalidations[user_id] = (self._generation, now + self.ttl)
+            if len(self._invalidations) > self.maxsize:
+                self._floor = self._generation
+                self._invalidations.clear()
+                self._cache.clear()
+
+    def clear(self):
+        """Drop every cached snapshot."""
+        self._cache.clear()
+
+    def _invalidated_since(self, user_id, generation):
+        with self._lock:
+            if generation < self._floor:
+                return True
+            record = self._invalidations.get(user_id)
+            return record is not None and record[0] > generation
+
+    def _prune(self, now):
+        """Drop expired invalidation records (the oldest come first)."""
+        while self._invalidations:
+            user_id, (_, expires_at) = next(iter(self._invalidations.items()))
+            if expires_at > now:
+                break
+            del self._invalidations[user_id]
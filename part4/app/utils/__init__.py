@@ -0,0 +1,5 @@
+"""
+Utilities package.
+
+Helpers shared by the models, persistence and API layers.
+"""
@@ -0,0 +1,171 @@
+"""
+Geospatial helpers.
+
+This module implements geohash encoding and the geometry used by the
+place geo search:
+
+- `encode_geohash` maps a coordinate to a base32 cell identifier. Nearby
+  points share a common prefix, so a B-tree index on the geohash column
+  turns "points inside this cell" into an index range scan.
+- `covering_cells` returns the few cells that cover a bounding box, used to
+  prune candidates in SQL before the exact distance is computed.
+- `haversine_km` computes the exact great-circle distance used for ranking.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_PRECISION = 9
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Sorts after every geohash character, used as an exclusive upper bound
+# for prefix range scans
+GEOHASH_UPPER_BOUND = '{'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encode a coordinate as a geohash string.
+
+    Args:
+        latitude (float): Latitude in degrees.
+        longitude (float): Longitude in degrees.
+        precision (int): Number of base32 characters.
+
+    Returns:
+        str: Geohash of the cell containing the coordinate.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(geohash) < precision:
+        if even:
+            interval, value = lon_range, longitude
+        else:
+            interval, value = lat_range, latitude
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            interval[0] = mid
+        else:
+            bits = bits << 1
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+
+def cell_size(precision):
+    """
+    Return the `(height, width)` in degrees of a geohash cell.
+
+    Args:
+        precision (int): Number of base32 characters.
+    """
+    lon_bits = math.ceil(5 * precision / 2)
+    lat_bits = math.floor(5 * precision / 2)
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Compute the bounding box of a circle.
+
+    Args:
+        latitude (float): Center latitude in degrees.
+        longitude (float): Center longitude in degrees.
+        radius_km (float): Circle radius in kilometers.
+
+    Returns:
+        tuple: (min_lat, min_lon, max_lat, max_lon); longitudes may fall
+        outside [-180, 180] when the box crosses the antimeridian.
+    """
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    delta_lat = math.degrees(angular_radius)
+    # Widest longitude span of the circle; it covers every longitude when
+    # the circle contains a pole
+    ratio = math.sin(angular_radius) / max(
+        math.cos(math.radians(latitude)), 1e-12
+    )
+    if abs(latitude) + delta_lat >= 90.0 or ratio >= 1.0:
+        delta_lon = 180.0
+    else:
+        delta_lon = math.degrees(math.asin(ratio))
+    return (
+        max(latitude - delta_lat, -90.0),
+        longitude - delta_lon,
+        min(latitude + delta_lat, 90.0),
+        longitude + delta_lon,
+    )
+
+
+def covering_cells(min_lat, min_lon, max_lat, max_lon):
+    """
+    Find geohash cells covering a bounding box.
+
+    The precision is the finest one whose cells are at least as large as
+    the box, so the result holds a handful of cells at most.
+
+    Returns:
+        list: Geohash prefixes, or an empty list when the box is too large
+        for prefix pruning to help.
+    """
+    height = max_lat - min_lat
+    width = max_lon - min_lon
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        cell_height, cell_width = cell_size(candidate)
+        if cell_height < height or cell_width < width:
+            break
+        precision = candidate
+    if precision == 0:
+        return []
+
+    cell_height, cell_width = cell_size(precision)
+    cells = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            cells.add(encode_geohash(
+                min(lat, max_lat), normalize_longitude(min(lon, max_lon)),
+                precision
+            ))
+            if lon >= max_lon:
+                break
+            lon += cell_width
+        if lat >= max_lat:
+            break
+        lat += cell_height
+    return sorted(cells)
+
+
+def normalize_longitude(longitude):
+    """Wrap a longitude into the [-180, 180) range."""
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great-circle distance between two coordinates.
+
+    Returns:
+        float: Distance in kilometers.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = math.radians(lat2 - lat1)
+    d_lambda = math.radians(lon2 - lon1)
+    a = (math.sin(d_phi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
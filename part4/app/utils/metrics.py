@@ -0,0 +1,346 @@
+"""
+Request instrumentation.
+
+`Metrics` is a Flask extension measuring the hot paths of every request:
+
+- SQL statements, counted and timed through SQLAlchemy cursor events on
+  every engine (primary and replicas),
+- bcrypt and response serialization, timed with `timed(phase)` by the
+  password hasher and the JSON representation,
+- the total latency of each endpoint.
+
+Each response carries the request's totals in a `Server-Timing` header
+(shown by browser dev tools), and aggregates are exposed in the
+Prometheus text format at METRICS_PATH. Statements slower than
+SLOW_QUERY_MS are logged to the `hbnb.sql.slow` logger, which replaces
+echoing every statement during development.
+
+Metrics are kept per process: with several WSGI worker processes, each
+scrape sees the worker that answered it.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, has_app_context, \
+    has_request_context, request
+from sqlalchemy import event
+
+slow_query_logger = logging.getLogger('hbnb.sql.slow')
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                     0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+_QUERY_START_KEY = 'metrics_query_start'
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    TYPE = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Add `amount` to the series of the given label values."""
+        key = tuple(labels[label] for label in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        """Yield (name, labels, value) for every series."""
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in sorted(values):
+            yield self.name, dict(zip(self.labels, key)), value
+
+
+class Histogram:
+    """Cumulative histogram with optional labels, as Prometheus expects."""
+
+    TYPE = 'histogram'
+
+    def __init__(self, name, documentation, labels=(),
+                 buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record one observation in the series of the given labels."""
+        key = tuple(labels[label] for label in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts, then sum and count of observations
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        """Yield (name, labels, value) for every bucket, sum and count."""
+        with self._lock:
+            series = [(key, (list(counts), total, count))
+                      for key, (counts, total, count) in self._series.items()]
+        for key, (counts, total, count) in sorted(series):
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (f'{self.name}_bucket',
+                       {**labels, 'le': _format_value(bound)}, cumulative)
+            yield f'{self.name}_bucket', {**labels, 'le': '+Inf'}, count
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+
+class RequestTiming:
+    """
+    Measurements of the current request, kept in `flask.g`.
+
+    Attributes:
+        start (float): `time.perf_counter()` when the request started.
+        statements (int): SQL statements executed.
+        db_seconds (float): Time spent executing them.
+        phases (dict): Seconds spent per timed phase (e.g. 'bcrypt').
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.phases = {}
+
+
+class Metrics:
+    """
+    Flask extension collecting request, SQL and phase metrics.
+
+    Until `init_app` is called, nothing is measured. METRICS_ENDPOINT_ENABLED
+    only controls the route at METRICS_PATH: the slow-query log, the
+    Server-Timing header and the aggregates work without it.
+    """
+
+    def __init__(self):
+        self.server_timing = True
+        self.slow_query_seconds = None
+        self.requests = Counter(
+            'hbnb_http_requests_total', 'HTTP requests handled.',
+            ('method', 'endpoint', 'status')
+        )
+        self.request_latency = Histogram(
+            'hbnb_http_request_duration_seconds',
+            'Time to handle an HTTP request.', ('method', 'endpoint')
+        )
+        self.request_statements = Histogram(
+            'hbnb_http_request_db_statements',
+            'SQL statements executed per HTTP request.',
+            ('method', 'endpoint'), buckets=STATEMENT_COUNT_BUCKETS
+        )
+        self.statement_latency = Histogram(
+            'hbnb_db_statement_duration_seconds',
+            'Time to execute a SQL statement.', ('operation',),
+            buckets=STATEMENT_BUCKETS
+        )
+        self.slow_statements = Counter(
+            'hbnb_db_slow_statements_total',
+            'SQL statements slower than SLOW_QUERY_MS.', ('operation',)
+        )
+        self.phase_latency = Histogram(
+            'hbnb_phase_duration_seconds',
+            'Time spent in instrumented phases (bcrypt, serialization).',
+            ('phase',)
+        )
+        self._metrics = (
+            self.requests, self.request_latency, self.request_statements,
+            self.statement_latency, self.slow_statements, self.phase_latency,
+        )
+
+    def init_app(self, app, db):
+        """Install the request hooks, engine listeners and /metrics route."""
+        self.server_timing = app.config.get('SERVER_TIMING_ENABLED', True)
+        slow_query_ms = app.config.get('SLOW_QUERY_MS', 200)
+        self.slow_query_seconds = (
+            None if slow_query_ms is None or slow_query_ms < 0
+            else slow_query_ms / 1000.0
+        )
+        app.extensions['metrics'] = self
+
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument_engine(engine)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        if app.config.get('METRICS_ENDPOINT_ENABLED', True):
+            app.add_url_rule(
+                app.config.get('METRICS_PATH', '/metrics'), 'metrics',
+                self._metrics_view
+            )
+
+    def instrument_engine(self, engine):
+        """Count and time the statements executed on `engine`."""
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+
+    def observe_phase(self, phase, seconds):
+        """Record time spent in a phase of the current request."""
+        self.phase_latency.observe(seconds, phase=phase)
+        timing = _current_timing()
+        if timing is not None:
+            timing.phases[phase] = timing.phases.get(phase, 0.0) + seconds
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+            for name, labels, value in metric.samples():
+                lines.append(
+                    f'{name}{_format_labels(labels)} {_format_value(value)}'
+                )
+        return '\n'.join(lines) + '\n'
+
+    # --- hooks ---
+
+    def _start_request(self):
+        g.request_timing = RequestTiming()
+
+    def _finish_request(self, response):
+        timing = _current_timing()
+        if timing is None:
+            return response
+        elapsed = time.perf_counter() - timing.start
+        method = request.method
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        self.requests.inc(
+            method=method, endpoint=endpoint, status=str(response.status_code)
+        )
+        self.request_latency.observe(elapsed, method=method, endpoint=endpoint)
+        self.request_statements.observe(
+            timing.statements, method=method, endpoint=endpoint
+        )
+        if self.server_timing:
+            response.headers['Server-Timing'] = _server_timing(timing, elapsed)
+        return response
+
+    def _before_execute(self, conn, cursor, statement, parameters, context,
+                        executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context,
+                       executemany):
+        starts = conn.info.get(_QUERY_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        operation = _operation(statement)
+        self.statement_latency.observe(elapsed, operation=operation)
+
+        timing = _current_timing()
+        if timing is not None:
+            timing.statements += 1
+            timing.db_seconds += elapsed
+
+        if self.slow_query_seconds is not None \
+                and elapsed >= self.slow_query_seconds:
+            self.slow_statements.inc(operation=operation)
+            slow_query_logger.warning(
+                'Slow query (%.1f ms) during %s: %s',
+                elapsed * 1000, _request_description(), statement
+            )
+
+    def _metrics_view(self):
+        return Response(
+            self.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+            headers={'Cache-Control': 'no-store'}
+        )
+
+
+@contextmanager
+def timed(phase):
+    """
+    Time the enclosed block as `phase` of the current request.
+
+    Does nothing outside an application with metrics enabled, so
+    instrumented code also runs from scripts.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_app_context():
+            metrics = current_app.extensions.get('metrics')
+            if metrics is not None:
+                metrics.observe_phase(phase, time.perf_counter() - start)
+
+
+def _current_timing():
+    if not has_request_context():
+        return None
+    return g.get('request_timing')
+
+
+def _server_timing(timing, elapsed):
+    """Format a request's measurements as a Server-Timing header value."""
+    entries = [
+        f'db;dur={timing.db_seconds * 1000:.2f};'
+        f'desc="{timing.statements} queries"'
+    ]
+    entries.extend(
+        f'{phase};dur={seconds * 1000:.2f}'
+        for phase, seconds in sorted(timing.phases.items())
+    )
+    entries.append(f'total;dur={elapsed * 1000:.2f}')
+    return ', '.join(entries)
+
+
+def _operation(statement):
+    """First keyword of a statement (SELECT, INSERT, ...)."""
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else 'UNKNOWN'
+
+
+def _request_description():
+    if not has_request_context():
+        return 'no request'
+    return f'{request.method} {request.path}'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return '{' + pairs + '}'
+
+
+def _escape(value):
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
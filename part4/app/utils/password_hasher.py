@@ -0,0 +1,122 @@
+"""
+Password hashing service.
+
+bcrypt is deliberately slow, so hashing on the request thread lets a burst
+of logins occupy every WSGI worker and stall unrelated endpoints. This
+module runs bcrypt on a dedicated, bounded thread pool instead (the bcrypt
+library releases the GIL while hashing, so threads run in parallel):
+
+- at most `workers + max_pending` hashes are admitted at once; beyond
+  that, `PasswordHasherBusy` is raised immediately so the API can answer
+  429 instead of queueing requests,
+- the work factor comes from `BCRYPT_LOG_ROUNDS`, and `needs_rehash`
+  tells whether a stored hash was made with another cost, so it can be
+  upgraded transparently at the next successful login.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import bcrypt
+
+from app.utils.metrics import timed
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool cannot take more work."""
+    pass
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing on a bounded worker pool.
+
+    Until `init_app` is called, hashes are computed on the calling thread.
+
+    Attributes:
+        rounds (int): bcrypt work factor (log2 of the number of rounds).
+        timeout (float): Seconds a caller waits for its result.
+    """
+
+    def __init__(self, rounds=12, timeout=5.0):
+        self.rounds = rounds
+        self.timeout = timeout
+        self._executor = None
+        self._slots = None
+
+    def init_app(self, app):
+        """Start the worker pool from the application settings."""
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 5.0)
+        workers = app.config.get('PASSWORD_HASH_WORKERS', 4)
+        max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 16)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='password-hasher'
+        )
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def hash(self, password):
+        """
+        Hash a password with the configured work factor.
+
+        Returns:
+            str: The bcrypt hash.
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated.
+        """
+        with timed('bcrypt'):
+            hashed = self._run(
+                bcrypt.hashpw, password.encode('utf-8'),
+                bcrypt.gensalt(self.rounds)
+            )
+        return hashed.decode('utf-8')
+
+    def verify(self, password, hashed):
+        """
+        Check a password against a bcrypt hash.
+
+        Returns:
+            bool: True if the password matches.
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated.
+        """
+        if not isinstance(password, str):
+            return False
+        with timed('bcrypt'):
+            return self._run(
+                bcrypt.checkpw, password.encode('utf-8'),
+                hashed.encode('utf-8')
+            )
+
+    def needs_rehash(self, hashed):
+        """Return True if `hashed` was not made with the configured cost."""
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _run(self, func, *args):
+        if self._executor is None:
+            return func(*args)
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Authentication service is busy')
+        try:
+            future = self._executor.submit(func, *args)
+        except RuntimeError:
+            slots.release()
+            raise
+        # The slot is held until the hash completes, even if the caller
+        # gives up waiting, so abandoned work still counts against the bound
+        future.add_done_callback(lambda _future: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy('Authentication service is busy')
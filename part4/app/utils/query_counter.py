@@ -0,0 +1,69 @@
+"""
+SQL query counting helpers.
+
+Used to check that an endpoint or repository call issues a bounded number
+of SQL round-trips, e.g. that loading profiles really prevent N+1 queries:
+
+    with assert_max_queries(db.engine, 4):
+        client.get(f'/api/v1/places/{place_id}')
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """
+    Context manager recording the SQL statements executed on an engine.
+
+    Attributes:
+        statements (list): SQL strings executed while the context is active.
+    """
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine: SQLAlchemy engine to listen on.
+        """
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context,
+                executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'after_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.engine, 'after_cursor_execute', self._record)
+        return False
+
+    @property
+    def count(self):
+        """int: Number of statements executed so far."""
+        return len(self.statements)
+
+
+@contextmanager
+def assert_max_queries(engine, max_queries):
+    """
+    Fail if the wrapped block executes more than `max_queries` statements.
+
+    Args:
+        engine: SQLAlchemy engine to listen on.
+        max_queries (int): Allowed number of statements.
+
+    Raises:
+        AssertionError: Listing the executed statements when the budget
+            is exceeded.
+    """
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count > max_queries:
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {counter.count}:\n"
+            + "\n".join(counter.statements)
+        )
@@ -0,0 +1,67 @@
+"""
+JSON serialization of API responses.
+
+Flask-RESTX encodes responses with the standard library's json module.
+When orjson is installed (it is in requirements.txt), `output_json` is
+registered as the API's JSON representation instead: it encodes several
+times faster and handles datetime values natively. Environments without
+orjson fall back to the default encoder.
+Encoding time is reported as the `serialize` phase of request metrics.
+
+`dumps` and `loads` encode and decode single documents, e.g. the lines
+of streamed exports or of the in-memory store's operation log.
+"""
+
+import json
+from datetime import date
+
+from flask import make_response
+from flask_restx.representations import output_json as restx_output_json
+
+from app.utils.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # e.g. a platform without an orjson wheel
+    orjson = None
+
+
+def dumps(data):
+    """
+    Encode `data` as compact JSON.
+
+    Returns:
+        bytes: The encoded document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        data, separators=(',', ':'), default=_default
+    ).encode('utf-8')
+
+
+def loads(data):
+    """Decode a JSON document (bytes or str)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(value):
+    """Encode dates like orjson does."""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTX representation encoding responses with orjson."""
+    if orjson is None:
+        with timed('serialize'):
+            return restx_output_json(data, code, headers)
+    with timed('serialize'):
+        body = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    response = make_response(body, code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+API Benchmark Script
+
+Builds the application with `create_app`, seeds a dataset of the requested
+scale, then drives every route of the users, amenities, places, reviews
+and auth namespaces and reports, per route:
+- throughput (requests per second),
+- p50/p95/p99 latency,
+- SQL statements per request, read from the app's Server-Timing header
+  (for streamed exports, only those issued before the body is sent),
+- unexpected response statuses,
+and the peak RSS of the process.
+
+Requests go through the Flask test client, or with --http through a
+local threaded HTTP server loaded by --threads client threads (keep-alive
+connections). Data needed by a write (e.g. a review to delete) is created
+before its request starts, outside the measurement.
+
+Results can be saved as a JSON baseline and compared with a previous
+one; the script exits with status 1 when a route regressed beyond the
+threshold or answered with an unexpected status.
+
+Usage:
+    python benchmark.py --save benchmarks/baseline.json
+    python benchmark.py --baseline benchmarks/baseline.json --threshold 0.25
+    python benchmark.py --only places,reviews --http --threads 8
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import queue
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Settings read by config.py at import time; the benchmark does not need
+# per-statement logs
+os.environ.setdefault('SLOW_QUERY_MS', '-1')
+
+import config  # noqa: E402
+from app import create_app  # noqa: E402
+from app.services import facade  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+PASSWORD = 'password123'
+BULK_SIZE = 10
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+# --- setup ---
+
+def benchmark_config(args, database_uri):
+    """Build the config class of the benchmarked application."""
+    class BenchmarkConfig(config.Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+        REPOSITORY_TYPE = args.repository_type
+        MEMORY_STORE_PATH = None
+        # Seeded users are hashed at the minimum cost; login still pays
+        # for one bcrypt verification per request
+        BCRYPT_LOG_ROUNDS = 4
+        PASSWORD_HASH_MAX_PENDING = max(16, args.threads * 4)
+        METRICS_ENDPOINT_ENABLED = True
+        SERVER_TIMING_ENABLED = True
+        # Tokens never leave the process; a full-length key keeps PyJWT quiet
+        SECRET_KEY = os.urandom(32).hex()
+        BULK_MAX_ROWS = max(config.Config.BULK_MAX_ROWS, BULK_SIZE)
+    return BenchmarkConfig
+
+
+class Dataset:
+    """IDs of the seeded objects and the tokens of the benchmark users."""
+
+    def __init__(self):
+        self.users = []
+        self.amenities = []
+        self.places = []
+        self.reviews = []
+        self.admin_id = None
+        self.member_id = None
+        self.admin_token = None
+        self.member_token = None
+        # Objects owned by the write scenarios
+        self.member_review_id = None
+        self.bench_amenity_id = None
+        self.counter = 0
+        self._lock = threading.Lock()
+
+    def next_id(self):
+        """Return a number unique to this run, for unique names."""
+        with self._lock:
+            self.counter += 1
+            return self.counter
+
+
+def seed(app, args, rng):
+    """
+    Seed users, amenities, places and reviews through the bulk facade.
+
+    Place i is owned by user i % users; the reviewers of a place are the
+    following users, so (user, place) pairs are unique and nobody reviews
+    their own place.
+    """
+    data = Dataset()
+    chunk = app.config['BULK_CHUNK_SIZE']
+    with app.app_context():
+        admin = facade.create_user({
+            'first_name': 'Bench', 'last_name': 'Admin',
+            'email': 'bench.admin@example.com', 'password': PASSWORD,
+            'is_admin': True
+        })
+        member = facade.create_user({
+            'first_name': 'Bench', 'last_name': 'Member',
+            'email': 'bench.member@example.com', 'password': PASSWORD
+        })
+        data.admin_id, data.member_id = admin.id, member.id
+
+        data.users, _ = facade.create_users_bulk([
+            {'first_name': f'User{i}', 'last_name': 'Bench',
+             'email': f'user{i}@bench.example.com', 'password': PASSWORD}
+            for i in range(args.users)
+        ], chunk)
+        data.amenities, _ = facade.create_amenities_bulk([
+            {'name': f'Amenity {i}'} for i in range(args.amenities)
+        ], chunk)
+        data.places, _ = facade.create_places_bulk([
+            {'title': f'Place {i}',
+             'description': 'Seeded by benchmark.py',
+             'price': round(rng.uniform(20, 500), 2),
+             'latitude': rng.uniform(30.0, 50.0),
+             'longitude': rng.uniform(-120.0, -70.0),
+             'owner_id': data.users[i % len(data.users)],
+             'amenities': rng.sample(
+                 data.amenities, min(3, len(data.amenities))
+             )}
+            for i in range(args.places)
+        ], chunk)
+
+        reviews = []
+        for i in range(min(args.reviews,
+                           len(data.places) * (len(data.users) - 1))):
+            place = i % len(data.places)
+            reviewer = (place + 1 + i // len(data.places)) % len(data.users)
+            reviews.append({
+                'text': f'Review {i}', 'rating': rng.randint(1, 5),
+                'user_id': data.users[reviewer],
+                'place_id': data.places[place]
+            })
+        data.reviews, _ = facade.create_reviews_bulk(reviews, chunk)
+
+        # Targets of the update scenarios
+        own_place = facade.create_place(_place_payload(admin.id, 'Bench'))
+        data.member_review_id = facade.create_review({
+            'text': 'Bench review', 'rating': 3,
+            'user_id': member.id, 'place_id': own_place.id
+        }).id
+        data.bench_amenity_id = facade.create_amenity(
+            {'name': 'Bench amenity'}
+        ).id
+    return data
+
+
+def _place_payload(owner_id, title):
+    return {'title': title, 'price': 100.0, 'latitude': 40.0,
+            'longitude': -100.0, 'owner_id': owner_id, 'amenities': []}
+
+
+def login(client, email):
+    response = client.post('/api/v1/auth/login',
+                           json={'email': email, 'password': PASSWORD})
+    if response.status_code != 200:
+        raise RuntimeError(f'Cannot log in as {email}: {response.status_code}')
+    return response.get_json()['access_token']
+
+
+# --- scenarios ---
+
+class Scenario:
+    """
+    One benchmarked route.
+
+    Attributes:
+        name (str): Namespace-prefixed name, e.g. 'places.detail'.
+        method (str): HTTP method.
+        build (callable): `build(i)` returning (path, JSON body or None,
+            headers) of the i-th request; runs in an app context, outside
+            the measurement.
+        expected (tuple): Status codes counted as successes.
+    """
+
+    def __init__(self, name, method, build, expected=(200,)):
+        self.name = name
+        self.method = method
+        self.build = build
+        self.expected = expected
+
+
+def scenarios(app, data):
+    """Return the scenarios covering every route of the API."""
+    def auth(token):
+        return {'Authorization': f'Bearer {token}'}
+
+    admin = auth(data.admin_token)
+    member = auth(data.member_token)
+
+    def pick(ids, i):
+        return ids[i % len(ids)]
+
+    def get(path_of, headers=None):
+        return lambda i: (path_of(i), None, headers or {})
+
+    def new_place():
+        return facade.create_place(
+            _place_payload(data.admin_id, f'Scratch {data.next_id()}')
+        ).id
+
+    def revalidate(path):
+        response = app.test_client().get(path)
+        return {'If-None-Match': response.headers['ETag']}
+
+    def user_row():
+        n = data.next_id()
+        return {'first_name': 'New', 'last_name': 'User',
+                'email': f'new{n}@bench.example.com', 'password': PASSWORD}
+
+    def place_row():
+        return {'title': f'New place {data.next_id()}', 'price': 80.0,
+                'latitude': 41.0, 'longitude': -101.0}
+
+    def create_review(_):
+        return ('/api/v1/reviews/',
+                {'text': 'Benchmarked', 'rating': 4, 'place_id': new_place()},
+                member)
+
+    def bulk_reviews(_):
+        place_id = new_place()
+        return ('/api/v1/reviews/bulk', {'items': [
+            {'text': 'Bulk', 'rating': 4, 'user_id': user_id,
+             'place_id': place_id}
+            for user_id in data.users[:BULK_SIZE]
+        ]}, admin)
+
+    def delete_review(_):
+        review = facade.create_review({
+            'text': 'To delete', 'rating': 2,
+            'user_id': data.member_id, 'place_id': new_place()
+        })
+        return f'/api/v1/reviews/{review.id}', None, member
+
+    detail_path = f'/api/v1/places/{data.places[0]}'
+    return [
+        # users
+        Scenario('users.list', 'GET', get(lambda i: '/api/v1/users/')),
+        Scenario('users.get', 'GET', get(
+            lambda i: f'/api/v1/users/{pick(data.users, i)}')),
+        Scenario('users.create', 'POST', lambda i: (
+            '/api/v1/users/', user_row(), admin), expected=(201,)),
+        Scenario('users.bulk', 'POST', lambda i: (
+            '/api/v1/users/bulk',
+            {'items': [user_row() for _ in range(BULK_SIZE)]}, admin
+        ), expected=(201,)),
+        Scenario('users.update', 'PUT', lambda i: (
+            f'/api/v1/users/{data.member_id}', {'first_name': f'Member{i}'},
+            member)),
+        Scenario('users.export', 'GET', get(
+            lambda i: '/api/v1/users/export', admin)),
+        # amenities
+        Scenario('amenities.list', 'GET', get(lambda i: '/api/v1/amenities/')),
+        Scenario('amenities.get', 'GET', get(
+            lambda i: f'/api/v1/amenities/{pick(data.amenities, i)}')),
+        Scenario('amenities.create', 'POST', lambda i: (
+            '/api/v1/amenities/', {'name': f'New {data.next_id()}'}, admin
+        ), expected=(201,)),
+        Scenario('amenities.bulk', 'POST', lambda i: (
+            '/api/v1/amenities/bulk',
+            {'items': [{'name': f'New {data.next_id()}'}
+                       for _ in range(BULK_SIZE)]}, admin
+        ), expected=(201,)),
+        Scenario('amenities.update', 'PUT', lambda i: (
+            f'/api/v1/amenities/{data.bench_amenity_id}',
+            {'name': f'Bench {data.next_id()}'}, admin)),
+        # places
+        Scenario('places.list', 'GET', get(lambda i: '/api/v1/places/')),
+        Scenario('places.list_filtered', 'GET', get(
+            lambda i: '/api/v1/places/?sort=price_desc&min_price=100'
+                      f'&amenities={pick(data.amenities, i)}')),
+        Scenario('places.detail', 'GET', get(
+            lambda i: f'/api/v1/places/{pick(data.places, i)}')),
+        Scenario('places.detail_revalidate', 'GET', lambda i: (
+            detail_path, None, revalidate(detail_path)), expected=(304,)),
+        Scenario('places.reviews', 'GET', get(
+            lambda i: f'/api/v1/places/{pick(data.places, i)}/reviews')),
+        Scenario('places.nearby', 'GET', get(
+            lambda i: '/api/v1/places/nearby?lat=40&lon=-95&radius_km=200')),
+        Scenario('places.bbox', 'GET', get(
+            lambda i: '/api/v1/places/bbox?min_lat=38&min_lon=-100'
+                      '&max_lat=42&max_lon=-90')),
+        Scenario('places.create', 'POST', lambda i: (
+            '/api/v1/places/', place_row(), admin), expected=(201,)),
+        Scenario('places.bulk', 'POST', lambda i: (
+            '/api/v1/places/bulk',
+            {'items': [place_row() for _ in range(BULK_SIZE)]}, admin
+        ), expected=(201,)),
+        Scenario('places.bulk_update', 'PUT', lambda i: (
+            '/api/v1/places/bulk',
+            {'items': [{'id': pick(data.places, i * BULK_SIZE + k),
+                        'price': float(50 + i % 100)}
+                       for k in range(BULK_SIZE)]}, admin)),
+        Scenario('places.update', 'PUT', lambda i: (
+            f'/api/v1/places/{pick(data.places, i)}',
+            {'price': float(60 + i % 100)}, admin)),
+        # reviews
+        Scenario('reviews.list', 'GET', get(lambda i: '/api/v1/reviews/')),
+        Scenario('reviews.get', 'GET', get(
+            lambda i: f'/api/v1/reviews/{pick(data.reviews, i)}')),
+        Scenario('reviews.create', 'POST', create_review, expected=(201,)),
+        Scenario('reviews.bulk', 'POST', bulk_reviews, expected=(201,)),
+        Scenario('reviews.update', 'PUT', lambda i: (
+            f'/api/v1/reviews/{data.member_review_id}',
+            {'rating': 1 + i % 5}, member)),
+        Scenario('reviews.delete', 'DELETE', delete_review),
+        Scenario('reviews.export', 'GET', get(
+            lambda i: '/api/v1/reviews/export', admin)),
+        # auth
+        Scenario('auth.login', 'POST', lambda i: (
+            '/api/v1/auth/login',
+            {'email': 'bench.member@example.com', 'password': PASSWORD}, {})),
+        Scenario('auth.protected', 'GET', get(
+            lambda i: '/api/v1/auth/protected', member)),
+    ]
+
+
+# --- runners ---
+
+class Sample:
+    """Outcome of one request."""
+
+    __slots__ = ('seconds', 'status', 'statements')
+
+    def __init__(self, seconds, status, statements):
+        self.seconds = seconds
+        self.status = status
+        self.statements = statements
+
+
+def statement_count(server_timing):
+    """Read the SQL statement count from a Server-Timing header."""
+    match = _SERVER_TIMING_DB.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+def run_test_client(app, scenario, count):
+    """Send `count` requests through the Flask test client, one by one."""
+    client = app.test_client()
+    samples = []
+    started = time.perf_counter()
+    busy = 0.0
+    for i in range(count):
+        with app.app_context():
+            path, body, headers = scenario.build(i)
+        start = time.perf_counter()
+        response = client.open(path, method=scenario.method, json=body,
+                               headers=headers)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        busy += elapsed
+        samples.append(Sample(
+            elapsed, response.status_code,
+            statement_count(response.headers.get('Server-Timing'))
+        ))
+    # Sequential requests: throughput is bounded by the request time only
+    return samples, busy or (time.perf_counter() - started)
+
+
+def run_http(app, scenario, count, port, threads):
+    """Send `count` requests over HTTP from `threads` client threads."""
+    work = queue.Queue()
+    for i in range(count):
+        work.put(i)
+    samples = []
+    lock = threading.Lock()
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        try:
+            while True:
+                try:
+                    i = work.get_nowait()
+                except queue.Empty:
+                    return
+                with app.app_context():
+                    path, body, headers = scenario.build(i)
+                payload = None
+                headers = dict(headers)
+                if body is not None:
+                    payload = json.dumps(body)
+                    headers['Content-Type'] = 'application/json'
+                start = time.perf_counter()
+                connection.request(scenario.method, path, payload, headers)
+                response = connection.getresponse()
+                response.read()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    samples.append(Sample(
+                        elapsed, response.status,
+                        statement_count(response.getheader('Server-Timing'))
+                    ))
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return samples, time.perf_counter() - started
+
+
+def start_server(app):
+    """Serve `app` on a free local port from a background thread."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class KeepAliveHandler(WSGIRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True,
+                         request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- reporting ---
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(scenario, samples, elapsed):
+    latencies = sorted(sample.seconds * 1000 for sample in samples)
+    statements = [sample.statements for sample in samples
+                  if sample.statements is not None]
+    errors = {}
+    for sample in samples:
+        if sample.status not in scenario.expected:
+            errors[str(sample.status)] = errors.get(str(sample.status), 0) + 1
+    return {
+        'method': scenario.method,
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'sql_per_request': (round(sum(statements) / len(statements), 2)
+                            if statements else None),
+        'errors': errors,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def print_results(results):
+    print(f"{'scenario':<28}{'req':>6}{'rps':>10}{'p50 ms':>10}"
+          f"{'p95 ms':>10}{'p99 ms':>10}{'sql/req':>9}  errors")
+    for name, result in results.items():
+        sql = result['sql_per_request']
+        print(f"{name:<28}{result['requests']:>6}"
+              f"{result['throughput_rps']:>10.1f}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+              f"{'-' if sql is None else f'{sql:.1f}':>9}  "
+              f"{result['errors'] or ''}")
+
+
+def compare(report, baseline, threshold, min_delta_ms):
+    """
+    List the regressions of a report against a baseline.
+
+    A route regresses when its p95 latency grows by more than `threshold`
+    (relative) and `min_delta_ms` (absolute), its throughput drops by more
+    than `threshold`, or it issues more SQL statements per request.
+    """
+    regressions = []
+    for name, result in report['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        if result['p95_ms'] > previous['p95_ms'] * (1 + threshold) \
+                and result['p95_ms'] - previous['p95_ms'] > min_delta_ms:
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']:.2f} -> "
+                f"{result['p95_ms']:.2f} ms"
+            )
+        if previous['throughput_rps'] and result['throughput_rps'] \
+                < previous['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']:.1f} -> "
+                f"{result['throughput_rps']:.1f} req/s"
+            )
+        if previous['sql_per_request'] is not None \
+                and result['sql_per_request'] is not None \
+                and result['sql_per_request'] > previous['sql_per_request'] + 0.5:
+            regressions.append(
+                f"{name}: SQL statements per request "
+                f"{previous['sql_per_request']} -> {result['sql_per_request']}"
+            )
+    return regressions
+
+
+# --- main ---
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    scale = parser.add_argument_group('dataset')
+    scale.add_argument('--users', type=int, default=1000)
+    scale.add_argument('--places', type=int, default=1000)
+    scale.add_argument('--reviews', type=int, default=5000)
+    scale.add_argument('--amenities', type=int, default=50)
+    scale.add_argument('--seed', type=int, default=42,
+                       help='Random seed of the generated data')
+    run = parser.add_argument_group('run')
+    run.add_argument('--requests', type=int, default=200,
+                     help='Measured requests per route')
+    run.add_argument('--warmup', type=int, default=20,
+                     help='Unmeasured requests per route, sent first')
+    run.add_argument('--only', type=lambda v: [p for p in v.split(',') if p],
+                     default=[], help='Comma-separated scenario prefixes')
+    run.add_argument('--http', action='store_true',
+                     help='Load a local HTTP server instead of the test client')
+    run.add_argument('--threads', type=int, default=4,
+                     help='Client threads with --http')
+    run.add_argument('--repository-type', default='database',
+                     choices=('database', 'in_memory'))
+    run.add_argument('--database-url',
+                     help='Database to seed (default: a temporary SQLite file)')
+    output = parser.add_argument_group('baselines')
+    output.add_argument('--save', help='Write the results to this JSON file')
+    output.add_argument('--baseline', help='Compare with this JSON file')
+    output.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative regression (default 0.25)')
+    output.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='Ignore p95 increases smaller than this')
+    args = parser.parse_args(argv)
+    if min(args.users, args.places, args.amenities) < 1 \
+            or args.users < BULK_SIZE:
+        parser.error(f'--users must be at least {BULK_SIZE}, '
+                     '--places and --amenities at least 1')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+
+    workdir = tempfile.mkdtemp(prefix='hbnb-bench-')
+    database_uri = args.database_url or \
+        f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    app = create_app(benchmark_config(args, database_uri))
+
+    print(f"🌱 Seeding {args.users} users, {args.places} places, "
+          f"{args.reviews} reviews, {args.amenities} amenities...")
+    started = time.perf_counter()
+    data = seed(app, args, rng)
+    print(f"   done in {time.perf_counter() - started:.1f}s\n")
+
+    client = app.test_client()
+    data.admin_token = login(client, 'bench.admin@example.com')
+    data.member_token = login(client, 'bench.member@example.com')
+
+    selected = [
+        scenario for scenario in scenarios(app, data)
+        if not args.only or any(scenario.name.startswith(prefix)
+                                for prefix in args.only)
+    ]
+    server = start_server(app) if args.http else None
+    results = {}
+    try:
+        for scenario in selected:
+            if server is not None:
+                port = server.server_port
+                run_http(app, scenario, args.warmup, port, args.threads)
+                samples, elapsed = run_http(
+                    app, scenario, args.requests, port, args.threads
+                )
+            else:
+                run_test_client(app, scenario, args.warmup)
+                samples, elapsed = run_test_client(
+                    app, scenario, args.requests
+                )
+            results[scenario.name] = summarize(scenario, samples, elapsed)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mode': 'http' if args.http else 'test_client',
+            'threads': args.threads if args.http else 1,
+            'repository_type': args.repository_type,
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split(':')[0],
+            'scale': {'users': args.users, 'places': args.places,
+                      'reviews': args.reviews, 'amenities': args.amenities,
+                      'seed': args.seed},
+            'requests': args.requests,
+            'peak_rss_mb': peak_rss_mb(),
+        },
+        'scenarios': results,
+    }
+    print_results(results)
+    print(f"\nPeak RSS: {report['meta']['peak_rss_mb']} MiB")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f"💾 Results saved to {args.save}")
+
+    failed = [name for name, result in results.items() if result['errors']]
+    for name in failed:
+        print(f"❌ {name}: unexpected statuses {results[name]['errors']}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        for key in ('scale', 'mode', 'repository_type'):
+            if baseline['meta'].get(key) != report['meta'][key]:
+                print(f"⚠️  Baseline {key} differs: "
+                      f"{baseline['meta'].get(key)} vs {report['meta'][key]}")
+        regressions = compare(report, baseline, args.threshold,
+                              args.min_delta_ms)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        if not regressions:
+            print(f"✅ No regression beyond {args.threshold:.0%} "
+                  f"against {args.baseline}")
+        failed.extend(regressions)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
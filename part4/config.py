@@ -1,6 +1,17 @@
 import os
 
 
+def env_bool(name, default):
+    """Read a boolean flag from the environment ('1', 'true', 'yes')."""
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+def env_list(name):
+    """Read a comma-separated list from the environment."""
+    return [item.strip() for item in os.getenv(name, '').split(',')
+            if item.strip()]
+
+
 class Config:
     """Base configuration class with common settings."""
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
@@ -12,12 +23,91 @@ class Config:
     ADMIN_FIRST_NAME = os.getenv('ADMIN_FIRST_NAME', 'Admin')
     ADMIN_LAST_NAME = os.getenv('ADMIN_LAST_NAME', 'HBnB')
 
-    # Repository configuration
-    REPOSITORY_TYPE = os.getenv('REPOSITORY_TYPE', 'in_memory')  # or 'database'
+    # Repository configuration: 'database' (SQLAlchemy) or 'in_memory'
+    REPOSITORY_TYPE = os.getenv('REPOSITORY_TYPE', 'database')
+    # In-memory store: directory of its snapshot and operation log (unset:
+    # data is lost on restart), logged transactions between snapshots, and
+    # whether each commit is synced to disk rather than only flushed
+    MEMORY_STORE_PATH = os.getenv('MEMORY_STORE_PATH')
+    MEMORY_SNAPSHOT_EVERY = int(os.getenv('MEMORY_SNAPSHOT_EVERY', 10000))
+    MEMORY_FSYNC = env_bool('MEMORY_FSYNC', False)
+
+    # Pagination configuration (list endpoints)
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', 20))
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', 100))
+
+    # Reviews embedded in a place's detail view (the rest are paged
+    # through GET /api/v1/places/<id>/reviews)
+    PLACE_DETAIL_REVIEW_LIMIT = int(os.getenv('PLACE_DETAIL_REVIEW_LIMIT', 5))
+
+    # Bulk write configuration
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 10000))
+
+    # Streamed exports: rows fetched per database round-trip
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+
+    # Geo search configuration
+    GEO_MAX_RADIUS_KM = float(os.getenv('GEO_MAX_RADIUS_KM', 500))
+
+    # Read-through repository cache (places and amenities)
+    CACHE_ENABLED = env_bool('CACHE_ENABLED', False)
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    CACHE_TTL_SECONDS = float(os.getenv('CACHE_TTL_SECONDS', 30))
+    # Second-tier shared cache: None or 'local' (in-process stand-in)
+    CACHE_SHARED_BACKEND = os.getenv('CACHE_SHARED_BACKEND')
+
+    # Password hashing: bcrypt work factor and worker pool. Requests are
+    # rejected with 429 once WORKERS + MAX_PENDING hashes are in flight
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 5))
+
+    # Authorization snapshots of authenticated users, per access token
+    AUTH_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_CACHE_MAX_ENTRIES', 10000))
+    AUTH_CACHE_TTL_SECONDS = float(os.getenv('AUTH_CACHE_TTL_SECONDS', 60))
+
+    # Instrumentation: per-request SQL, bcrypt and serialization timings
+    # in a Server-Timing header, and Prometheus metrics at METRICS_PATH
+    # (served only with METRICS_ENDPOINT_ENABLED; measuring is always on)
+    METRICS_ENDPOINT_ENABLED = env_bool('METRICS_ENDPOINT_ENABLED', True)
+    METRICS_PATH = os.getenv('METRICS_PATH', '/metrics')
+    SERVER_TIMING_ENABLED = env_bool('SERVER_TIMING_ENABLED', True)
+    # SQL statements taking at least this long are logged to the
+    # hbnb.sql.slow logger (0: every statement, negative: none)
+    SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 200))
 
     # SQLAlchemy database configuration
+    # The URI comes from get_database_uri() unless a class sets it
+    SQLALCHEMY_DATABASE_URI = None
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
+    # Apply pending schema migrations when the app starts. Production runs
+    # migrate_database.py once per deploy instead, so several workers
+    # starting together do not race on the schema
+    AUTO_MIGRATE = env_bool('AUTO_MIGRATE', True)
+    # Read-only replicas (DATABASE_REPLICA_URLS, comma-separated). Reads
+    # go to a replica, except for REPLICA_STICKY_SECONDS after a client's
+    # own write (read-your-writes)
+    SQLALCHEMY_REPLICA_URIS = env_list('DATABASE_REPLICA_URLS')
+    REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', 5))
+    REPLICA_STICKY_COOKIE = 'hbnb_read_primary'
+
+    # Connection pool (server databases)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = env_bool('DB_POOL_PRE_PING', True)
+    # Per-statement timeout in milliseconds (0: none)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+
+    # SQLite connection pragmas
+    SQLITE_WAL = env_bool('SQLITE_WAL', True)
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
 
     @staticmethod
     def get_database_uri():
@@ -59,15 +149,21 @@ class Config:
 class DevelopmentConfig(Config):
     """Development-specific configuration."""
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = True  # Log SQL queries in development
+    # Echoing every statement is opt-in; slow ones are logged anyway
+    SQLALCHEMY_ECHO = env_bool('SQLALCHEMY_ECHO', False)
+
+    @staticmethod
+    def get_database_uri():
+        """Development database URI - DATABASE_URL or a local SQLite file."""
+        return os.getenv('DATABASE_URL', 'sqlite:///development.db')
 
 
 class TestConfig(Config):
     """Test-specific configuration."""
     TESTING = True
     SQLALCHEMY_ECHO = False
+    BCRYPT_LOG_ROUNDS = 4  # Fast hashing for tests
 
     @staticmethod
     def get_database_uri():
@@ -79,6 +175,20 @@ class ProductionConfig(Config):
     """Production-specific configuration."""
     DEBUG = False
     SQLALCHEMY_ECHO = False
+    AUTO_MIGRATE = env_bool('AUTO_MIGRATE', False)
+    # Timings reveal internals to clients, and /metrics is served without
+    # authentication: opt in only where METRICS_PATH is restricted to
+    # scrapers (at the proxy or on an internal bind). The slow-query log
+    # stays on either way
+    SERVER_TIMING_ENABLED = env_bool('SERVER_TIMING_ENABLED', False)
+    METRICS_ENDPOINT_ENABLED = env_bool('METRICS_ENDPOINT_ENABLED', False)
+
+    # Sized for several threads per worker; recycle before typical
+    # server-side idle timeouts and cap runaway queries
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 900))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
 
     @staticmethod
     def get_database_uri():
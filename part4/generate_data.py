@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+
+Fills an empty database with a production-sized dataset, to reproduce
+slow endpoints locally:
+- users, all sharing one password (hashed once, not once per user),
+- places clustered around real cities, with per-city lognormal prices
+  and a skewed number of places per owner,
+- amenities with realistic popularity, linked to places,
+- reviews with skewed ratings, and the matching place aggregates.
+
+The output only depends on the options: the same --seed and sizes
+produce the same rows and IDs, whatever the chunk size. Rows are built as
+raw column values and bulk-inserted in chunks through the facade
+`import_*` methods, skipping model construction and validation.
+
+An admin user is created as in seed_database.py, so the API can be used
+right away. Synthetic users log in as user<N>@example.com.
+
+Usage:
+    python generate_data.py --users 100000 --places 20000 --reviews 200000
+    python generate_data.py --users 2000000 --places 500000 \\
+        --reviews 5000000 --seed 7 --chunk-size 10000
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+# Read by config.py at import time: every multi-row INSERT would be
+# logged as a slow query
+os.environ.setdefault('SLOW_QUERY_MS', '-1')
+
+from app import create_app  # noqa: E402
+from app.extensions import password_hasher  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import facade  # noqa: E402
+from app.utils.geo import encode_geohash  # noqa: E402
+
+# Timestamps are spread over the years before this date; a fixed date
+# keeps the output reproducible
+DEFAULT_UNTIL = '2025-01-01'
+HISTORY_DAYS = 5 * 365
+
+# (city, latitude, longitude, spread in km, median price per night,
+# relative share of the places)
+CITIES = [
+    ('Paris', 48.8566, 2.3522, 8, 140, 10),
+    ('London', 51.5074, -0.1278, 12, 160, 10),
+    ('New York', 40.7128, -74.0060, 10, 210, 9),
+    ('Barcelona', 41.3874, 2.1686, 6, 110, 6),
+    ('Rome', 41.9028, 12.4964, 7, 105, 6),
+    ('Lisbon', 38.7223, -9.1393, 6, 90, 5),
+    ('Tokyo', 35.6762, 139.6503, 15, 120, 5),
+    ('Los Angeles', 34.0522, -118.2437, 25, 190, 5),
+    ('Amsterdam', 52.3676, 4.9041, 5, 170, 4),
+    ('Berlin', 52.5200, 13.4050, 10, 95, 4),
+    ('San Francisco', 37.7749, -122.4194, 8, 230, 3),
+    ('Miami', 25.7617, -80.1918, 15, 200, 3),
+    ('Mexico City', 19.4326, -99.1332, 12, 60, 3),
+    ('Bangkok', 13.7563, 100.5018, 14, 45, 3),
+    ('Sydney', -33.8688, 151.2093, 18, 150, 3),
+    ('Cape Town', -33.9249, 18.4241, 12, 80, 2),
+    ('Rio de Janeiro', -22.9068, -43.1729, 14, 70, 2),
+    ('Bali', -8.4095, 115.1889, 30, 65, 2),
+    ('Reykjavik', 64.1466, -21.9426, 6, 180, 1),
+    ('Honolulu', 21.3069, -157.8583, 10, 250, 1),
+]
+PRICE_SIGMA = 0.55
+MIN_PRICE = 15.0
+MAX_PRICE = 5000.0
+
+# (name, share of the places offering it)
+AMENITIES = [
+    ('WiFi', 0.92), ('Kitchen', 0.80), ('Heating', 0.75),
+    ('Washer', 0.60), ('Air Conditioning', 0.55), ('TV', 0.55),
+    ('Hair Dryer', 0.50), ('Iron', 0.45), ('Dedicated Workspace', 0.40),
+    ('Free Parking', 0.35), ('Dryer', 0.30), ('Coffee Maker', 0.30),
+    ('Dishwasher', 0.28), ('Balcony', 0.25), ('Elevator', 0.25),
+    ('Crib', 0.15), ('Pets Allowed', 0.15), ('Self Check-in', 0.35),
+    ('Gym', 0.10), ('Swimming Pool', 0.10), ('Hot Tub', 0.06),
+    ('EV Charger', 0.05), ('Fireplace', 0.08), ('BBQ Grill', 0.10),
+    ('Garden', 0.15), ('Sea View', 0.07), ('Sauna', 0.03),
+    ('Beach Access', 0.05), ('Ski-in/Ski-out', 0.01), ('Piano', 0.02),
+]
+# Popularity of amenities beyond the named ones
+EXTRA_AMENITY_SHARE = 0.02
+
+FIRST_NAMES = [
+    'Alice', 'Bob', 'Chloe', 'David', 'Emma', 'Farid', 'Grace', 'Hugo',
+    'Ines', 'Jack', 'Kenji', 'Laura', 'Mateo', 'Nina', 'Omar', 'Priya',
+    'Quentin', 'Rosa', 'Sam', 'Tara', 'Umar', 'Vera', 'Wei', 'Yara', 'Zoe',
+]
+LAST_NAMES = [
+    'Martin', 'Smith', 'Garcia', 'Muller', 'Rossi', 'Silva', 'Tanaka',
+    'Nguyen', 'Kowalski', 'Dubois', 'Johnson', 'Khan', 'Lopez', 'Novak',
+    'Okafor', 'Petrov', 'Santos', 'Schmidt', 'Takahashi', 'Williams',
+]
+PLACE_ADJECTIVES = [
+    'Cozy', 'Bright', 'Spacious', 'Charming', 'Modern', 'Quiet', 'Stylish',
+    'Sunny', 'Rustic', 'Elegant', 'Central', 'Hidden',
+]
+PLACE_KINDS = [
+    'Studio', 'Apartment', 'Loft', 'House', 'Villa', 'Room', 'Cottage',
+    'Penthouse', 'Townhouse', 'Bungalow',
+]
+PLACE_HIGHLIGHTS = [
+    'Walking distance to the main sights.',
+    'Close to public transport.',
+    'Fully equipped for long stays.',
+    'Great for families and groups.',
+    'Perfect for a weekend getaway.',
+    'Quiet neighbourhood with shops nearby.',
+]
+# Rating 1 to 5 weights: most stays are rated well
+RATING_WEIGHTS = [4, 6, 15, 35, 40]
+REVIEW_TEXTS = {
+    1: ['Very disappointing stay.', 'Nothing like the pictures.'],
+    2: ['Below expectations.', 'Noisy and not very clean.'],
+    3: ['Decent place for the price.', 'Okay, but could be better.'],
+    4: ['Nice place, good host.', 'Comfortable and well located.'],
+    5: ['Wonderful stay, highly recommended!', 'Perfect in every way.'],
+}
+
+
+def synthetic_id(seed, kind, index):
+    """
+    Derive a stable UUID4 string from the seed, the entity kind and an index.
+
+    IDs can be recomputed instead of kept in memory, which lets places
+    reference owners and reviews reference users by index only.
+    """
+    digest = hashlib.blake2b(
+        f'{seed}:{kind}:{index}'.encode(), digest_size=16
+    ).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+class SyntheticDataset:
+    """
+    Deterministic row generator.
+
+    Each entity draws from its own random stream, so changing the number
+    of reviews does not change the places, and so on.
+    """
+
+    def __init__(self, seed, users, places, reviews, amenities,
+                 password_hash, until):
+        self.seed = seed
+        self.users = users
+        self.places = places
+        self.reviews = reviews
+        self.amenities = amenities
+        self.password_hash = password_hash
+        self.until = until
+        self.start = until - timedelta(days=HISTORY_DAYS)
+        self.review_count = 0
+        self.link_count = 0
+
+        self._amenity_shares = [
+            AMENITIES[i][1] if i < len(AMENITIES) else EXTRA_AMENITY_SHARE
+            for i in range(amenities)
+        ]
+        self._amenity_ids = [
+            synthetic_id(seed, 'amenity', i) for i in range(amenities)
+        ]
+        self._city_weights = list(accumulate(city[5] for city in CITIES))
+
+    def _random(self, stream):
+        return random.Random(f'{self.seed}:{stream}')
+
+    def _timestamp(self, rng, after=None):
+        start = after or self.start
+        span = (self.until - start).total_seconds()
+        return start + timedelta(seconds=rng.random() * span)
+
+    def user_rows(self):
+        """Yield user rows; user 0 .. users-1."""
+        rng = self._random('users')
+        for i in range(self.users):
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            email = f'user{i}@example.com'
+            created_at = self._timestamp(rng)
+            yield {
+                'id': synthetic_id(self.seed, 'user', i),
+                'first_name': first_name,
+                'last_name': last_name,
+                'email': email,
+                'email_normalized': User.normalize_email(email),
+                'password': self.password_hash,
+                'is_admin': False,
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    def amenity_rows(self):
+        """Yield amenity rows, the most common amenities first."""
+        for i, amenity_id in enumerate(self._amenity_ids):
+            name = AMENITIES[i][0] if i < len(AMENITIES) else f'Amenity {i}'
+            yield {
+                'id': amenity_id, 'name': name,
+                'created_at': self.start, 'updated_at': self.start,
+            }
+
+    def place_batches(self, batch_size):
+        """
+        Yield (place rows, review rows) for consecutive batches of places.
+
+        Reviews are generated with their place, so the place aggregates
+        (review_count, rating_sum, avg_rating) are known when it is
+        inserted. The number of reviews per place is skewed (most places
+        have a few, some have many) and adapts to hit --reviews as closely
+        as the number of users allows.
+        """
+        place_rng = self._random('places')
+        review_rng = self._random('reviews')
+        reviews_left = self.reviews if self.users > 1 else 0
+        batch_places, batch_reviews = [], []
+        for i in range(self.places):
+            place, owner = self._place_row(place_rng, i)
+            expected = reviews_left / (self.places - i)
+            count = 0
+            if i == self.places - 1:
+                count = min(reviews_left, self.users - 1)
+            elif expected > 0:
+                count = min(round(review_rng.expovariate(1 / expected)),
+                            reviews_left, self.users - 1)
+            reviews_left -= count
+            batch_reviews.extend(
+                self._review_rows(review_rng, place, owner, count)
+            )
+            batch_places.append(place)
+            if len(batch_places) >= batch_size:
+                yield batch_places, batch_reviews
+                batch_places, batch_reviews = [], []
+        if batch_places:
+            yield batch_places, batch_reviews
+
+    def _place_row(self, rng, i):
+        city, latitude, longitude, spread_km, median, _ = rng.choices(
+            CITIES, cum_weights=self._city_weights
+        )[0]
+        latitude = max(-89.9, min(89.9,
+                                  latitude + rng.gauss(0, spread_km / 111.0)))
+        longitude += rng.gauss(
+            0, spread_km / (111.0 * math.cos(math.radians(latitude)))
+        )
+        longitude = (longitude + 180.0) % 360.0 - 180.0
+        price = median * math.exp(rng.gauss(0, PRICE_SIGMA))
+        price = round(max(MIN_PRICE, min(MAX_PRICE, price)), 2)
+
+        # A few hosts own many places
+        owner = int(self.users * rng.random() ** 3)
+        amenities = [
+            amenity_id for amenity_id, share
+            in zip(self._amenity_ids, self._amenity_shares)
+            if rng.random() < share
+        ]
+        self.link_count += len(amenities)
+        kind = rng.choice(PLACE_KINDS)
+        created_at = self._timestamp(rng)
+        return {
+            'id': synthetic_id(self.seed, 'place', i),
+            'title': f'{rng.choice(PLACE_ADJECTIVES)} {kind} in {city}',
+            'description': f'{kind} in {city}. '
+                           f'{rng.choice(PLACE_HIGHLIGHTS)}',
+            'price': price,
+            'latitude': latitude,
+            'longitude': longitude,
+            'geohash': encode_geohash(latitude, longitude),
+            'owner_id': synthetic_id(self.seed, 'user', owner),
+            'review_count': 0,
+            'rating_sum': 0,
+            'avg_rating': 0.0,
+            'created_at': created_at,
+            'updated_at': created_at,
+            'amenities_rel': amenities,
+        }, owner
+
+    def _review_rows(self, rng, place, owner, count):
+        if not count:
+            return []
+        # One more than needed, in case the owner is drawn
+        reviewers = [
+            user for user in rng.sample(range(self.users), count + 1)
+            if user != owner
+        ][:count]
+        rows = []
+        rating_sum = 0
+        for user in reviewers:
+            rating = rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0]
+            rating_sum += rating
+            created_at = self._timestamp(rng, after=place['created_at'])
+            rows.append({
+                'id': synthetic_id(self.seed, 'review', self.review_count),
+                'text': rng.choice(REVIEW_TEXTS[rating]),
+                'rating': rating,
+                'user_id': synthetic_id(self.seed, 'user', user),
+                'place_id': place['id'],
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+            self.review_count += 1
+        place['review_count'] = count
+        place['rating_sum'] = rating_sum
+        place['avg_rating'] = round(rating_sum / count, 2)
+        return rows
+
+
+class Progress:
+    """Rows inserted and elapsed time of one table."""
+
+    def __init__(self, label):
+        self.label = label
+        self.rows = 0
+        self.seconds = 0.0
+
+    def insert(self, import_rows, rows, chunk_size):
+        start = time.perf_counter()
+        self.rows += import_rows(rows, chunk_size)
+        self.seconds += time.perf_counter() - start
+
+    def report(self):
+        print(f"   ✓ {self.label}: {self.rows:,} rows in "
+              f"{self.seconds:.1f}s ({_rate(self.rows, self.seconds)})")
+
+
+def _rate(rows, seconds):
+    return f"{rows / seconds:,.0f} rows/s" if seconds > 0 else "n/a"
+
+
+def generate_data(args):
+    """Create the admin user, then generate and insert the dataset."""
+    app = create_app()
+
+    with app.app_context():
+        # Synthetic IDs would collide with a previous run
+        existing = facade.get_users_version()[1]
+        if existing:
+            print("⚠️  Database already contains data. Aborting.")
+            print(f"   Found {existing} users in database.")
+            return 1
+
+        print(f"🌱 Generating {args.users:,} users, {args.places:,} places, "
+              f"{args.reviews:,} reviews and {args.amenities} amenities "
+              f"(seed {args.seed})...\n")
+
+        admin_data = {
+            'first_name': app.config.get('ADMIN_FIRST_NAME', 'Admin'),
+            'last_name': app.config.get('ADMIN_LAST_NAME', 'HBnB'),
+            'email': app.config.get('ADMIN_EMAIL', 'admin@hbnb.io'),
+            'password': app.config.get('ADMIN_PASSWORD', 'admin1234'),
+            'is_admin': True
+        }
+        facade.create_user(admin_data)
+        print(f"👤 Admin: {admin_data['email']}")
+
+        dataset = SyntheticDataset(
+            args.seed, args.users, args.places, args.reviews, args.amenities,
+            password_hasher.hash(args.password),
+            datetime.fromisoformat(args.until)
+        )
+        started = time.perf_counter()
+
+        print("\n👥 Inserting users...")
+        users = Progress('users')
+        users.insert(facade.import_users, dataset.user_rows(), args.chunk_size)
+        users.report()
+
+        print("\n🏠 Inserting amenities...")
+        amenities = Progress('amenities')
+        amenities.insert(facade.import_amenities, dataset.amenity_rows(),
+                         args.chunk_size)
+        amenities.report()
+
+        print("\n🏡 Inserting places, amenity links and reviews...")
+        places = Progress('places')
+        reviews = Progress('reviews')
+        for batch, (place_rows, review_rows) in enumerate(
+                dataset.place_batches(args.chunk_size), 1):
+            places.insert(facade.import_places, place_rows, args.chunk_size)
+            reviews.insert(facade.import_reviews, review_rows,
+                           args.chunk_size)
+            if batch % 10 == 0:
+                print(f"   … {places.rows:,} places, {reviews.rows:,} reviews")
+        places.report()
+        print(f"   ✓ amenity links: {dataset.link_count:,} rows "
+              f"(inserted with the places)")
+        reviews.report()
+
+        # In-memory backend: compact the log, so the next start loads one
+        # snapshot instead of replaying every chunk
+        if facade.store is not None:
+            facade.store.snapshot()
+            facade.store.close()
+
+        elapsed = time.perf_counter() - started
+        total = (users.rows + amenities.rows + places.rows
+                 + dataset.link_count + reviews.rows)
+        print("\n" + "="*60)
+        print("✅ Data generation complete!")
+        print("="*60)
+        print(f"📊 {total:,} rows in {elapsed:.1f}s "
+              f"({_rate(total, elapsed)})")
+        print("="*60)
+        print(f"\n🔑 Login credentials:")
+        print(f"   Admin: {admin_data['email']} / {admin_data['password']}")
+        if args.users:
+            print(f"   Users: user0@example.com .. "
+                  f"user{args.users - 1}@example.com / {args.password}")
+        print("="*60 + "\n")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--places', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=20000,
+                        help='target number of reviews; fewer are created '
+                             'when there are not enough users')
+    parser.add_argument('--amenities', type=int, default=len(AMENITIES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                        help='rows per INSERT transaction')
+    parser.add_argument('--password', default='password123',
+                        help='password of every synthetic user')
+    parser.add_argument('--until', default=DEFAULT_UNTIL,
+                        help='latest timestamp of the generated rows '
+                             '(ISO date)')
+    args = parser.parse_args(argv)
+    if args.places and not args.users:
+        parser.error('places need at least one user as owner')
+    if min(args.users, args.places, args.reviews, args.amenities) < 0:
+        parser.error('sizes cannot be negative')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be positive')
+    return args
+
+
+if __name__ == '__main__':
+    raise SystemExit(generate_data(parse_args()))
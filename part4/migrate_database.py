@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script
+
+Applies pending schema migrations (see app/persistence/migrations.py) to
+the database of the configured environment. Run it once per deploy when
+AUTO_MIGRATE is disabled, as it is in production.
+
+Usage:
+    python migrate_database.py             # apply every pending migration
+    python migrate_database.py <version>   # apply migrations up to <version>
+    python migrate_database.py --status    # list pending migrations
+"""
+
+import os
+import sys
+
+# Migrations are applied explicitly below, not while creating the app
+os.environ['AUTO_MIGRATE'] = 'false'
+
+from app import create_app, db  # noqa: E402
+from app import models  # noqa: E402,F401
+from app.persistence.migrations import migrate, pending_migrations  # noqa: E402
+
+
+def migrate_database(argument=None):
+    """
+    Apply or list pending migrations.
+
+    Args:
+        argument (str, optional): Target version, or '--status'.
+    """
+    app = create_app()
+
+    with app.app_context():
+        if argument == '--status':
+            pending = pending_migrations(db.engine)
+            if not pending:
+                print("✅ Database schema is up to date.")
+            for migration in pending:
+                print(f"   pending {migration.version}: {migration.description}")
+            return
+
+        target = int(argument) if argument else None
+        print("🔧 Applying schema migrations...")
+        applied = migrate(db.engine, db.metadata, target)
+        for migration in applied:
+            print(f"   ✓ {migration.version}: {migration.description}")
+        print(f"✅ {len(applied)} migration(s) applied.")
+
+
+if __name__ == '__main__':
+    migrate_database(sys.argv[1] if len(sys.argv) > 1 else None)
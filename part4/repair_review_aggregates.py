@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Review Aggregates Repair Script
+
+Places store denormalized review aggregates (review_count, rating_sum,
+avg_rating) that are updated incrementally on every review write. This
+script rebuilds them from the reviews table, to repair drift caused by
+manual database edits or imports that bypassed the facade.
+
+Usage:
+    python repair_review_aggregates.py              # every place
+    python repair_review_aggregates.py <place_id>   # a single place
+"""
+
+import sys
+
+from app import create_app
+from app.services import facade
+
+
+def repair_review_aggregates(place_id=None):
+    """
+    Recompute review aggregates for one place or for all places.
+
+    Args:
+        place_id (str, optional): ID of the place to repair.
+    """
+    app = create_app()
+
+    with app.app_context():
+        target = f"place {place_id}" if place_id else "all places"
+        print(f"🔧 Recomputing review aggregates for {target}...")
+        updated = facade.recompute_review_aggregates(
+            [place_id] if place_id else None
+        )
+        print(f"✅ {updated} place(s) updated.")
+
+
+if __name__ == '__main__':
+    repair_review_aggregates(sys.argv[1] if len(sys.argv) > 1 else None)
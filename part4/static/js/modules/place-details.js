@@ -67,7 +67,7 @@ async function fetchPlaceDetails(placeId) {
 
         const place = await response.json();
         displayPlaceDetails(place, placeDetailsContainer);
-        displayReviews(place.reviews || [], reviewsContainer);
+        displayReviews(place.reviews || [], place.reviews_next_cursor, placeId, reviewsContainer);
 
     } catch (error) {
         console.error('Error fetching place details:', error);
@@ -100,8 +100,10 @@ function displayPlaceDetails(place, container) {
 
 /**
  * Display reviews
+ * The place detail embeds the latest reviews only; while nextCursor is
+ * set, a "load more" button appends the next page of the review feed.
  */
-function displayReviews(reviews, container) {
+function displayReviews(reviews, nextCursor, placeId, container) {
     if (!container) return;
 
     container.innerHTML = '<h2>Reviews</h2>';
@@ -113,18 +115,52 @@ function displayReviews(reviews, container) {
 
     const reviewsList = document.createElement('div');
     reviewsList.className = 'reviews-list';
+    reviews.forEach(review => reviewsList.appendChild(createReviewCard(review)));
+    container.appendChild(reviewsList);
 
-    reviews.forEach(review => {
-        const reviewCard = document.createElement('div');
-        reviewCard.className = 'review-card';
-        reviewCard.innerHTML = `
-            <div class="review-header">
-                <p><strong>Rating:</strong> <span class="rating-stars">${'★'.repeat(review.rating || 0)}</span></p>
-            </div>
-            <p class="review-text">${escapeHtml(review.text || '')}</p>
-        `;
-        reviewsList.appendChild(reviewCard);
+    if (!nextCursor) return;
+
+    const loadMoreButton = document.createElement('button');
+    loadMoreButton.type = 'button';
+    loadMoreButton.className = 'button button-outline load-more-reviews';
+    loadMoreButton.textContent = 'Load more reviews';
+    container.appendChild(loadMoreButton);
+
+    let cursor = nextCursor;
+    loadMoreButton.addEventListener('click', async () => {
+        loadMoreButton.disabled = true;
+        try {
+            const response = await apiGet(
+                `/places/${placeId}/reviews?cursor=${encodeURIComponent(cursor)}`
+            );
+            if (!response.ok) {
+                throw new Error(`Failed to load reviews: ${response.status}`);
+            }
+            const page = await response.json();
+            page.reviews.forEach(review => reviewsList.appendChild(createReviewCard(review)));
+            cursor = page.next_cursor;
+            if (!cursor) {
+                loadMoreButton.remove();
+            }
+        } catch (error) {
+            console.error('Error fetching reviews:', error);
+        } finally {
+            loadMoreButton.disabled = false;
+        }
     });
+}
 
-    container.appendChild(reviewsList);
+/**
+ * Build the card of one review
+ */
+function createReviewCard(review) {
+    const reviewCard = document.createElement('div');
+    reviewCard.className = 'review-card';
+    reviewCard.innerHTML = `
+        <div class="review-header">
+            <p><strong>Rating:</strong> <span class="rating-stars">${'★'.repeat(review.rating || 0)}</span></p>
+        </div>
+        <p class="review-text">${escapeHtml(review.text || '')}</p>
+    `;
+    return reviewCard;
 }
@@ -7,8 +7,9 @@ import { apiGet } from '../utils/api.js';
 import { updateLoginLink } from '../utils/auth.js';
 import { escapeHtml } from '../utils/dom.js';
 
-// Store all places globally for filtering
-let allPlaces = [];
+// Current server-side query state
+let currentFilter = '';
+let nextCursor = null;
 
 /**
  * Initialize places/index page
@@ -16,14 +17,34 @@ let allPlaces = [];
 export function initIndexPage() {
     console.log('Initializing index page...');
     updateLoginLink();
-    fetchPlaces();
+    populatePriceFilter();
     setupPriceFilter();
+    setupLoadMore();
+    fetchPlaces();
+}
+
+/**
+ * Build the places query string for the current filter and cursor
+ */
+function buildPlacesQuery(filterValue, cursor) {
+    const params = new URLSearchParams();
+    if (filterValue) {
+        const [minPrice, maxPrice] = filterValue.split('-');
+        params.set('min_price', minPrice);
+        params.set('max_price', maxPrice);
+    }
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    const query = params.toString();
+    return query ? `?${query}` : '';
 }
 
 /**
- * Fetch all places from API and display them
+ * Fetch one page of places from the API and display it
+ * Filtering is done by the server; pages are appended when a cursor is given
  */
-async function fetchPlaces() {
+async function fetchPlaces(cursor = null) {
     const placesContainer = document.getElementById('places-list');
     if (!placesContainer) {
         console.error('Places container not found');
@@ -31,16 +52,16 @@ async function fetchPlaces() {
     }
 
     try {
-        const response = await apiGet('/places');
+        const response = await apiGet(`/places/${buildPlacesQuery(currentFilter, cursor)}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
 
-        const places = await response.json();
-        console.log('Fetched places:', places);
-        allPlaces = places;
-        displayPlaces(places);
-        populatePriceFilter(places);
+        const page = await response.json();
+        console.log('Fetched places:', page.places);
+        displayPlaces(page.places, Boolean(cursor));
+        nextCursor = page.next_cursor;
+        updateLoadMore();
     } catch (error) {
         console.error('Error fetching places:', error);
         placesContainer.innerHTML = '<p class="error">Failed to load places. Please try again later.</p>';
@@ -50,16 +71,18 @@ async function fetchPlaces() {
 /**
  * Display places in the places container
  */
-function displayPlaces(places) {
+function displayPlaces(places, append = false) {
     const placesContainer = document.getElementById('places-list');
     if (!placesContainer) return;
 
-    if (!places || places.length === 0) {
+    if (!append && (!places || places.length === 0)) {
         placesContainer.innerHTML = '<p>No places available.</p>';
         return;
     }
 
-    placesContainer.innerHTML = '';
+    if (!append) {
+        placesContainer.innerHTML = '';
+    }
     places.forEach(place => {
         const placeCard = createPlaceCard(place);
         placesContainer.appendChild(placeCard);
@@ -92,7 +115,7 @@ function createPlaceCard(place) {
 /**
  * Populate price filter dropdown
  */
-function populatePriceFilter(places) {
+function populatePriceFilter() {
     const priceFilter = document.getElementById('price-filter');
     if (!priceFilter) return;
 
@@ -128,23 +151,33 @@ function setupPriceFilter() {
 
 /**
  * Filter places by price range
+ * Restarts the listing from the first page with the new server-side filter
  */
 function filterPlacesByPrice(filterValue) {
-    if (!allPlaces || allPlaces.length === 0) {
-        console.error('No places data available for filtering');
-        return;
-    }
+    currentFilter = filterValue;
+    fetchPlaces();
+}
 
-    let filteredPlaces = allPlaces;
+/**
+ * Set up "Load more" button event listener
+ */
+function setupLoadMore() {
+    const loadMore = document.getElementById('load-more');
+    if (!loadMore) return;
 
-    if (filterValue) {
-        const [minPrice, maxPrice] = filterValue.split('-').map(Number);
-        filteredPlaces = allPlaces.filter(place => {
-            const price = place.price || 0;
-            return price >= minPrice && price <= maxPrice;
-        });
-    }
+    loadMore.addEventListener('click', () => {
+        if (nextCursor) {
+            fetchPlaces(nextCursor);
+        }
+    });
+}
+
+/**
+ * Show the "Load more" button only when another page is available
+ */
+function updateLoadMore() {
+    const loadMore = document.getElementById('load-more');
+    if (!loadMore) return;
 
-    console.log(`Filtered to ${filteredPlaces.length} places`);
-    displayPlaces(filteredPlaces);
+    loadMore.hidden = !nextCursor;
 }
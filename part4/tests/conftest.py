@@ -0,0 +1,24 @@
+"""
+Shared pytest fixtures.
+
+Run from part4/ with `python -m pytest`. Each test gets a fresh
+application on TestConfig (in-memory SQLite, fast bcrypt).
+"""
+
+import pytest
+
+from app import create_app, db
+
+
+@pytest.fixture
+def app(request):
+    # Tests may pass another config class with indirect parametrization
+    app = create_app(getattr(request, 'param', 'config.TestConfig'))
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
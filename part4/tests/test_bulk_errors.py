@@ -0,0 +1,79 @@
+"""Per-row errors of the bulk writes use fixed messages."""
+
+from app import db
+from app.services import facade
+from app.utils.query_counter import QueryCounter
+
+USER = {'first_name': 'Ada', 'last_name': 'Test', 'password': 'password123'}
+
+
+def test_bulk_create_rejects_unknown_and_missing_fields(app):
+    created, errors = facade.create_users_bulk([
+        dict(USER, email='ada@example.com'),
+        dict(USER, email='bob@example.com', nickname='bob'),
+        {'first_name': 'Cy', 'last_name': 'Test', 'email': 'cy@example.com'},
+        'not an object',
+    ])
+    assert len(created) == 1
+    assert errors == [
+        {'index': 1, 'error': 'Unknown field: nickname'},
+        {'index': 2, 'error': 'Missing field: password'},
+        {'index': 3, 'error': 'Row must be an object'},
+    ]
+
+
+def test_bulk_create_hides_database_errors(app):
+    created, errors = facade.create_users_bulk([
+        dict(USER, email='ada@example.com'),
+        dict(USER, email='ADA@example.com'),
+    ])
+    assert len(created) == 1
+    assert errors == [{'index': 1, 'error': 'Conflicts with an existing row'}]
+
+
+def test_bulk_create_hides_type_errors(app):
+    amenity = facade.create_amenity({'name': 'WiFi'})
+    owner = facade.create_user(dict(USER, email='ada@example.com'))
+    _, errors = facade.create_places_bulk([{
+        'title': 'Loft', 'price': 'cheap', 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': [amenity.id]
+    }])
+    assert errors == [{'index': 0, 'error': 'Invalid field type'}]
+
+
+def test_bulk_update_rejects_unknown_fields(app):
+    owner = facade.create_user(dict(USER, email='ada@example.com'))
+    place = facade.create_place({
+        'title': 'Loft', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': []
+    })
+    updated, errors = facade.update_places_bulk([
+        {'id': place.id, 'price': 90.0},
+        {'id': place.id, '_avg_rating': 5.0},
+        {'id': place.id, 'price': 'free'},
+    ])
+    assert updated == [place.id]
+    assert errors == [
+        {'index': 1, 'error': 'Unknown field: _avg_rating'},
+        {'index': 2, 'error': 'Invalid field type'},
+    ]
+
+
+def test_bulk_place_create_uses_the_prefetched_amenities(app):
+    amenity_ids = [facade.create_amenity({'name': f'Amenity {i}'}).id
+                   for i in range(3)]
+    owner = facade.create_user(dict(USER, email='ada@example.com'))
+    rows = [{
+        'title': f'Place {i}', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': amenity_ids
+    } for i in range(10)]
+    db.session.expunge_all()
+    with QueryCounter(db.engine) as counter:
+        created, errors = facade.create_places_bulk(rows)
+    assert errors == [] and len(created) == 10
+    # The owner and amenity prefetches only, no lookup per row
+    selects = [statement for statement in counter.statements
+               if statement.lstrip().upper().startswith('SELECT')]
+    assert len(selects) <= 2
+    place = facade.get_place_details(created[-1])
+    assert sorted(a.id for a in place.amenities_rel) == sorted(amenity_ids)
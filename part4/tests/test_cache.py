@@ -0,0 +1,36 @@
+"""Repository cache behaviour."""
+
+import pytest
+from sqlalchemy import inspect
+
+from app import db
+from app.services import facade
+from config import TestConfig
+
+
+class CachedTestConfig(TestConfig):
+    CACHE_ENABLED = True
+
+
+@pytest.mark.parametrize('app', [CachedTestConfig], indirect=True)
+def test_cached_get_keeps_the_loading_profile(app):
+    owner = facade.create_user({
+        'first_name': 'Owner', 'last_name': 'Test',
+        'email': 'owner@example.com', 'password': 'password123'
+    })
+    place_id = facade.create_place({
+        'title': 'Loft', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': []
+    }).id
+
+    # The first plain get fills the cache; the detail view must still
+    # load its relationships eagerly instead of reading the entry
+    for _ in range(2):
+        db.session.expunge_all()
+        assert facade.get_place(place_id) is not None
+        db.session.expunge_all()
+        place = facade.get_place_details(place_id)
+        unloaded = inspect(place).unloaded
+        assert 'owner' not in unloaded
+        assert 'amenities_rel' not in unloaded
+    assert facade.place_repo.stats()['hits'] >= 1
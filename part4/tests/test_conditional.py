@@ -0,0 +1,40 @@
+"""Conditional GET validators."""
+
+from app.services import facade
+
+USER = {'first_name': 'Ada', 'last_name': 'Test', 'password': 'password123'}
+
+
+def test_collections_revalidate_with_the_etag_only(client):
+    amenity = facade.create_amenity({'name': 'WiFi'})
+    response = client.get('/api/v1/amenities/')
+    assert 'Last-Modified' not in response.headers
+    assert client.get('/api/v1/amenities/', headers={
+        'If-None-Match': response.headers['ETag']
+    }).status_code == 304
+
+    response = client.get(f'/api/v1/amenities/{amenity.id}')
+    assert client.get(f'/api/v1/amenities/{amenity.id}', headers={
+        'If-Modified-Since': response.headers['Last-Modified']
+    }).status_code == 304
+
+
+def test_deleted_review_changes_the_place_validators(client):
+    owner = facade.create_user(dict(USER, email='owner@example.com'))
+    reviewer = facade.create_user(dict(USER, email='reviewer@example.com'))
+    place = facade.create_place({
+        'title': 'Loft', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': []
+    })
+    review = facade.create_review({
+        'text': 'Great stay', 'rating': 4,
+        'user_id': reviewer.id, 'place_id': place.id
+    })
+    urls = [f'/api/v1/places/{place.id}', f'/api/v1/places/{place.id}/reviews']
+    etags = {url: client.get(url).headers['ETag'] for url in urls}
+
+    facade.delete_review(review.id)
+    for url in urls:
+        response = client.get(url, headers={'If-None-Match': etags[url]})
+        assert response.status_code == 200
+        assert 'Last-Modified' not in response.headers
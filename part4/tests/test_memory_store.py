@@ -0,0 +1,157 @@
+"""In-memory backend: persistence, rollback of failed writes and locking."""
+
+import os
+
+import pytest
+from flask import current_app
+
+from app import create_app
+from app.persistence.memory_store import LOG_FILE, SNAPSHOT_FILE
+from app.persistence.repository import DuplicateKeyError
+from app.services import facade
+from config import TestConfig
+
+USER = {'first_name': 'Ada', 'last_name': 'Test', 'password': 'password123'}
+
+
+class MemoryTestConfig(TestConfig):
+    REPOSITORY_TYPE = 'in_memory'
+    MEMORY_STORE_PATH = None
+
+
+@pytest.mark.parametrize('app', [MemoryTestConfig], indirect=True)
+def test_passwords_are_hashed_outside_the_store_lock(app, monkeypatch):
+    user = facade.create_user(dict(USER, email='ada@example.com'))
+    hasher = current_app.extensions['password_hasher']
+    hash_password = hasher.hash
+    locked = []
+
+    def hash_and_check(password):
+        locked.append(facade.store.lock._is_owned())
+        return hash_password(password)
+
+    monkeypatch.setattr(hasher, 'hash', hash_and_check)
+    facade.update_user(user.id, {'password': 'new-password'})
+    # A work factor change makes the next login rehash
+    monkeypatch.setattr(hasher, 'rounds', hasher.rounds + 1)
+    assert facade.authenticate_user('ada@example.com', 'new-password')
+    assert locked == [False, False]
+    assert facade.get_user(user.id).verify_password('new-password')
+
+
+def _open_store(path, **settings):
+    """Start an application on the store at `path`, as a restart would."""
+    config = type('StoreConfig', (MemoryTestConfig,),
+                  dict(MEMORY_STORE_PATH=str(path), **settings))
+    return create_app(config).app_context()
+
+
+def _seed():
+    """A user owning a place with an amenity, reviewed by another user."""
+    owner = facade.create_user(dict(USER, email='owner@example.com'))
+    reviewer = facade.create_user(dict(USER, email='reviewer@example.com'))
+    amenity = facade.create_amenity({'name': 'WiFi'})
+    place = facade.create_place({
+        'title': 'Loft', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': [amenity.id]
+    })
+    review = facade.create_review({
+        'text': 'Great stay', 'rating': 4,
+        'user_id': reviewer.id, 'place_id': place.id
+    })
+    return owner, reviewer, amenity, place, review
+
+
+def _assert_seeded(owner, reviewer, amenity, place, review):
+    assert facade.get_user_by_email('OWNER@example.com').id == owner.id
+    restored = facade.get_place_details(place.id)
+    assert restored.owner.id == owner.id
+    assert [a.id for a in restored.amenities_rel] == [amenity.id]
+    assert (restored.review_count, restored.avg_rating) == (1, 4.0)
+    assert facade.get_review(review.id).place.id == place.id
+    assert facade.has_user_reviewed(reviewer.id, place.id)
+
+
+def test_restart_replays_the_log(tmp_path):
+    with _open_store(tmp_path):
+        seeded = _seed()
+        facade.update_place(seeded[3].id, {'title': 'Renamed'})
+    assert not os.path.exists(tmp_path / SNAPSHOT_FILE)
+
+    with _open_store(tmp_path):
+        _assert_seeded(*seeded)
+        assert facade.get_place(seeded[3].id).title == 'Renamed'
+
+
+def test_snapshot_and_log_round_trip(tmp_path):
+    with _open_store(tmp_path, MEMORY_SNAPSHOT_EVERY=4):
+        seeded = _seed()
+        # Written after the last snapshot, so only in the log
+        extra = facade.create_user(dict(USER, email='extra@example.com'))
+    assert os.path.exists(tmp_path / SNAPSHOT_FILE)
+    assert os.path.getsize(tmp_path / LOG_FILE) > 0
+
+    with _open_store(tmp_path, MEMORY_SNAPSHOT_EVERY=4):
+        _assert_seeded(*seeded)
+        assert facade.get_user(extra.id).email == 'extra@example.com'
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    with _open_store(tmp_path):
+        owner = facade.create_user(dict(USER, email='owner@example.com'))
+        facade.create_user(dict(USER, email='torn@example.com'))
+    log_path = tmp_path / LOG_FILE
+    with open(log_path, 'rb') as log:
+        lines = log.readlines()
+    # The last transaction was cut short by a crash
+    with open(log_path, 'wb') as log:
+        log.write(lines[0] + lines[1][:len(lines[1]) // 2])
+
+    with _open_store(tmp_path):
+        assert facade.get_user(owner.id) is not None
+        assert facade.get_user_by_email('torn@example.com') is None
+        assert os.path.getsize(log_path) == len(lines[0])
+        # New transactions are appended after the last complete one
+        facade.create_user(dict(USER, email='after@example.com'))
+
+    with _open_store(tmp_path):
+        assert facade.get_user_by_email('after@example.com') is not None
+
+
+@pytest.mark.parametrize('app', [MemoryTestConfig], indirect=True)
+def test_failed_update_restores_columns_and_indexes(app):
+    owner = facade.create_user(dict(USER, email='owner@example.com'))
+    other = facade.create_user(dict(USER, email='other@example.com'))
+    with pytest.raises(DuplicateKeyError):
+        facade.user_repo.update(owner.id, {
+            'first_name': 'Changed', 'email': 'OTHER@example.com'
+        })
+    assert (owner.first_name, owner.email) == ('Ada', 'owner@example.com')
+    assert facade.get_user_by_email('owner@example.com') is owner
+    assert facade.get_user_by_email('other@example.com') is other
+
+    cheap, dear = [facade.create_place({
+        'title': title, 'price': price, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': []
+    }) for title, price in (('Cheap', 50.0), ('Dear', 150.0))]
+    with pytest.raises(ValueError):
+        facade.update_place(dear.id, {'price': 10.0, 'latitude': 100.0})
+    assert (dear.price, dear.latitude) == (150.0, 48.85)
+    places, _ = facade.get_places_page(10, sort='price_asc')
+    assert [place.id for place in places] == [cheap.id, dear.id]
+
+
+@pytest.mark.parametrize('app', [MemoryTestConfig], indirect=True)
+def test_unique_indexes_reject_duplicates(app):
+    owner, reviewer, _, place, _ = _seed()
+    with pytest.raises(ValueError, match='Email already registered'):
+        facade.create_user(dict(USER, email='Reviewer@Example.com'))
+    with pytest.raises(ValueError, match='already reviewed'):
+        facade.create_review({
+            'text': 'Again', 'rating': 1,
+            'user_id': reviewer.id, 'place_id': place.id
+        })
+    # Rejected rows leave no trace
+    assert len(facade.get_all_users()) == 2
+    assert len(facade.get_all_reviews()) == 1
+    assert (place.review_count, place.avg_rating) == (1, 4.0)
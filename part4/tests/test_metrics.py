@@ -0,0 +1,32 @@
+"""Metrics endpoint exposure."""
+
+import logging
+
+import pytest
+
+from config import ProductionConfig, TestConfig
+
+
+class ProductionMetricsConfig(TestConfig):
+    METRICS_ENDPOINT_ENABLED = ProductionConfig.METRICS_ENDPOINT_ENABLED
+    # Every statement counts as slow
+    SLOW_QUERY_MS = 0
+
+
+def test_metrics_served_by_default(client):
+    assert client.get('/metrics').status_code == 200
+
+
+@pytest.mark.parametrize('app', [ProductionMetricsConfig], indirect=True)
+def test_production_does_not_serve_metrics(client):
+    assert client.get('/metrics').status_code == 404
+
+
+@pytest.mark.parametrize('app', [ProductionMetricsConfig], indirect=True)
+def test_slow_queries_logged_without_the_endpoint(client, caplog):
+    with caplog.at_level(logging.WARNING, logger='hbnb.sql.slow'):
+        response = client.get('/api/v1/places/')
+    assert response.status_code == 200
+    assert 'Server-Timing' in response.headers
+    assert any('GET /api/v1/places/' in record.getMessage()
+               for record in caplog.records)
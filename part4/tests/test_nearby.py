@@ -0,0 +1,43 @@
+"""Nearby search over dense clusters."""
+
+import random
+
+from app.services import facade
+from app.utils.geo import haversine_km
+
+
+def test_nearby_matches_brute_force_when_the_cap_overflows(app, monkeypatch):
+    # A tiny cap and narrowing budget: every step overflows, and the
+    # dense cluster exhausts the budget
+    monkeypatch.setattr(type(facade.place_repo), 'NEARBY_CANDIDATE_LIMIT', 3,
+                        raising=False)
+    monkeypatch.setattr(type(facade.place_repo), 'NEARBY_MAX_NARROWING', 2,
+                        raising=False)
+    owner = facade.create_user({
+        'first_name': 'Owner', 'last_name': 'Test',
+        'email': 'owner@example.com', 'password': 'password123'
+    })
+    rng = random.Random(7)
+    rows = [{
+        'title': f'Place {i}', 'price': 100.0, 'owner_id': owner.id,
+        'latitude': 48.85 + rng.uniform(-0.2, 0.2),
+        'longitude': 2.35 + rng.uniform(-0.2, 0.2),
+    } for i in range(60)]
+    # Several places sharing nearly one point, away from the center
+    rows += [{
+        'title': f'Cluster {i}', 'price': 100.0, 'owner_id': owner.id,
+        'latitude': 48.80 + i * 1e-7, 'longitude': 2.30,
+    } for i in range(10)]
+    created, errors = facade.create_places_bulk(rows)
+    assert errors == []
+
+    places = facade.get_all_places()
+    for center in [(48.85, 2.35), (48.80, 2.30), (48.9, 2.4)]:
+        expected = sorted(
+            haversine_km(*center, place.latitude, place.longitude)
+            for place in places
+        )
+        expected = [d for d in expected if d <= 20.0][:8]
+        found = facade.get_places_nearby(*center, 20.0, 8)
+        assert [round(d, 9) for _, d in found] == \
+            [round(d, 9) for d in expected]
@@ -0,0 +1,76 @@
+"""Place updates: editable attributes and amenity lists."""
+
+import warnings
+
+import pytest
+from sqlalchemy.exc import SAWarning
+
+from app import db
+from app.services import facade
+
+
+def _place():
+    owner = facade.create_user({
+        'first_name': 'Owner', 'last_name': 'Test',
+        'email': 'owner@example.com', 'password': 'password123'
+    })
+    return owner, facade.create_place({
+        'title': 'Loft', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': []
+    })
+
+
+def test_update_ignores_aggregates_and_private_columns(app):
+    owner, place = _place()
+    facade.update_place(place.id, {
+        'title': 'Renamed', 'review_count': 7, '_review_count': 7,
+        '_rating_sum': 35, '_avg_rating': 5.0, 'owner_id': 'someone-else'
+    })
+    place = facade.get_place(place.id)
+    assert place.title == 'Renamed'
+    assert (place.review_count, place.rating_sum) == (0, 0)
+    assert place.owner_id == owner.id
+
+
+def test_bulk_update_rejects_aggregates(app):
+    _, place = _place()
+    updated, errors = facade.update_places_bulk([
+        {'id': place.id, 'price': 120.0, '_rating_sum': 35}
+    ])
+    assert (updated, errors) == (
+        [], [{'index': 0, 'error': 'Unknown field: _rating_sum'}]
+    )
+    place = facade.get_place(place.id)
+    assert (place.price, place.rating_sum) == (100.0, 0)
+
+
+@pytest.mark.parametrize('amenities', [[['x']], 'abc', 42])
+def test_put_rejects_malformed_amenities(app, client, amenities):
+    owner, place = _place()
+    token = client.post('/api/v1/auth/login', json={
+        'email': 'owner@example.com', 'password': 'password123'
+    }).get_json()['access_token']
+    response = client.put(
+        f'/api/v1/places/{place.id}', json={'amenities': amenities},
+        headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == 400
+    assert response.get_json() == {
+        'error': 'Amenities must be a list of amenity IDs'
+    }
+
+
+def test_create_place_links_amenities_without_autoflush_warning(app):
+    amenity_id = facade.create_amenity({'name': 'WiFi'}).id
+    owner_id = _place()[0].id
+    # The amenity lookup must query, not hit the identity map
+    db.session.expunge_all()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', SAWarning)
+        place = facade.create_place({
+            'title': 'Studio', 'price': 80.0, 'latitude': 48.85,
+            'longitude': 2.35, 'owner_id': owner_id,
+            'amenities': [amenity_id]
+        })
+    place = facade.get_place_details(place.id)
+    assert [a.id for a in place.amenities_rel] == [amenity_id]
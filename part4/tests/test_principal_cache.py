@@ -0,0 +1,60 @@
+"""Principal cache invalidation."""
+
+from types import SimpleNamespace
+
+from app.services.principal_cache import PrincipalCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _loader(users, loads):
+    def load_user(user_id):
+        loads.append(user_id)
+        return users.get(user_id)
+    return load_user
+
+
+def test_invalidation_forces_a_reload():
+    users = {'u1': SimpleNamespace(id='u1', is_admin=True)}
+    loads = []
+    cache = PrincipalCache(maxsize=4, ttl=60.0, clock=FakeClock())
+    token = {'sub': 'u1', 'jti': 't1'}
+
+    assert cache.resolve(token, _loader(users, loads)).is_admin
+    assert cache.resolve(token, _loader(users, loads)).is_admin
+    assert loads == ['u1']
+
+    users['u1'].is_admin = False
+    cache.invalidate_user('u1')
+    assert not cache.resolve(token, _loader(users, loads)).is_admin
+    assert loads == ['u1', 'u1']
+
+
+def test_invalidation_records_stay_bounded():
+    clock = FakeClock()
+    cache = PrincipalCache(maxsize=4, ttl=60.0, clock=clock)
+    for i in range(100):
+        clock.now = i
+        cache.invalidate_user('u%d' % i)
+        assert len(cache._invalidations) <= 4
+
+
+def test_overflowing_invalidations_drop_every_snapshot():
+    users = {'u%d' % i: SimpleNamespace(id='u%d' % i, is_admin=True)
+             for i in range(6)}
+    loads = []
+    cache = PrincipalCache(maxsize=4, ttl=60.0, clock=FakeClock())
+    token = {'sub': 'u0', 'jti': 't0'}
+    cache.resolve(token, _loader(users, loads))
+
+    users['u0'].is_admin = False
+    for user_id in users:
+        cache.invalidate_user(user_id)
+    assert not cache.resolve(token, _loader(users, loads)).is_admin
+    assert loads == ['u0', 'u0']
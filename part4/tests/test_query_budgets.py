@@ -0,0 +1,90 @@
+"""
+SQL query budgets of the read endpoints.
+
+Each endpoint must issue a fixed number of statements whatever the
+number of places, amenities and reviews involved, so an N+1 regression
+(e.g. a lazy relationship read per row) fails here. Budgets are exact
+upper bounds of the current implementation: raise one only together
+with the change that justifies it.
+"""
+
+import pytest
+
+from app import db
+from app.services import facade
+from app.utils.query_counter import assert_max_queries
+
+PLACE_DETAIL_QUERIES = 5
+PLACE_LIST_QUERIES = 2
+REVIEW_FEED_QUERIES = 3
+
+
+def _seed(places, reviewers, amenities=4):
+    """Create places sharing amenities, each reviewed by every reviewer."""
+    amenity_ids = [
+        facade.create_amenity({'name': f'Amenity {i}'}).id
+        for i in range(amenities)
+    ]
+    owner = facade.create_user({
+        'first_name': 'Owner', 'last_name': 'Test',
+        'email': 'owner@example.com', 'password': 'password123'
+    })
+    users = [
+        facade.create_user({
+            'first_name': 'Reviewer', 'last_name': 'Test',
+            'email': f'reviewer{i}@example.com', 'password': 'password123'
+        })
+        for i in range(reviewers)
+    ]
+    place_ids = []
+    for i in range(places):
+        place = facade.create_place({
+            'title': f'Place {i}', 'price': 100.0 + i,
+            'latitude': 48.85, 'longitude': 2.35,
+            'owner_id': owner.id, 'amenities': amenity_ids
+        })
+        place_ids.append(place.id)
+        for user in users:
+            facade.create_review({
+                'text': 'Great stay', 'rating': 4,
+                'user_id': user.id, 'place_id': place.id
+            })
+    # Requests must not be served from objects loaded while seeding
+    db.session.expunge_all()
+    return place_ids
+
+
+@pytest.fixture(params=[(2, 2), (8, 6)], ids=['small', 'larger'])
+def place_ids(request, app):
+    places, reviewers = request.param
+    return _seed(places, reviewers)
+
+
+def test_place_detail_query_budget(client, place_ids):
+    with assert_max_queries(db.engine, PLACE_DETAIL_QUERIES):
+        response = client.get(f'/api/v1/places/{place_ids[0]}')
+    assert response.status_code == 200
+    assert len(response.get_json()['amenities']) == 4
+
+
+def test_place_list_query_budget(client, place_ids):
+    with assert_max_queries(db.engine, PLACE_LIST_QUERIES):
+        response = client.get('/api/v1/places/?limit=100')
+    assert response.status_code == 200
+    assert len(response.get_json()['places']) == len(place_ids)
+
+
+@pytest.mark.parametrize('sort', ['newest', 'rating'])
+def test_review_feed_query_budget(client, place_ids, sort):
+    with assert_max_queries(db.engine, REVIEW_FEED_QUERIES):
+        response = client.get(
+            f'/api/v1/places/{place_ids[0]}/reviews?sort={sort}&limit=100'
+        )
+    assert response.status_code == 200
+    assert response.get_json()['reviews']
+
+
+def test_assert_max_queries_reports_statements(app):
+    with pytest.raises(AssertionError, match='at most 0 queries, got 1'):
+        with assert_max_queries(db.engine, 0):
+            db.session.execute(db.text('SELECT 1'))
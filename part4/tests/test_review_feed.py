@@ -0,0 +1,36 @@
+"""Review feed of a place."""
+
+from app.services import facade
+
+USER = {'first_name': 'Ada', 'last_name': 'Test', 'password': 'password123'}
+
+
+def test_place_detail_pages_through_the_feed(app, client):
+    app.config['PLACE_DETAIL_REVIEW_LIMIT'] = 2
+    owner = facade.create_user(dict(USER, email='owner@example.com'))
+    place = facade.create_place({
+        'title': 'Loft', 'price': 100.0, 'latitude': 48.85,
+        'longitude': 2.35, 'owner_id': owner.id, 'amenities': []
+    })
+    for i in range(5):
+        user = facade.create_user(dict(USER, email=f'r{i}@example.com'))
+        facade.create_review({'text': f'Stay {i}', 'rating': 4,
+                              'user_id': user.id, 'place_id': place.id})
+
+    detail = client.get(f'/api/v1/places/{place.id}').get_json()
+    texts = [review['text'] for review in detail['reviews']]
+    cursor = detail['reviews_next_cursor']
+    while cursor:
+        page = client.get(f'/api/v1/places/{place.id}/reviews',
+                          query_string={'cursor': cursor, 'limit': 2})
+        texts += [review['text'] for review in page.get_json()['reviews']]
+        cursor = page.get_json()['next_cursor']
+    assert sorted(texts) == [f'Stay {i}' for i in range(5)]
+
+
+def test_deprecated_route_redirects_to_the_feed(client):
+    response = client.get('/api/v1/reviews/places/p1/reviews?limit=3')
+    assert response.status_code == 308
+    assert response.headers['Location'].endswith(
+        '/api/v1/places/p1/reviews?limit=3'
+    )
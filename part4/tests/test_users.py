@@ -0,0 +1,32 @@
+"""User registration under concurrent duplicates."""
+
+import pytest
+
+from app.services import facade
+
+USER = {'first_name': 'Ada', 'last_name': 'Test', 'password': 'password123'}
+
+
+def test_create_user_maps_duplicate_email_to_value_error(app):
+    facade.create_user(dict(USER, email='ada@example.com'))
+    with pytest.raises(ValueError, match='Email already registered'):
+        facade.create_user(dict(USER, email='ADA@example.com'))
+    # The failed insert is rolled back; the session stays usable
+    assert facade.get_user_by_email('ada@example.com') is not None
+
+
+def test_duplicate_registration_race_returns_400(app, client, monkeypatch):
+    facade.create_user(dict(USER, email='admin@example.com', is_admin=True))
+    token = client.post('/api/v1/auth/login', json={
+        'email': 'admin@example.com', 'password': 'password123'
+    }).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    facade.create_user(dict(USER, email='ada@example.com'))
+
+    # A concurrent request passed the email_exists check before the
+    # first registration committed
+    monkeypatch.setattr(facade, 'email_exists', lambda *args: False)
+    response = client.post('/api/v1/users/', headers=headers,
+                           json=dict(USER, email='ada@example.com'))
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Email already registered'}